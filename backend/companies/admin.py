@@ -29,6 +29,10 @@ class CompanyAdmin(admin.ModelAdmin):
             'fields': ('email', 'phone', 'address'),
             'classes': ('collapse',)
         }),
+        ('Sipariş Bildirimleri', {
+            'fields': ('notification_digest_window', 'notification_digest_max_orders'),
+            'classes': ('collapse',)
+        }),
     )
     
     def get_warehouse_count(self, obj):
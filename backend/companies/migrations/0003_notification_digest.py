@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_retailerwholesaler_discount_rate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='notification_digest_max_orders',
+            field=models.PositiveIntegerField(default=50, help_text='Bekleyen sipariş sayısı bu değere ulaşınca özet süre dolmadan gönderilir.', verbose_name='Özet Başına En Fazla Sipariş'),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='notification_digest_window',
+            field=models.PositiveIntegerField(default=0, help_text='0: her sipariş ayrı bildirilir. Aksi halde bu süre içindeki siparişler tek özet halinde gönderilir.', verbose_name='Bildirim Toplama Süresi (sn)'),
+        ),
+    ]
@@ -28,6 +28,18 @@ class Company(models.Model):
     phone = models.CharField(_('Telefon'), max_length=20, blank=True, null=True)
     address = models.TextField(_('Adres'), blank=True, null=True)
     
+    # Toptancı sipariş bildirimleri: toplu özet (digest) penceresi
+    notification_digest_window = models.PositiveIntegerField(
+        _('Bildirim Toplama Süresi (sn)'),
+        default=0,
+        help_text=_('0: her sipariş ayrı bildirilir. Aksi halde bu süre içindeki siparişler tek özet halinde gönderilir.')
+    )
+    notification_digest_max_orders = models.PositiveIntegerField(
+        _('Özet Başına En Fazla Sipariş'),
+        default=50,
+        help_text=_('Bekleyen sipariş sayısı bu değere ulaşınca özet süre dolmadan gönderilir.')
+    )
+    
     # Meta Bilgiler
     created_at = models.DateTimeField(_('Oluşturulma Tarihi'), auto_now_add=True)
     updated_at = models.DateTimeField(_('Güncellenme Tarihi'), auto_now=True)
@@ -0,0 +1,179 @@
+# backend/core/batch.py
+"""
+Parçalı (chunked) toplu iş altyapısı
+
+Periyodik bakım işleri tüm kayıtları tek transaction'da satır satır
+kaydetmek yerine id sırasıyla (keyset) parçalar halinde ve set tabanlı
+UPDATE'lerle çalışır:
+
+    @register
+    class StaleOrderFlagger(BatchJob):
+        name = 'orders.flag_stale'
+
+        def get_queryset(self):
+            return Order.objects.filter(status='pending', ...)
+
+        def process_chunk(self, ids):
+            return Order.objects.filter(pk__in=ids, ...).update(...)
+
+    StaleOrderFlagger().run()
+
+- Her parça kısa bir transaction'dır; parça ile BatchJobRun imleci birlikte
+  commit edilir. Worker ölürse iş aynı run_key ile kaldığı yerden devam eder.
+- Çalıştırma satırı her parçada kilitlenir; aynı işi çalıştıran iki worker
+  aynı parçayı iki kez işlemez.
+- run_key (varsayılan: gün) tamamlanmışsa run() iş yapmadan kaydı döndürür.
+- process_chunk da idempotent olmalıdır (ör. "henüz işaretlenmemiş" koşulu).
+
+İlerleme ve metrikler BatchJobRun tablosundadır (admin ve run_batch_job komutu).
+Kayıtlı işler uygulamaların batch_jobs modüllerinden yüklenir (load_jobs()).
+"""
+import logging
+import time
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import BatchJobRun
+
+logger = logging.getLogger(__name__)
+
+
+JOBS = {}
+
+
+def register(job_class):
+    """Toplu işi adıyla kaydeder (sınıf dekoratörü)"""
+    JOBS[job_class.name] = job_class
+    return job_class
+
+
+def load_jobs():
+    """Uygulamaların batch_jobs modüllerini içe aktarır ve kayıtlı işleri döndürür"""
+    autodiscover_modules('batch_jobs')
+    return JOBS
+
+
+class BatchJob:
+    """
+    Parçalı toplu iş tabanı
+
+    Alt sınıflar name, get_queryset() ve process_chunk(ids) tanımlar.
+    """
+    name = None
+    chunk_size = 1000
+
+    def get_queryset(self):
+        """İşlenecek kayıtlar (her parçada yeniden değerlendirilir)"""
+        raise NotImplementedError
+
+    def process_chunk(self, ids):
+        """
+        Bir parçayı set tabanlı işler
+        Dönüş: etkilenen kayıt sayısı
+        """
+        raise NotImplementedError
+
+    def get_run_key(self):
+        """Çalıştırma anahtarı; aynı anahtarla tamamlanan iş tekrar çalışmaz"""
+        return timezone.localdate().isoformat()
+
+    def _get_run(self, run_key):
+        try:
+            with transaction.atomic():
+                run, created = BatchJobRun.objects.get_or_create(job_name=self.name, run_key=run_key)
+        except IntegrityError:
+            run, created = BatchJobRun.objects.get(job_name=self.name, run_key=run_key), False
+
+        if created:
+            run.total_estimate = self.get_queryset().count()
+            run.save(update_fields=['total_estimate'])
+        elif run.status == 'failed':
+            # Kaldığı yerden devam
+            BatchJobRun.objects.filter(pk=run.pk).update(status='running', last_error='')
+            run.status = 'running'
+        return run
+
+    def _run_chunk(self, run_id):
+        """
+        Sıradaki parçayı işler ve imleci ilerletir (tek transaction)
+        Dönüş: (güncel BatchJobRun, parça boyutu)
+        """
+        with transaction.atomic():
+            run = BatchJobRun.objects.select_for_update().get(pk=run_id)
+            if run.status != 'running':
+                return run, 0
+
+            ids = list(
+                self.get_queryset().filter(pk__gt=run.cursor).order_by('pk').values_list(
+                    'pk', flat=True
+                )[:self.chunk_size]
+            )
+            now = timezone.now()
+            if not ids:
+                run.status = 'completed'
+                run.finished_at = now
+                run.heartbeat_at = now
+                run.save(update_fields=['status', 'finished_at', 'heartbeat_at'])
+                return run, 0
+
+            affected = self.process_chunk(ids)
+
+            run.cursor = ids[-1]
+            run.processed += len(ids)
+            run.affected += affected or 0
+            run.chunks += 1
+            run.heartbeat_at = now
+            run.save(update_fields=['cursor', 'processed', 'affected', 'chunks', 'heartbeat_at'])
+            return run, len(ids)
+
+    def run(self, run_key=None, max_chunks=None):
+        """
+        İşi çalıştırır (veya yarım kalan çalıştırmaya devam eder)
+        max_chunks: bu çağrıda en fazla işlenecek parça (zaman sınırlı görevler için)
+        Dönüş: BatchJobRun
+        """
+        run = self._get_run(run_key or self.get_run_key())
+        if run.status == 'completed':
+            logger.info(f"Batch job {self.name} [{run.run_key}] already completed")
+            return run
+
+        started = time.monotonic()
+        chunks = 0
+        try:
+            while max_chunks is None or chunks < max_chunks:
+                run, size = self._run_chunk(run.pk)
+                if not size:
+                    break
+                chunks += 1
+                logger.info(
+                    f"Batch job {self.name} [{run.run_key}] chunk {run.chunks}: "
+                    f"{size} rows, cursor={run.cursor}, progress={run.progress}%"
+                )
+        except Exception as e:
+            logger.error(f"Batch job {self.name} [{run.run_key}] failed: {e}")
+            BatchJobRun.objects.filter(pk=run.pk).update(status='failed', last_error=str(e)[:2000])
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            BatchJobRun.objects.filter(pk=run.pk).update(
+                duration_seconds=run.duration_seconds + elapsed
+            )
+
+        run.refresh_from_db()
+        return run
+
+
+def run_summary(run):
+    """Görev sonuçları ve komut çıktısı için özet"""
+    return {
+        'job': run.job_name,
+        'run_key': run.run_key,
+        'status': run.status,
+        'processed': run.processed,
+        'affected': run.affected,
+        'chunks': run.chunks,
+        'progress': run.progress,
+        'duration_seconds': round(run.duration_seconds, 3),
+    }
@@ -0,0 +1,93 @@
+# backend/core/conditional.py
+"""
+Koşullu GET (ETag / Last-Modified) desteği
+
+Doğrulayıcılar ucuz yoklamalardan türetilir: önbellek sürüm sayaçları veya
+tek bir "MAX(updated_at) + COUNT(*)" sorgusu. İstemcinin elindeki sürüm
+güncelse görünüm hiç çalıştırılmadan 304 döner; serileştirme yapılmaz.
+
+Kullanım (fonksiyon görünümü veya ViewSet metodu):
+
+    def summary_validators(request):
+        latest, count = probe_queryset(Order.objects.filter(retailer=...))
+        return (company.id, latest, count), latest
+
+    @api_view(['GET'])
+    @conditional_view(summary_validators)
+    def summary(request): ...
+
+Doğrulayıcı fonksiyonu görünümle aynı argümanları alır.
+"""
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+
+
+def make_etag(*parts):
+    """Parçalardan kısa bir (güçlü) ETag üretir"""
+    payload = '|'.join(str(part) for part in parts)
+    return quote_etag(hashlib.md5(payload.encode()).hexdigest())
+
+
+def probe_queryset(queryset, field='updated_at'):
+    """
+    Tek sorguda (en son değişiklik zamanı, kayıt sayısı)
+    Sayı, silinen kayıtların da doğrulayıcıyı değiştirmesini sağlar.
+    """
+    result = queryset.order_by().aggregate(latest=Max(field), count=Count('pk'))
+    return result['latest'], result['count']
+
+
+def _find_request(args):
+    for arg in args:
+        if isinstance(arg, Request):
+            return arg._request
+        if hasattr(arg, 'method') and hasattr(arg, 'headers'):
+            return arg
+    return None
+
+
+def conditional_view(validator_func):
+    """
+    Görünüme koşullu GET desteği ekler
+
+    validator_func görünüm argümanlarıyla çağrılır ve (etag_parçaları,
+    last_modified) döndürür. Herhangi biri None olabilir. Kullanıcıya/şirkete
+    özel yanıtlarda ETag parçaları şirket kimliğini içermelidir; fiyat gibi
+    zaman damgasına yansımayan değişiklikler varsa sadece ETag kullanılmalıdır.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            request = _find_request(args)
+            if request is None or request.method not in ('GET', 'HEAD'):
+                return view_func(*args, **kwargs)
+
+            etag_parts, latest = validator_func(*args, **kwargs)
+            etag = make_etag(*etag_parts) if etag_parts is not None else None
+            last_modified = int(latest.timestamp()) if latest is not None else None
+
+            not_modified = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if not_modified is not None:
+                return not_modified
+
+            response = view_func(*args, **kwargs)
+            if response.status_code == 200:
+                if etag and not response.has_header('ETag'):
+                    response['ETag'] = etag
+                if last_modified and not response.has_header('Last-Modified'):
+                    response['Last-Modified'] = http_date(last_modified)
+                # İstemci her seferinde doğrulasın (304 ucuz)
+                if not response.has_header('Cache-Control'):
+                    response['Cache-Control'] = 'private, no-cache'
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,38 @@
+# backend/core/db.py
+"""
+Veritabanı yardımcıları
+
+Proje PostgreSQL hedefler; geliştirme/test ortamlarında diğer veritabanları
+için yedek yollar bu modüldeki kontrollerle seçilir.
+"""
+from django.db import connections, migrations, DEFAULT_DB_ALIAS
+
+
+def is_postgres(using=DEFAULT_DB_ALIAS):
+    """Verilen bağlantı PostgreSQL mi?"""
+    return connections[using].vendor == 'postgresql'
+
+
+def postgres_only_sql(sql, reverse_sql=None):
+    """
+    Sadece PostgreSQL'de çalışan RunSQL benzeri migration operasyonu
+
+    Diğer veritabanlarında hiçbir şey yapmaz. CREATE INDEX CONCURRENTLY
+    kullanan migration'larda `atomic = False` olmalıdır.
+    """
+    if isinstance(sql, str):
+        sql = [sql]
+    if isinstance(reverse_sql, str):
+        reverse_sql = [reverse_sql]
+
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            for statement in sql:
+                schema_editor.execute(statement)
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            for statement in reverse_sql or []:
+                schema_editor.execute(statement)
+
+    return migrations.RunPython(forwards, backwards, elidable=False)
@@ -0,0 +1,307 @@
+# backend/core/idempotency.py
+"""
+Idempotency-Key desteği (POST uç noktaları)
+
+Zayıf ağlardaki istemciler zaman aşımından sonra aynı isteği tekrarlar.
+İstek bir Idempotency-Key başlığı taşıyorsa:
+
+- Anahtar ilk kez görülüyorsa istek işlenir, yanıt saklanır.
+- Aynı anahtarla tekrar gelirse görünüm çalıştırılmaz, saklanan yanıt
+  aynen döner (Idempotent-Replayed: true).
+- İlk istek hâlâ işleniyorsa tekrar, sonucu IDEMPOTENCY_WAIT saniye bekler
+  ve aynı yanıtı alır; süre dolarsa 409 döner.
+- Aynı anahtar farklı bir gövdeyle kullanılırsa 422 döner.
+- Sadece kesin sonuçlar saklanır; 409/429 ve 5xx yanıtlar saklanmaz.
+
+Kilit ve yanıtlar Redis'te (Django cache) tutulur. Tamamlanan yanıtlar ayrıca
+IdempotencyRecord tablosuna yazılır; Redis boşaltılsa da tekrar oynatılabilir.
+Redis erişilemezse kilit de bu tablodaki benzersiz satırla alınır.
+
+Anahtarlar kullanıcıya ve uç noktaya özeldir; başlık yoksa davranış değişmez.
+"""
+import hashlib
+import json
+import logging
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+# Geçici sonuçlar (çakışma, yetersiz stok, hız sınırı) saklanmaz; aynı anahtarla
+# yeniden deneme görünümü tekrar çalıştırır
+TRANSIENT_STATUS_CODES = frozenset({status.HTTP_409_CONFLICT, status.HTTP_429_TOO_MANY_REQUESTS})
+
+
+def _get_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _digest(*parts):
+    return hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _to_json(data):
+    """Yanıt verisini JSON'a uygun hale getirir (Decimal, datetime, UUID)"""
+    return json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+
+
+def request_fingerprint(request):
+    """İstek yöntemi, yolu ve gövdesinin özeti"""
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = {key: values for key, values in data.lists()}
+    body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True, default=str)
+    return _digest(request.method, request.get_full_path(), body)
+
+
+def _find_request(args):
+    for arg in args:
+        if isinstance(arg, Request):
+            return arg
+    return None
+
+
+class _Store:
+    """Tek bir Idempotency-Key için kilit ve sonuç erişimi"""
+
+    def __init__(self, request, key):
+        self.request = request
+        self.key = key
+        user_id = getattr(request.user, 'pk', None)
+        self.scope = _digest(user_id, request.method, request.path, key)
+        self.lock_key = f'idem:lock:{self.scope}'
+        self.result_key = f'idem:result:{self.scope}'
+        self.lock_backend = None
+
+    @property
+    def ttl(self):
+        return _get_setting('IDEMPOTENCY_TTL', 24 * 60 * 60)
+
+    @property
+    def lock_timeout(self):
+        return _get_setting('IDEMPOTENCY_LOCK_TIMEOUT', 60)
+
+    def load(self):
+        """Tamamlanmış yanıtı döndürür (önce Redis, sonra veritabanı)"""
+        try:
+            payload = cache.get(self.result_key)
+        except Exception as e:
+            logger.warning(f"Idempotency cache read failed: {e}")
+            payload = None
+        if payload is not None:
+            return payload
+
+        from .models import IdempotencyRecord
+
+        record = IdempotencyRecord.objects.filter(
+            scope_key=self.scope,
+            status='completed',
+            expires_at__gt=timezone.now()
+        ).only('fingerprint', 'response_status', 'response_body').first()
+        if record is None:
+            return None
+
+        payload = {
+            'fingerprint': record.fingerprint,
+            'status_code': record.response_status,
+            'data': record.response_body,
+        }
+        self._cache_set(self.result_key, payload, self.ttl)
+        return payload
+
+    def acquire(self, fingerprint):
+        """İşleme kilidini alır; başka bir istek işliyorsa False"""
+        try:
+            if cache.add(self.lock_key, fingerprint, timeout=self.lock_timeout):
+                self.lock_backend = 'cache'
+                return True
+            return False
+        except Exception as e:
+            logger.warning(f"Idempotency cache lock failed, using database: {e}")
+
+        from .models import IdempotencyRecord
+
+        now = timezone.now()
+        fields = {
+            'idempotency_key': self.key,
+            'user': self.request.user if getattr(self.request.user, 'pk', None) else None,
+            'method': self.request.method,
+            'path': self.request.path[:255],
+            'fingerprint': fingerprint,
+            'status': 'in_progress',
+            'expires_at': now + timedelta(seconds=self.lock_timeout),
+        }
+        try:
+            IdempotencyRecord.objects.create(scope_key=self.scope, **fields)
+        except IntegrityError:
+            # Yarım kalmış (süresi dolan) kilidi devral
+            taken = IdempotencyRecord.objects.filter(
+                scope_key=self.scope,
+                status='in_progress',
+                expires_at__lte=now
+            ).update(**fields)
+            if not taken:
+                return False
+        self.lock_backend = 'db'
+        return True
+
+    def is_locked(self):
+        try:
+            return cache.get(self.lock_key) is not None
+        except Exception:
+            from .models import IdempotencyRecord
+            return IdempotencyRecord.objects.filter(
+                scope_key=self.scope,
+                status='in_progress',
+                expires_at__gt=timezone.now()
+            ).exists()
+
+    def save(self, fingerprint, response):
+        """Yanıtı Redis'e ve veritabanına yazar"""
+        from .models import IdempotencyRecord
+
+        data = _to_json(response.data)
+        payload = {
+            'fingerprint': fingerprint,
+            'status_code': response.status_code,
+            'data': data,
+        }
+        self._cache_set(self.result_key, payload, self.ttl)
+        IdempotencyRecord.objects.update_or_create(
+            scope_key=self.scope,
+            defaults={
+                'idempotency_key': self.key,
+                'user': self.request.user if getattr(self.request.user, 'pk', None) else None,
+                'method': self.request.method,
+                'path': self.request.path[:255],
+                'fingerprint': fingerprint,
+                'status': 'completed',
+                'response_status': response.status_code,
+                'response_body': data,
+                'expires_at': timezone.now() + timedelta(seconds=self.ttl),
+            }
+        )
+
+    def release(self):
+        if self.lock_backend == 'cache':
+            try:
+                cache.delete(self.lock_key)
+            except Exception as e:
+                logger.warning(f"Idempotency lock release failed: {e}")
+        elif self.lock_backend == 'db':
+            from .models import IdempotencyRecord
+            IdempotencyRecord.objects.filter(scope_key=self.scope, status='in_progress').delete()
+        self.lock_backend = None
+
+    @staticmethod
+    def _cache_set(key, value, timeout):
+        try:
+            cache.set(key, value, timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Idempotency cache write failed: {e}")
+
+
+def _replay(payload, fingerprint):
+    if payload['fingerprint'] != fingerprint:
+        return Response({
+            'error': 'Bu Idempotency-Key farklı bir istek için kullanılmış.',
+            'code': 'idempotency_key_reused'
+        }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    response = Response(payload['data'], status=payload['status_code'])
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _wait_for_result(store):
+    """Aynı anahtarla işlenen isteğin sonucunu bekler"""
+    deadline = time.monotonic() + _get_setting('IDEMPOTENCY_WAIT', 10)
+    while time.monotonic() < deadline:
+        time.sleep(0.1)
+        payload = store.load()
+        if payload is not None:
+            return payload
+        if not store.is_locked():
+            # İlk istek sonuç saklamadan bitti (geçici yanıt/5xx/istisna)
+            return None
+    return None
+
+
+def idempotent(view_func):
+    """
+    POST görünümünü Idempotency-Key başlığına duyarlı hale getirir
+    (fonksiyon görünümü veya ViewSet metodu; @api_view/@action'ın altına yazılır)
+
+    409/429 ve 5xx yanıtlar ile istisnalar saklanmaz; istemci aynı anahtarla
+    yeniden deneyebilir.
+    """
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        request = _find_request(args)
+        key = request.headers.get(IDEMPOTENCY_HEADER) if request is not None else None
+        if not key:
+            return view_func(*args, **kwargs)
+
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {'error': f'{IDEMPOTENCY_HEADER} en fazla {MAX_KEY_LENGTH} karakter olabilir.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        store = _Store(request, key)
+        fingerprint = request_fingerprint(request)
+
+        payload = store.load()
+        if payload is not None:
+            return _replay(payload, fingerprint)
+
+        if not store.acquire(fingerprint):
+            # Eşzamanlı tekrar: ilk isteğin sonucuna bağlan
+            payload = _wait_for_result(store)
+            if payload is not None:
+                return _replay(payload, fingerprint)
+            response = Response({
+                'error': 'Aynı Idempotency-Key ile bir istek hâlâ işleniyor.',
+                'code': 'idempotency_in_progress'
+            }, status=status.HTTP_409_CONFLICT)
+            response['Retry-After'] = '1'
+            return response
+
+        # İlk okuma ile kilit arasında önceki istek yanıtını saklayıp kilidi
+        # bırakmış olabilir; görünüm ikinci kez çalıştırılmaz
+        payload = store.load()
+        if payload is not None:
+            store.release()
+            return _replay(payload, fingerprint)
+
+        try:
+            response = view_func(*args, **kwargs)
+            if response.status_code < 500 and response.status_code not in TRANSIENT_STATUS_CODES:
+                store.save(fingerprint, response)
+        finally:
+            store.release()
+        return response
+
+    return wrapper
+
+
+def prune_idempotency_records():
+    """Süresi dolan kayıtları siler"""
+    from .models import IdempotencyRecord
+
+    deleted, _ = IdempotencyRecord.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+
+from core.search import refresh_search_vectors
+from customers.models import Customer
+from orders.models import Order
+from products.models import Product
+
+
+SEARCH_MODELS = {
+    'products': Product,
+    'customers': Customer,
+    'orders': Order,
+}
+
+
+class Command(BaseCommand):
+    help = 'Ürün, müşteri ve sipariş arama metinlerini (search_text) ve arama vektörlerini yeniden oluşturur'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            choices=['all', *SEARCH_MODELS],
+            default='all',
+            help='Yeniden oluşturulacak model',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Tek seferde güncellenecek kayıt sayısı',
+        )
+
+    def handle(self, *args, **options):
+        names = list(SEARCH_MODELS) if options['model'] == 'all' else [options['model']]
+        for name in names:
+            model = SEARCH_MODELS[name]
+            self.stdout.write(f'🔄 {name} arama indeksi yeniden oluşturuluyor...')
+            updated = self.rebuild(model, options['chunk_size'])
+            self.stdout.write(self.style.SUCCESS(f'✅ {updated} kayıt güncellendi.'))
+
+    def rebuild(self, model, chunk_size):
+        related = getattr(model, 'SEARCH_RELATED', ())
+        fields = ['id', *model.SEARCH_FIELDS, *related]
+        has_vector = any(field.name == 'search_vector' for field in model._meta.fields)
+
+        updated = 0
+        batch = []
+        queryset = model.objects.only(*fields).select_related(*related).order_by('id')
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            instance.search_text = instance.build_search_text()
+            batch.append(instance)
+            if len(batch) >= chunk_size:
+                updated += self.flush(model, batch, has_vector)
+                batch = []
+        if batch:
+            updated += self.flush(model, batch, has_vector)
+        return updated
+
+    def flush(self, model, batch, has_vector):
+        model.objects.bulk_update(batch, ['search_text'])
+        if has_vector:
+            refresh_search_vectors(model.objects.filter(pk__in=[instance.pk for instance in batch]))
+        return len(batch)
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.batch import load_jobs, run_summary
+from core.models import BatchJobRun
+
+
+class Command(BaseCommand):
+    help = 'Parçalı toplu işi çalıştırır veya çalıştırma durumlarını listeler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('job', nargs='?', help='İş adı (ör. orders.flag_stale)')
+        parser.add_argument(
+            '--run-key',
+            help='Çalıştırma anahtarı (varsayılan: bugünün tarihi). Aynı anahtarla yarım kalan iş devam eder.',
+        )
+        parser.add_argument(
+            '--max-chunks',
+            type=int,
+            help='Bu çalıştırmada en fazla işlenecek parça sayısı',
+        )
+        parser.add_argument(
+            '--status',
+            action='store_true',
+            help='Son çalıştırmaları listele',
+        )
+
+    def handle(self, *args, **options):
+        jobs = load_jobs()
+
+        if options['status'] or not options['job']:
+            runs = BatchJobRun.objects.all()
+            if options['job']:
+                runs = runs.filter(job_name=options['job'])
+            self.stdout.write(f"Kayıtlı işler: {', '.join(sorted(jobs)) or '-'}")
+            for run in runs[:20]:
+                self.stdout.write(
+                    f"{run.job_name} [{run.run_key}] {run.status} %{run.progress} "
+                    f"işlenen={run.processed} güncellenen={run.affected} parça={run.chunks} "
+                    f"süre={run.duration_seconds:.1f}sn"
+                )
+            return
+
+        job_class = jobs.get(options['job'])
+        if job_class is None:
+            raise CommandError(f"'{options['job']}' adında kayıtlı iş yok.")
+
+        self.stdout.write(f"🔄 {job_class.name} çalıştırılıyor...")
+        run = job_class().run(run_key=options['run_key'], max_chunks=options['max_chunks'])
+        summary = run_summary(run)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {summary['status']}: {summary['processed']} kayıt işlendi, "
+            f"{summary['affected']} güncellendi ({summary['chunks']} parça, %{summary['progress']})."
+        ))
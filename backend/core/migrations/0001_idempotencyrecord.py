@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope_key', models.CharField(help_text='Kullanıcı + yöntem + yol + Idempotency-Key özeti', max_length=64, unique=True, verbose_name='Kapsam Anahtarı')),
+                ('idempotency_key', models.CharField(max_length=255, verbose_name='Idempotency-Key')),
+                ('method', models.CharField(max_length=10, verbose_name='Yöntem')),
+                ('path', models.CharField(max_length=255, verbose_name='Yol')),
+                ('fingerprint', models.CharField(max_length=64, verbose_name='İstek Özeti')),
+                ('status', models.CharField(choices=[('in_progress', 'İşleniyor'), ('completed', 'Tamamlandı')], default='in_progress', max_length=20, verbose_name='Durum')),
+                ('response_status', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Yanıt Kodu')),
+                ('response_body', models.JSONField(blank=True, null=True, verbose_name='Yanıt')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='Geçerlilik Sonu')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='idempotency_records', to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+            ],
+            options={
+                'verbose_name': 'Idempotency Kaydı',
+                'verbose_name_plural': 'Idempotency Kayıtları',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_idempotencyrecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchJobRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_name', models.CharField(max_length=100, verbose_name='İş Adı')),
+                ('run_key', models.CharField(max_length=100, verbose_name='Çalıştırma Anahtarı')),
+                ('status', models.CharField(choices=[('running', 'Çalışıyor'), ('completed', 'Tamamlandı'), ('failed', 'Hata')], default='running', max_length=20, verbose_name='Durum')),
+                ('cursor', models.BigIntegerField(default=0, help_text="Son işlenen kaydın id'si", verbose_name='İmleç')),
+                ('total_estimate', models.PositiveIntegerField(default=0, verbose_name='Tahmini Kayıt Sayısı')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='İşlenen Kayıt')),
+                ('affected', models.PositiveIntegerField(default=0, verbose_name='Güncellenen Kayıt')),
+                ('chunks', models.PositiveIntegerField(default=0, verbose_name='Parça Sayısı')),
+                ('duration_seconds', models.FloatField(default=0, verbose_name='Süre (sn)')),
+                ('last_error', models.TextField(blank=True, verbose_name='Son Hata')),
+                ('started_at', models.DateTimeField(auto_now_add=True, verbose_name='Başlangıç')),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True, verbose_name='Son İlerleme')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Bitiş')),
+            ],
+            options={
+                'verbose_name': 'Toplu İş Çalıştırması',
+                'verbose_name_plural': 'Toplu İş Çalıştırmaları',
+                'ordering': ['-started_at'],
+                'constraints': [models.UniqueConstraint(fields=('job_name', 'run_key'), name='core_batch_job_run_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,109 @@
+# backend/core/models.py
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class IdempotencyRecord(models.Model):
+    """
+    Idempotency-Key ile yapılan isteklerin kalıcı kaydı
+
+    Birincil depo Redis'tir (core.idempotency); bu tablo Redis erişilemezken
+    kilit olarak ve anahtar önbellekten düştüğünde tamamlanmış yanıtın tekrar
+    oynatılması için kullanılır.
+    """
+    STATUS_CHOICES = [
+        ('in_progress', _('İşleniyor')),
+        ('completed', _('Tamamlandı')),
+    ]
+    
+    scope_key = models.CharField(
+        _('Kapsam Anahtarı'),
+        max_length=64,
+        unique=True,
+        help_text=_('Kullanıcı + yöntem + yol + Idempotency-Key özeti')
+    )
+    idempotency_key = models.CharField(_('Idempotency-Key'), max_length=255)
+    user = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name='idempotency_records',
+        verbose_name=_('Kullanıcı'),
+        blank=True,
+        null=True
+    )
+    method = models.CharField(_('Yöntem'), max_length=10)
+    path = models.CharField(_('Yol'), max_length=255)
+    fingerprint = models.CharField(_('İstek Özeti'), max_length=64)
+    
+    status = models.CharField(
+        _('Durum'),
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='in_progress'
+    )
+    response_status = models.PositiveSmallIntegerField(_('Yanıt Kodu'), blank=True, null=True)
+    response_body = models.JSONField(_('Yanıt'), blank=True, null=True)
+    
+    created_at = models.DateTimeField(_('Oluşturulma Tarihi'), auto_now_add=True)
+    expires_at = models.DateTimeField(_('Geçerlilik Sonu'), db_index=True)
+    
+    class Meta:
+        verbose_name = _('Idempotency Kaydı')
+        verbose_name_plural = _('Idempotency Kayıtları')
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.method} {self.path} [{self.idempotency_key}] ({self.status})"
+
+
+class BatchJobRun(models.Model):
+    """
+    Parçalı toplu iş (core.batch.BatchJob) çalıştırma kaydı
+
+    Her parça işlendiğinde imleç (son işlenen id) ve sayaçlar aynı
+    transaction içinde güncellenir; worker yeniden başlarsa iş kaldığı
+    yerden devam eder. (job_name, run_key) benzersizdir: aynı anahtarla
+    tamamlanmış bir çalıştırma tekrar iş yapmaz.
+    """
+    STATUS_CHOICES = [
+        ('running', _('Çalışıyor')),
+        ('completed', _('Tamamlandı')),
+        ('failed', _('Hata')),
+    ]
+    
+    job_name = models.CharField(_('İş Adı'), max_length=100)
+    run_key = models.CharField(_('Çalıştırma Anahtarı'), max_length=100)
+    status = models.CharField(_('Durum'), max_length=20, choices=STATUS_CHOICES, default='running')
+    
+    # Kaldığı yer ve ilerleme
+    cursor = models.BigIntegerField(_('İmleç'), default=0, help_text=_('Son işlenen kaydın id\'si'))
+    total_estimate = models.PositiveIntegerField(_('Tahmini Kayıt Sayısı'), default=0)
+    processed = models.PositiveIntegerField(_('İşlenen Kayıt'), default=0)
+    affected = models.PositiveIntegerField(_('Güncellenen Kayıt'), default=0)
+    chunks = models.PositiveIntegerField(_('Parça Sayısı'), default=0)
+    duration_seconds = models.FloatField(_('Süre (sn)'), default=0)
+    last_error = models.TextField(_('Son Hata'), blank=True)
+    
+    started_at = models.DateTimeField(_('Başlangıç'), auto_now_add=True)
+    heartbeat_at = models.DateTimeField(_('Son İlerleme'), null=True, blank=True)
+    finished_at = models.DateTimeField(_('Bitiş'), null=True, blank=True)
+    
+    class Meta:
+        verbose_name = _('Toplu İş Çalıştırması')
+        verbose_name_plural = _('Toplu İş Çalıştırmaları')
+        ordering = ['-started_at']
+        constraints = [
+            models.UniqueConstraint(fields=['job_name', 'run_key'], name='core_batch_job_run_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_name} [{self.run_key}] ({self.status})"
+    
+    @property
+    def progress(self):
+        """Tamamlanma yüzdesi (tahmini)"""
+        if self.status == 'completed':
+            return 100.0
+        if not self.total_estimate:
+            return 0.0
+        return round(min(100.0, 100.0 * self.processed / self.total_estimate), 1)
@@ -0,0 +1,182 @@
+# backend/core/pagination.py
+"""
+Sayfalama sınıfları
+
+CursorOptInPagination varsayılan olarak PageNumberPagination gibi davranır.
+İstekte ?cursor= parametresi varsa (ilk sayfa için boş olabilir) keyset
+(cursor) sayfalamasına geçer: OFFSET yerine son satırın sıralama
+değerlerinden sonrası istenir, böylece derin sayfalar da sabit maliyetlidir.
+?no_count=true ile toplam kayıt sayısı (COUNT(*)) hesaplanmaz.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+TRUE_VALUES = ('1', 'true', 't', 'yes', 'on')
+
+
+def _encode_value(value):
+    # DjangoJSONEncoder datetime'ı milisaniyeye kırpar; sınır satırı kaçmasın diye
+    # mikrosaniye hassasiyetinde ve etiketli yazılır
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        parsed = parse_datetime(value.get('dt') or '') if set(value) == {'dt'} else None
+        if parsed is None:
+            raise ValueError('invalid datetime')
+        return parsed
+    return value
+
+
+class CursorOptInPagination(PageNumberPagination):
+    """
+    Sayfa numarası + isteğe bağlı keyset sayfalaması
+
+    Keyset sıralaması queryset'in order_by alanlarından alınır ve benzersiz
+    olması için sona 'id' eklenir. NULL değerler her zaman en büyük kabul
+    edilir (ASC NULLS LAST / DESC NULLS FIRST).
+    """
+    cursor_query_param = 'cursor'
+    no_count_query_param = 'no_count'
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    invalid_cursor_message = 'Geçersiz cursor değeri.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_mode = self.cursor_query_param in request.query_params
+        if not self.keyset_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.keyset_page_size = self.get_page_size(request)
+        self.ordering = self.get_keyset_ordering(queryset)
+        self.count = None
+
+        if not self._is_true(request.query_params.get(self.no_count_query_param)):
+            self.count = queryset.count()
+
+        queryset = queryset.order_by(*[
+            F(field).desc(nulls_first=True) if descending else F(field).asc(nulls_last=True)
+            for field, descending in self.ordering
+        ])
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self._build_keyset_filter(self.decode_cursor(cursor)))
+
+        # Bir fazla satır çekerek sonraki sayfa olup olmadığını COUNT olmadan öğren
+        rows = list(queryset[:self.keyset_page_size + 1])
+        self.has_next = len(rows) > self.keyset_page_size
+        self.page_rows = rows[:self.keyset_page_size]
+        return self.page_rows
+
+    def get_paginated_response(self, data):
+        if not getattr(self, 'keyset_mode', False):
+            return super().get_paginated_response(data)
+
+        response = {}
+        if self.count is not None:
+            response['count'] = self.count
+        response['next'] = self.get_next_link()
+        response['previous'] = None
+        response['results'] = data
+        return Response(response)
+
+    def get_next_link(self):
+        if not getattr(self, 'keyset_mode', False):
+            return super().get_next_link()
+        if not self.has_next or not self.page_rows:
+            return None
+
+        last_row = self.page_rows[-1]
+        values = [self._get_value(last_row, field) for field, _ in self.ordering]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values))
+
+    def get_keyset_ordering(self, queryset):
+        """
+        Queryset sıralamasını [(alan, azalan_mı), ...] listesine çevirir
+        Benzersizlik için sona 'id' eklenir.
+        """
+        order_by = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+
+        ordering = []
+        for field in order_by:
+            if not isinstance(field, str):
+                raise ValueError('Keyset sayfalaması sadece alan adı sıralamalarını destekler.')
+            descending = field.startswith('-')
+            name = field.lstrip('-')
+            if name == 'pk':
+                name = 'id'
+            ordering.append((name, descending))
+
+        if not any(name == 'id' for name, _ in ordering):
+            last_descending = ordering[-1][1] if ordering else False
+            ordering.append(('id', last_descending))
+        return ordering
+
+    def encode_cursor(self, values):
+        payload = json.dumps(
+            [_encode_value(value) for value in values],
+            cls=DjangoJSONEncoder,
+            separators=(',', ':')
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError('invalid cursor')
+            return [_decode_value(value) for value in values]
+        except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _build_keyset_filter(self, values):
+        """
+        (a, b, id) > (va, vb, vid) karşılaştırmasını karışık yönlerle Q'ya çevirir:
+        a > va  OR  (a = va AND b > vb)  OR  (a = va AND b = vb AND id > vid)
+        """
+        keyset_filter = Q()
+        equal_prefix = Q()
+        for (field, descending), value in zip(self.ordering, values):
+            after = self._after(field, descending, value)
+            if after is not None:
+                keyset_filter |= equal_prefix & after
+            equal_prefix &= Q(**{f'{field}__isnull': True}) if value is None else Q(**{field: value})
+        return keyset_filter
+
+    def _after(self, field, descending, value):
+        """Verilen değerden sonra gelen satırlar (NULL en büyük değerdir)"""
+        if value is None:
+            # ASC: NULL'dan sonrası yok; DESC: NULL'dan sonra tüm dolu değerler
+            return Q(**{f'{field}__isnull': False}) if descending else None
+        if descending:
+            return Q(**{f'{field}__lt': value})
+        return Q(**{f'{field}__gt': value}) | Q(**{f'{field}__isnull': True})
+
+    def _get_value(self, row, field):
+        value = row
+        for part in field.split('__'):
+            value = getattr(value, part, None)
+            if value is None:
+                break
+        return value
+
+    def _is_true(self, value):
+        return value is not None and value.lower() in TRUE_VALUES
@@ -0,0 +1,113 @@
+# backend/core/search.py
+"""
+Arama altyapısı
+
+Aranabilir modeller, alanlarının Türkçe duyarlı normalize edilmiş halini
+`search_text` kolonunda tutar (İ/I/ı → i, ş → s, ğ → g, ç → c, ö → o, ü → u).
+Böylece "ŞAHİN", "sahin" ve "Şahin" aynı sonucu verir.
+
+PostgreSQL'de:
+- Eşleştirme: her kelime için search_text LIKE '%kelime%' (pg_trgm GIN indeksi)
+- Sıralama: ts_rank(search_vector, önek sorgusu) + kelime trigram benzerliği
+
+Diğer veritabanlarında aynı eşleştirme indekssiz çalışır, sıralama puanı 0'dır.
+"""
+import re
+
+from django.db.models import F, FloatField, Q, Value
+
+from .db import is_postgres
+
+
+SEARCH_CONFIG = 'simple'  # Metin zaten normalize edildiği için dil kökü bulma yok
+
+_TURKISH_UPPER_MAP = str.maketrans({'İ': 'i', 'I': 'i', 'ı': 'i'})
+_TURKISH_FOLD_MAP = str.maketrans({
+    'ş': 's', 'ğ': 'g', 'ç': 'c', 'ö': 'o', 'ü': 'u',
+    'â': 'a', 'î': 'i', 'û': 'u',
+})
+_WHITESPACE_RE = re.compile(r'\s+')
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def normalize_search_text(value):
+    """Metni Türkçe karakterleri katlayarak küçük harfe çevirir"""
+    if not value:
+        return ''
+    value = str(value).translate(_TURKISH_UPPER_MAP).lower().translate(_TURKISH_FOLD_MAP)
+    return _WHITESPACE_RE.sub(' ', value).strip()
+
+
+def build_search_text(*values):
+    """Boş olmayan değerleri normalize edip tek bir arama metninde birleştirir"""
+    return ' '.join(
+        normalized for normalized in (normalize_search_text(value) for value in values)
+        if normalized
+    )
+
+
+def search_terms(term):
+    """Arama ifadesini normalize edilmiş kelimelere böler"""
+    return normalize_search_text(term).split()
+
+
+def _prefix_query(terms):
+    """to_tsquery için güvenli önek sorgusu: 'michelin:* & 205:*'"""
+    tokens = [token for term in terms for token in _TOKEN_RE.findall(term)]
+    return ' & '.join(f"{token}:*" for token in tokens)
+
+
+def search_queryset(queryset, term, rank=False, text_field='search_text',
+                    vector_field=None, extra_filter=None):
+    """
+    Queryset'i arama ifadesine göre filtreler
+
+    Her kelime search_text içinde geçmelidir. extra_filter verilirse (ör.
+    kategori adı eşleşmesi) kelime eşleşmesine OR ile eklenir.
+    rank=True ise 'search_rank' annotate edilir; sıralamayı çağıran belirler.
+    """
+    terms = search_terms(term)
+    if not terms:
+        if rank:
+            queryset = queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+        return queryset
+
+    condition = Q()
+    for word in terms:
+        condition &= Q(**{f'{text_field}__contains': word})
+    if extra_filter is not None:
+        condition |= extra_filter
+    queryset = queryset.filter(condition)
+
+    if rank:
+        queryset = queryset.annotate(search_rank=_rank_expression(terms, text_field, vector_field))
+    return queryset
+
+
+def _rank_expression(terms, text_field, vector_field):
+    if not is_postgres():
+        return Value(0.0, output_field=FloatField())
+
+    from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+
+    phrase = ' '.join(terms)
+    similarity = TrigramWordSimilarity(phrase, text_field)
+    prefix_query = _prefix_query(terms)
+    if vector_field is None or not prefix_query:
+        return similarity
+
+    query = SearchQuery(prefix_query, search_type='raw', config=SEARCH_CONFIG)
+    return SearchRank(F(vector_field), query) + similarity
+
+
+def refresh_search_vectors(queryset, text_field='search_text', vector_field='search_vector'):
+    """
+    search_vector kolonunu search_text'ten tek bir UPDATE ile yeniden hesaplar
+    PostgreSQL dışındaki veritabanlarında vektör tutulmaz.
+    """
+    if not is_postgres(queryset.db):
+        return 0
+
+    from django.contrib.postgres.search import SearchVector
+
+    return queryset.update(**{vector_field: SearchVector(text_field, config=SEARCH_CONFIG)})
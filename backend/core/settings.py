@@ -26,6 +26,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Üçüncü Parti Uygulamalar
     'rest_framework',
@@ -162,10 +163,76 @@ CACHES = {
     }
 }
 
+# Pazaryeri önbellekleri sürüm sayaçlarıyla geçersiz kılındığı için uzun yaşayabilir
+MARKET_CACHE_TIMEOUT = int(os.environ.get("MARKET_CACHE_TIMEOUT", 6 * 60 * 60))  # 6 saat
+
 # Celery Ayarları
 CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL")
 CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND_URL")
 
+# Periyodik görevler (celery beat)
+MARKETPLACE_SNAPSHOT_INTERVAL = int(os.environ.get("MARKETPLACE_SNAPSHOT_INTERVAL", 5 * 60))
+# Sepet stok rezervasyonları: tutma süresi ve temizleyici aralığı (saniye)
+STOCK_RESERVATION_TTL = int(os.environ.get("STOCK_RESERVATION_TTL", 15 * 60))
+STOCK_RESERVATION_SWEEP_INTERVAL = int(os.environ.get("STOCK_RESERVATION_SWEEP_INTERVAL", 60))
+# Sipariş olayları giden kutusu: relay aralığı (saniye), parti boyutu ve saklama süresi (gün)
+ORDER_OUTBOX_RELAY_INTERVAL = float(os.environ.get("ORDER_OUTBOX_RELAY_INTERVAL", 5))
+ORDER_OUTBOX_BATCH_SIZE = int(os.environ.get("ORDER_OUTBOX_BATCH_SIZE", 500))
+ORDER_OUTBOX_RETENTION_DAYS = int(os.environ.get("ORDER_OUTBOX_RETENTION_DAYS", 7))
+# Tüketici kilidi süresi (saniye): bu süre içinde tamamlanmayan olay yeniden yayınlanır
+ORDER_OUTBOX_CLAIM_TIMEOUT = int(os.environ.get("ORDER_OUTBOX_CLAIM_TIMEOUT", 5 * 60))
+ORDER_OUTBOX_MAX_ATTEMPTS = int(os.environ.get("ORDER_OUTBOX_MAX_ATTEMPTS", 10))
+# Sipariş arşivi: kaç aydan eski kapanmış siparişler taşınır, kaç ay ileriye bölüm açılır
+ORDER_ARCHIVE_AFTER_MONTHS = int(os.environ.get("ORDER_ARCHIVE_AFTER_MONTHS", 12))
+ORDER_ARCHIVE_PARTITIONS_AHEAD = int(os.environ.get("ORDER_ARCHIVE_PARTITIONS_AHEAD", 3))
+CELERY_BEAT_SCHEDULE = {
+    'refresh-marketplace-snapshot': {
+        'task': 'market.tasks.refresh_marketplace_snapshot',
+        'schedule': MARKETPLACE_SNAPSHOT_INTERVAL,
+    },
+    'release-expired-reservations': {
+        'task': 'inventory.tasks.release_expired_reservations',
+        'schedule': STOCK_RESERVATION_SWEEP_INTERVAL,
+    },
+    'relay-order-outbox': {
+        'task': 'orders.tasks.relay_order_outbox',
+        'schedule': ORDER_OUTBOX_RELAY_INTERVAL,
+    },
+    'flag-stale-orders': {
+        'task': 'orders.tasks.update_order_status_batch',
+        'schedule': 24 * 60 * 60,
+    },
+    'archive-orders': {
+        'task': 'orders.tasks.archive_old_orders',
+        'schedule': 24 * 60 * 60,
+    },
+    'prune-order-outbox': {
+        'task': 'orders.tasks.prune_order_outbox',
+        'schedule': 24 * 60 * 60,
+    },
+    'prune-idempotency-records': {
+        'task': 'core.tasks.prune_idempotency_records',
+        'schedule': 60 * 60,
+    },
+}
+
+# Idempotency-Key: yanıt saklama süresi, işleme kilidi ve eşzamanlı tekrarın bekleme süresi (saniye)
+IDEMPOTENCY_TTL = int(os.environ.get("IDEMPOTENCY_TTL", 24 * 60 * 60))
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.environ.get("IDEMPOTENCY_LOCK_TIMEOUT", 60))
+IDEMPOTENCY_WAIT = int(os.environ.get("IDEMPOTENCY_WAIT", 10))
+
+# Toptancı sipariş bildirimleri
+# Gerçek API çağrısı kapalıyken yanıt simüle edilir
+WHOLESALER_API_NOTIFICATIONS_ENABLED = os.environ.get("WHOLESALER_API_NOTIFICATIONS_ENABLED", "False").lower() in ("true", "1", "t")
+NOTIFICATION_CONNECT_TIMEOUT = float(os.environ.get("NOTIFICATION_CONNECT_TIMEOUT", 3))
+NOTIFICATION_READ_TIMEOUT = float(os.environ.get("NOTIFICATION_READ_TIMEOUT", 10))
+NOTIFICATION_MAX_RETRIES = int(os.environ.get("NOTIFICATION_MAX_RETRIES", 3))
+# Bu süreden (saniye) uzun boşta kalan SMTP bağlantısı gönderimden önce NOOP ile denetlenir
+NOTIFICATION_SMTP_IDLE_CHECK = int(os.environ.get("NOTIFICATION_SMTP_IDLE_CHECK", 30))
+# Devre kesici: art arda hata eşiği ve kanalın kapalı kalacağı süre (saniye)
+NOTIFICATION_CIRCUIT_THRESHOLD = int(os.environ.get("NOTIFICATION_CIRCUIT_THRESHOLD", 5))
+NOTIFICATION_CIRCUIT_COOLDOWN = int(os.environ.get("NOTIFICATION_CIRCUIT_COOLDOWN", 5 * 60))
+
 # Debug Toolbar Ayarları (Docker içinden erişim için)
 INTERNAL_IPS = [
     "127.0.0.1",
@@ -0,0 +1,147 @@
+# backend/core/streaming.py
+"""
+Akış (streaming) ile dışa aktarım yardımcıları
+
+Satırlar bir generator'dan okunup NDJSON veya CSV olarak parça parça
+gönderilir; yanıtın tamamı hiçbir zaman bellekte tutulmaz. Queryset'ler
+`.iterator(chunk_size=...)` ile okunmalıdır (PostgreSQL'de sunucu tarafı cursor).
+
+XLSX bir zip arşivi olduğundan parça parça gönderilemez: openpyxl write-only
+modunda geçici dosyaya yazılır, ardından dosya akışla gönderilir. Bellek
+kullanımı yine satır sayısından bağımsızdır; openpyxl isteğe bağlıdır.
+"""
+import csv
+import json
+import tempfile
+from datetime import datetime, time, timezone as dt_timezone
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework.exceptions import ValidationError
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # openpyxl isteğe bağlı; XLSX biçimi devre dışı kalır
+    Workbook = None
+
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Excel çalışma sayfası sınırı (başlık satırı hariç)
+XLSX_MAX_ROWS = 1048575
+
+
+class _Echo:
+    """csv.writer için yazdığını geri döndüren sahte dosya"""
+
+    def write(self, value):
+        return value
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def csv_lines(fieldnames, rows):
+    writer = csv.DictWriter(_Echo(), fieldnames=fieldnames, extrasaction='ignore')
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _xlsx_value(value):
+    # Excel saat dilimi bilgisi taşımaz; yerel saate çevrilir
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        return timezone.make_naive(value)
+    return value
+
+
+def xlsx_file(fieldnames, rows):
+    """
+    Satırları write-only çalışma kitabıyla geçici dosyaya yazar
+    Dönüş: başa sarılmış dosya nesnesi
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(fieldnames)
+    for count, row in enumerate(rows, 1):
+        if count > XLSX_MAX_ROWS:
+            raise ValidationError({
+                'export_format': f'XLSX en fazla {XLSX_MAX_ROWS} satır alabilir. Aralığı daraltın veya csv/ndjson kullanın.'
+            })
+        sheet.append([_xlsx_value(row.get(name)) for name in fieldnames])
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+def get_export_format(request, param='export_format', default='ndjson'):
+    """
+    İstenen dışa aktarım biçimi
+    DRF 'format' parametresini içerik müzakeresi için ayırdığından ayrı bir isim kullanılır.
+    """
+    export_format = request.query_params.get(param, default).lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValidationError({param: f"Desteklenen biçimler: {', '.join(EXPORT_FORMATS)}"})
+    if export_format == 'xlsx' and Workbook is None:
+        raise ValidationError({param: 'XLSX dışa aktarımı bu sunucuda kullanılamıyor (openpyxl kurulu değil).'})
+    return export_format
+
+
+def export_response(rows, export_format, filename, fieldnames, last_modified=None):
+    """Satır generator'ından akış yanıtı oluşturur"""
+    if export_format == 'xlsx':
+        response = FileResponse(xlsx_file(fieldnames, rows), content_type=EXPORT_FORMATS[export_format])
+    else:
+        if export_format == 'csv':
+            lines = csv_lines(fieldnames, rows)
+        else:
+            lines = ndjson_lines(rows)
+        response = StreamingHttpResponse(lines, content_type=EXPORT_FORMATS[export_format])
+
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    # Ters proxy'nin (nginx) yanıtı tamponlamasını engelle
+    response['X-Accel-Buffering'] = 'no'
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def get_since(request, param='since'):
+    """
+    Delta dışa aktarım başlangıcı
+
+    Önce ?since= (ISO tarih/zaman), yoksa If-Modified-Since başlığı okunur.
+    Dönüş: timezone-aware datetime veya None
+    """
+    value = request.query_params.get(param)
+    if value:
+        since = parse_datetime(value)
+        if since is None:
+            date = parse_date(value)
+            if date is None:
+                raise ValidationError({param: 'Geçersiz tarih. ISO 8601 biçimi kullanın.'})
+            since = datetime.combine(date, time.min)
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    header = request.headers.get('If-Modified-Since')
+    if header:
+        timestamp = parse_http_date_safe(header)
+        if timestamp is not None:
+            return datetime.fromtimestamp(timestamp, tz=dt_timezone.utc)
+
+    return None
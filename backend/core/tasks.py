@@ -0,0 +1,21 @@
+# backend/core/tasks.py
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def prune_idempotency_records():
+    """
+    Süresi dolan Idempotency-Key kayıtlarını siler (Celery beat ile periyodik)
+    """
+    from .idempotency import prune_idempotency_records as prune
+
+    deleted = prune()
+    if deleted:
+        logger.info(f"Pruned {deleted} expired idempotency records")
+    return {
+        'success': True,
+        'deleted': deleted,
+    }
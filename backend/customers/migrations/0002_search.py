@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Ad, şirket adı, e-posta, telefon ve müşteri kodunun normalize edilmiş hali', verbose_name='Arama Metni'),
+        ),
+    ]
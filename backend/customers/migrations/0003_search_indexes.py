@@ -0,0 +1,42 @@
+from django.db import migrations
+
+from core.db import postgres_only_sql
+from core.search import build_search_text
+
+
+def backfill_search_text(apps, schema_editor):
+    Customer = apps.get_model('customers', 'Customer')
+
+    batch = []
+    fields = ['id', 'name', 'company_name', 'email', 'phone', 'customer_code']
+    for customer in Customer.objects.only(*fields).iterator(chunk_size=1000):
+        phone_digits = ''.join(ch for ch in (customer.phone or '') if ch.isdigit())
+        customer.search_text = build_search_text(
+            customer.name, customer.company_name, customer.email,
+            customer.phone, phone_digits, customer.customer_code
+        )
+        batch.append(customer)
+        if len(batch) >= 1000:
+            Customer.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        Customer.objects.bulk_update(batch, ['search_text'])
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY transaction içinde çalışamaz
+    atomic = False
+
+    dependencies = [
+        ('customers', '0002_search'),
+        ('products', '0005_search_indexes'),  # pg_trgm eklentisi
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        postgres_only_sql(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS customers_customer_search_text_trgm "
+            "ON customers_customer USING gin (search_text gin_trgm_ops)",
+            "DROP INDEX CONCURRENTLY IF EXISTS customers_customer_search_text_trgm",
+        ),
+    ]
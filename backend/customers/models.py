@@ -3,6 +3,8 @@ from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 
+from core.search import build_search_text
+
 class Customer(models.Model):
     """
     Müşteri modeli - Toptancıların müşterilerini takip etmek için
@@ -105,10 +107,21 @@ class Customer(models.Model):
     # Notlar
     notes = models.TextField(_('Notlar'), blank=True, null=True)
     
+    # Arama (core.search) - save() ile güncellenir
+    search_text = models.TextField(
+        _('Arama Metni'),
+        blank=True,
+        default='',
+        editable=False,
+        help_text=_('Ad, şirket adı, e-posta, telefon ve müşteri kodunun normalize edilmiş hali')
+    )
+    
     # Meta bilgiler
     created_at = models.DateTimeField(_('Oluşturulma Tarihi'), auto_now_add=True)
     updated_at = models.DateTimeField(_('Güncellenme Tarihi'), auto_now=True)
     
+    SEARCH_FIELDS = ('name', 'company_name', 'email', 'phone', 'customer_code')
+    
     class Meta:
         verbose_name = _('Müşteri')
         verbose_name_plural = _('Müşteriler')
@@ -124,6 +137,23 @@ class Customer(models.Model):
         display_name = self.company_name if self.company_name else self.name
         return f"{display_name} - {self.wholesaler.name}"
     
+    def save(self, *args, **kwargs):
+        """Arama metnini günceller"""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(self.SEARCH_FIELDS):
+            self.search_text = self.build_search_text()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'search_text'}
+        super().save(*args, **kwargs)
+    
+    def build_search_text(self):
+        # Telefon hem yazıldığı gibi hem sadece rakamlarıyla aranabilsin
+        phone_digits = ''.join(ch for ch in (self.phone or '') if ch.isdigit())
+        return build_search_text(
+            self.name, self.company_name, self.email,
+            self.phone, phone_digits, self.customer_code
+        )
+    
     def get_full_name(self):
         """Müşterinin tam adını döndürür"""
         if self.customer_type == 'business' and self.company_name:
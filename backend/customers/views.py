@@ -2,11 +2,12 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db import models
-from django.db.models import Count, Sum, Avg, Q
+from django.db.models import Count, Sum, Avg
 from django.utils import timezone
 from datetime import timedelta
 from django.db.models.functions import Coalesce
 
+from core.search import search_queryset
 from subscriptions.permissions import HasCustomerManagementAccess
 from .models import Customer, CustomerVisit, StoredTire
 from .serializers import (
@@ -56,13 +57,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
         # Arama
         search = self.request.query_params.get('search', None)
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) |
-                Q(company_name__icontains=search) |
-                Q(email__icontains=search) |
-                Q(phone__icontains=search) |
-                Q(customer_code__icontains=search)
-            )
+            queryset = search_queryset(queryset, search)
         
         return queryset
     
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.db.models import Sum, Count
-from .models import Warehouse, StockItem
+from .models import Warehouse, StockItem, StockReservation
 
 @admin.register(Warehouse)
 class WarehouseAdmin(admin.ModelAdmin):
@@ -248,4 +248,26 @@ class StockItemInline(admin.TabularInline):
         return super().get_queryset(request).select_related('product')
 
 # StockItemInline'ı WarehouseAdmin'e eklemek için:
-# WarehouseAdmin.inlines = [StockItemInline]
\ No newline at end of file
+# WarehouseAdmin.inlines = [StockItemInline]
+
+
+@admin.register(StockReservation)
+class StockReservationAdmin(admin.ModelAdmin):
+    list_display = [
+        'stock_item',
+        'company',
+        'quantity',
+        'status',
+        'expires_at',
+        'order',
+        'created_at'
+    ]
+    list_filter = ['status', 'expires_at']
+    search_fields = ['company__name', 'stock_item__product__name', 'stock_item__product__sku']
+    raw_id_fields = ['stock_item', 'company', 'user', 'order']
+    readonly_fields = ['created_at', 'updated_at']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'stock_item__product', 'company', 'order'
+        )
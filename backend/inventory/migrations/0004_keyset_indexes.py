@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_stockitem_barcode'),
+        ('products', '0003_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stockitem',
+            index=models.Index(fields=['warehouse', '-updated_at', '-id'], name='inventory_s_warehou_d46061_idx'),
+        ),
+    ]
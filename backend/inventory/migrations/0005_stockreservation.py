@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:17
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_retailerwholesaler_discount_rate'),
+        ('inventory', '0004_keyset_indexes'),
+        ('orders', '0004_order_number_trgm_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockReservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)], verbose_name='Miktar')),
+                ('status', models.CharField(choices=[('active', 'Aktif'), ('converted', 'Siparişe Dönüştü'), ('released', 'Serbest Bırakıldı'), ('expired', 'Süresi Doldu')], default='active', max_length=20, verbose_name='Durum')),
+                ('expires_at', models.DateTimeField(verbose_name='Bitiş Zamanı')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_reservations', to='companies.company', verbose_name='Perakendeci')),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_reservations', to='orders.order', verbose_name='Sipariş')),
+                ('stock_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='inventory.stockitem', verbose_name='Stok Kalemi')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_reservations', to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+            ],
+            options={
+                'verbose_name': 'Stok Rezervasyonu',
+                'verbose_name_plural': 'Stok Rezervasyonları',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'expires_at'], name='inventory_s_status_c656ef_idx'), models.Index(fields=['company', 'status'], name='inventory_s_company_b720e3_idx')],
+            },
+        ),
+    ]
@@ -82,6 +82,13 @@ class Warehouse(models.Model):
     def __str__(self):
         return f"{self.company.name} - {self.name} ({self.code})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Sadece aktiflik değişirse depodaki ürünlerin en iyi teklifi yenilenir (market.signals)
+        instance._loaded_is_active = instance.__dict__.get('is_active')
+        return instance
+    
     def get_total_stock_value(self):
         """Depodaki toplam stok değerini hesaplar"""
         total = Decimal('0.00')
@@ -229,11 +236,20 @@ class StockItem(models.Model):
             models.Index(fields=['product', 'warehouse']),
             models.Index(fields=['warehouse', 'quantity']),
             models.Index(fields=['expiry_date']),
+            # Keyset sayfalaması (-updated_at, -id)
+            models.Index(fields=['warehouse', '-updated_at', '-id']),
         ]
     
     def __str__(self):
         return f"{self.product.name} - {self.warehouse.name} ({self.quantity} adet)"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Ürün değiştirilirse eski ürünün en iyi teklifi de yenilenir (market.signals)
+        instance._loaded_product_id = instance.__dict__.get('product_id')
+        return instance
+    
     def get_available_quantity(self):
         """Satılabilir (rezerve edilmemiş) miktarı döndürür"""
         return max(0, self.quantity - self.reserved_quantity)
@@ -414,4 +430,82 @@ class PriceHistory(models.Model):
             return f"₺{self.old_sale_price} → ₺{self.new_sale_price}"
         elif self.new_sale_price:
             return f"₺{self.new_sale_price} (yeni)"
-        return ""
\ No newline at end of file
+        return ""
+
+class StockReservation(models.Model):
+    """
+    Süreli stok tutma (sepet rezervasyonu)
+
+    Aktif rezervasyonların toplamı StockItem.reserved_quantity'ye yansır.
+    Sipariş oluşturulunca 'converted', süresi dolunca periyodik temizleyici
+    tarafından 'expired' olarak işaretlenir ve rezerve miktar serbest bırakılır.
+    """
+    STATUS_CHOICES = [
+        ('active', _('Aktif')),
+        ('converted', _('Siparişe Dönüştü')),
+        ('released', _('Serbest Bırakıldı')),
+        ('expired', _('Süresi Doldu')),
+    ]
+    
+    stock_item = models.ForeignKey(
+        StockItem,
+        on_delete=models.CASCADE,
+        related_name='reservations',
+        verbose_name=_('Stok Kalemi')
+    )
+    company = models.ForeignKey(
+        'companies.Company',
+        on_delete=models.CASCADE,
+        related_name='stock_reservations',
+        verbose_name=_('Perakendeci')
+    )
+    user = models.ForeignKey(
+        'users.User',
+        on_delete=models.SET_NULL,
+        related_name='stock_reservations',
+        verbose_name=_('Kullanıcı'),
+        blank=True,
+        null=True
+    )
+    order = models.ForeignKey(
+        'orders.Order',
+        on_delete=models.SET_NULL,
+        related_name='stock_reservations',
+        verbose_name=_('Sipariş'),
+        blank=True,
+        null=True
+    )
+    
+    quantity = models.PositiveIntegerField(
+        _('Miktar'),
+        validators=[MinValueValidator(1)]
+    )
+    status = models.CharField(
+        _('Durum'),
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='active'
+    )
+    expires_at = models.DateTimeField(_('Bitiş Zamanı'))
+    
+    # Meta bilgiler
+    created_at = models.DateTimeField(_('Oluşturulma Tarihi'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('Güncellenme Tarihi'), auto_now=True)
+    
+    class Meta:
+        verbose_name = _('Stok Rezervasyonu')
+        verbose_name_plural = _('Stok Rezervasyonları')
+        ordering = ['-created_at']
+        indexes = [
+            # Temizleyici: WHERE status = 'active' AND expires_at <= now()
+            models.Index(fields=['status', 'expires_at']),
+            models.Index(fields=['company', 'status']),
+        ]
+    
+    def __str__(self):
+        return f"{self.company.name} - {self.stock_item.product.name} ({self.quantity} adet, {self.status})"
+    
+    def is_expired(self):
+        """Süresi dolmuş mu?"""
+        from django.utils import timezone
+        return self.expires_at <= timezone.now()
@@ -0,0 +1,335 @@
+# backend/inventory/services.py
+"""
+Stok hareketleri için toplu (set tabanlı) işlemler
+
+Sipariş gibi çok kalemli işlemler stok kalemlerini tek tek kaydetmek yerine
+tek bir UPDATE ... CASE sorgusuyla günceller. Toplu update() sinyalleri
+tetiklemediği için çağıran taraf market.offers.stock_changed_on_commit() ile
+en iyi teklifleri commit sonrası yenilemelidir.
+
+Eşzamanlı siparişlerde fazla satışı önlemek için:
+- Satırlar her zaman id sırasıyla kilitlenir (SELECT ... FOR UPDATE ORDER BY id);
+  birden fazla stok kalemi içeren işlemler birbirini kilitlenmeye (deadlock) sokmaz.
+- Düşme işlemi koşulludur: WHERE quantity - reserved_quantity >= n.
+  Koşulu sağlamayan satır varsa hiçbir satır değişmez ve InsufficientStockError yükselir.
+
+Sepet rezervasyonları (StockReservation) reserved_quantity'yi artırır; kilit
+sırası her zaman önce rezervasyonlar, sonra stok kalemleridir.
+"""
+from collections import namedtuple
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest, Now
+from django.utils import timezone
+
+from .models import StockItem, StockReservation
+
+
+StockShortage = namedtuple('StockShortage', [
+    'stock_item_id',
+    'product_id',
+    'requested',
+    'available',
+])
+
+
+class InsufficientStockError(Exception):
+    """Bir veya daha fazla stok kaleminde istenen miktar kadar satılabilir stok yok"""
+
+    def __init__(self, shortages):
+        self.shortages = list(shortages)
+        super().__init__(
+            ', '.join(
+                f'stock_item={s.stock_item_id} requested={s.requested} available={s.available}'
+                for s in self.shortages
+            )
+        )
+
+    def as_dict(self):
+        return [shortage._asdict() for shortage in self.shortages]
+
+
+def lock_stock_items(stock_item_ids):
+    """
+    Stok kalemlerini deterministik sırada (id) kilitler
+    transaction.atomic içinde çağrılmalıdır. SQLite'ta FOR UPDATE yok sayılır
+    (yazma işlemleri zaten sıralıdır).
+    Dönüş: {id: (product_id, quantity, reserved_quantity)} (satılabilir kalemler)
+    """
+    rows = StockItem.objects.select_for_update().filter(
+        pk__in=stock_item_ids,
+        is_active=True,
+        is_sellable=True
+    ).order_by('pk').values_list('pk', 'product_id', 'quantity', 'reserved_quantity')
+    return {pk: (product_id, quantity, reserved) for pk, product_id, quantity, reserved in rows}
+
+
+def _quantity_case(quantities):
+    """{id: miktar} eşlemesinden satır bazında miktar ifadesi"""
+    return Case(
+        *[When(pk=pk, then=Value(qty)) for pk, qty in quantities.items()],
+        default=Value(0),
+        output_field=IntegerField()
+    )
+
+
+def _lock_active_holds(holds, stock_item_ids=None):
+    """
+    Aktif rezervasyonları id sırasıyla kilitler
+    Dönüş: (rezervasyon id listesi, {stock_item_id: tutulan miktar})
+    """
+    holds = holds.filter(status='active')
+    if stock_item_ids is not None:
+        holds = holds.filter(stock_item_id__in=stock_item_ids)
+
+    hold_ids = []
+    held = {}
+    for pk, stock_item_id, quantity in holds.select_for_update().order_by('pk').values_list(
+        'pk', 'stock_item_id', 'quantity'
+    ):
+        hold_ids.append(pk)
+        held[stock_item_id] = held.get(stock_item_id, 0) + quantity
+    return hold_ids, held
+
+
+def decrement_stock(quantities, holds=None, order=None):
+    """
+    Stok kalemlerinden verilen miktarları atomik olarak düşer
+
+    quantities: {stock_item_id: düşülecek miktar}
+    holds: alıcının StockReservation queryset'i (ör. şirketin rezervasyonları).
+        Bu stok kalemlerindeki aktif rezervasyonlar siparişe dönüştürülür;
+        tuttukları miktar kullanılabilir stoğa sayılır ve reserved_quantity'den düşülür.
+    Ya tüm kalemler düşülür ya da hiçbiri; yetersiz stokta InsufficientStockError.
+    transaction.atomic içinde çağrılmalıdır.
+    Dönüş: güncellenen satır sayısı
+    """
+    quantities = {pk: qty for pk, qty in quantities.items() if qty}
+    if not quantities:
+        return 0
+
+    hold_ids, held = [], {}
+    if holds is not None:
+        hold_ids, held = _lock_active_holds(holds, quantities.keys())
+
+    locked = lock_stock_items(quantities.keys())
+
+    shortages = []
+    for pk, qty in sorted(quantities.items()):
+        product_id, quantity, reserved = locked.get(pk, (None, 0, 0))
+        available = max(0, quantity - max(0, reserved - held.get(pk, 0)))
+        if available < qty:
+            shortages.append(StockShortage(pk, product_id, qty, available))
+    if shortages:
+        raise InsufficientStockError(shortages)
+
+    # Kilit altında da koşul korunur: stok yetmeyen satır güncellenmez
+    condition = reduce(or_, (
+        Q(pk=pk, quantity__gte=F('reserved_quantity') - held.get(pk, 0) + qty)
+        for pk, qty in quantities.items()
+    ))
+    updates = {
+        'quantity': F('quantity') - _quantity_case(quantities),
+        'last_outbound_date': Now(),
+        'updated_at': Now(),
+    }
+    if held:
+        updates['reserved_quantity'] = Greatest(
+            F('reserved_quantity') - _quantity_case(held), Value(0)
+        )
+    updated = StockItem.objects.filter(condition).update(**updates)
+
+    if updated != len(quantities):
+        # Kilit alınamayan bir veritabanında eşzamanlı değişiklik; çağıranın
+        # transaction'ı geri alınmalı
+        raise InsufficientStockError(
+            StockShortage(pk, locked.get(pk, (None,))[0], qty, None)
+            for pk, qty in sorted(quantities.items())
+        )
+
+    if hold_ids:
+        StockReservation.objects.filter(pk__in=hold_ids).update(
+            status='converted', order=order, updated_at=Now()
+        )
+    return updated
+
+
+def increment_stock(quantities):
+    """
+    Stok kalemlerine verilen miktarları geri ekler (iptal/iade)
+
+    quantities: {stock_item_id: eklenecek miktar}
+    Tek UPDATE ... SET quantity = quantity + CASE ...; okuma-değiştirme-yazma
+    yapılmadığı için eşzamanlı siparişlerle yarışmaz. Pasif veya satışa
+    kapalı kalemler de stoğu geri alır.
+    transaction.atomic içinde çağrılmalıdır.
+    Dönüş: etkilenen ürün id'leri
+    """
+    quantities = {pk: qty for pk, qty in quantities.items() if qty}
+    if not quantities:
+        return set()
+
+    # Kilit sırası decrement_stock ile aynı (id)
+    product_ids = set(
+        StockItem.objects.select_for_update().filter(
+            pk__in=quantities.keys()
+        ).order_by('pk').values_list('product_id', flat=True)
+    )
+    StockItem.objects.filter(pk__in=quantities.keys()).update(
+        quantity=F('quantity') + _quantity_case(quantities),
+        updated_at=Now()
+    )
+    return product_ids
+
+
+def get_reservation_ttl():
+    """Sepet rezervasyon süresi (saniye)"""
+    return getattr(settings, 'STOCK_RESERVATION_TTL', 15 * 60)
+
+
+def reserve_stock(company, quantities, user=None, ttl=None):
+    """
+    Sepet için stok tutar (süreli rezervasyon)
+
+    Şirketin önceki aktif rezervasyonları serbest bırakılır; sepet her
+    hesaplandığında tutulan miktarlar yeniden belirlenir. Kısa bir transaction
+    içinde çalışır; ödeme adımı boyunca satır kilidi tutulmaz.
+    Yetersiz stokta InsufficientStockError (hiçbir şey tutulmaz).
+    Dönüş: oluşturulan StockReservation listesi
+    """
+    quantities = {pk: qty for pk, qty in quantities.items() if qty}
+    ttl = get_reservation_ttl() if ttl is None else ttl
+    expires_at = timezone.now() + timedelta(seconds=ttl)
+
+    with transaction.atomic():
+        released = release_reservations(
+            StockReservation.objects.filter(company=company), status='released'
+        )
+        if not quantities:
+            _stock_changed(released)
+            return []
+
+        locked = lock_stock_items(quantities.keys())
+
+        shortages = []
+        for pk, qty in sorted(quantities.items()):
+            product_id, quantity, reserved = locked.get(pk, (None, 0, 0))
+            available = max(0, quantity - reserved)
+            if available < qty:
+                shortages.append(StockShortage(pk, product_id, qty, available))
+        if shortages:
+            raise InsufficientStockError(shortages)
+
+        condition = reduce(or_, (
+            Q(pk=pk, quantity__gte=F('reserved_quantity') + qty)
+            for pk, qty in quantities.items()
+        ))
+        updated = StockItem.objects.filter(condition).update(
+            reserved_quantity=F('reserved_quantity') + _quantity_case(quantities),
+            updated_at=Now()
+        )
+        if updated != len(quantities):
+            raise InsufficientStockError(
+                StockShortage(pk, locked.get(pk, (None,))[0], qty, None)
+                for pk, qty in sorted(quantities.items())
+            )
+
+        reservations = StockReservation.objects.bulk_create([
+            StockReservation(
+                stock_item_id=pk,
+                company=company,
+                user=user,
+                quantity=qty,
+                expires_at=expires_at
+            )
+            for pk, qty in sorted(quantities.items())
+        ])
+
+        _stock_changed({product_id for product_id, _, _ in locked.values()} | released)
+
+    return reservations
+
+
+def release_reservations(reservations, status='released'):
+    """
+    Aktif rezervasyonları serbest bırakır (set tabanlı)
+
+    Rezervasyonlar kilitlenip durumları güncellenir, tutulan miktarlar stok
+    kalemi başına toplanıp tek UPDATE ile reserved_quantity'den düşülür.
+    En iyi teklifler burada yenilenmez; etkilenen ürün id'leri döner.
+    """
+    return _release_holds(reservations, status)[1]
+
+
+def _release_holds(reservations, status):
+    """release_reservations() gövdesi; (serbest bırakılan sayısı, ürün id'leri) döndürür"""
+    with transaction.atomic():
+        hold_ids, held = _lock_active_holds(reservations)
+        if not hold_ids:
+            return 0, set()
+
+        released = StockReservation.objects.filter(pk__in=hold_ids).update(
+            status=status, updated_at=Now()
+        )
+
+        # Kilit sırası: rezervasyonlar, sonra stok kalemleri (id sırasıyla)
+        product_ids = set(
+            StockItem.objects.select_for_update().filter(
+                pk__in=held.keys()
+            ).order_by('pk').values_list('product_id', flat=True)
+        )
+        StockItem.objects.filter(pk__in=held.keys()).update(
+            reserved_quantity=Greatest(F('reserved_quantity') - _quantity_case(held), Value(0)),
+            updated_at=Now()
+        )
+    return released, product_ids
+
+
+def release_company_holds(company):
+    """Şirketin aktif sepet rezervasyonlarını bırakır ve en iyi teklifleri yeniler"""
+    product_ids = release_reservations(StockReservation.objects.filter(company=company))
+    _stock_changed(product_ids)
+    return product_ids
+
+
+def sweep_expired_reservations(batch_size=1000):
+    """
+    Süresi dolan rezervasyonları toplu olarak serbest bırakır
+
+    Her parti kısa bir transaction'da işlenir (status, expires_at indeksi).
+    Dönüş: serbest bırakılan rezervasyon sayısı
+    """
+    total = 0
+    while True:
+        batch_ids = list(
+            StockReservation.objects.filter(
+                status='active',
+                expires_at__lte=timezone.now()
+            ).order_by('expires_at').values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch_ids:
+            break
+
+        # Bu arada ödenen/bırakılan rezervasyonlar sayılmaz
+        released, product_ids = _release_holds(
+            StockReservation.objects.filter(pk__in=batch_ids, expires_at__lte=timezone.now()),
+            status='expired'
+        )
+        _stock_changed(product_ids)
+        total += released
+
+        if len(batch_ids) < batch_size:
+            break
+    return total
+
+
+def _stock_changed(product_ids):
+    # market -> inventory bağımlılığı tek yönlü kalsın diye geç import
+    from market.offers import stock_changed_on_commit
+    # Commit sonrası: yenileme sadece commit edilmiş stoğu okur
+    stock_changed_on_commit(product_ids)
@@ -0,0 +1,21 @@
+# backend/inventory/tasks.py
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def release_expired_reservations():
+    """
+    Süresi dolan sepet rezervasyonlarını serbest bırakır (Celery beat ile periyodik)
+    """
+    from .services import sweep_expired_reservations
+
+    released = sweep_expired_reservations()
+    if released:
+        logger.info(f"Released {released} expired stock reservations")
+    return {
+        'success': True,
+        'released': released,
+    }
@@ -18,6 +18,10 @@ from .serializers import (
     BulkPriceUpdateSerializer
 )
 from products.models import Product
+from core.conditional import conditional_view, probe_queryset
+from core.idempotency import idempotent
+from core.pagination import CursorOptInPagination
+from products.specs import apply_spec_filters
 
 
 class WarehouseViewSet(viewsets.ModelViewSet):
@@ -162,8 +166,11 @@ class StockItemViewSet(viewsets.ModelViewSet):
     GET /api/v1/inventory/stock-items/{id}/ - Stok detayı
     PUT/PATCH /api/v1/inventory/stock-items/{id}/ - Stok güncelle
     DELETE /api/v1/inventory/stock-items/{id}/ - Stok sil
+
+    Liste ?cursor= ile keyset sayfalamasına geçer (?no_count=true ile COUNT atlanır).
     """
     permission_classes = [IsAuthenticated]
+    pagination_class = CursorOptInPagination
     
     def get_queryset(self):
         """Kullanıcının sadece kendi depolarındaki stokları görmesini sağlar"""
@@ -184,12 +191,7 @@ class StockItemViewSet(viewsets.ModelViewSet):
             stock_status = self.request.query_params.get('status')
             search = self.request.query_params.get('search')
             
-            # Ürün özellik filtreleri
-            tire_width = self.request.query_params.get('tire_width')
-            tire_aspect_ratio = self.request.query_params.get('tire_aspect_ratio')
-            tire_diameter = self.request.query_params.get('tire_diameter')
-            battery_ampere = self.request.query_params.get('battery_ampere')
-            rim_size = self.request.query_params.get('rim_size')
+            # Ürün özellik filtreleri (tipli kolonlar, products.specs)
             rim_bolt_pattern = self.request.query_params.get('rim_bolt_pattern')
             
             if warehouse_id:
@@ -204,21 +206,8 @@ class StockItemViewSet(viewsets.ModelViewSet):
             if brand:
                 queryset = queryset.filter(product__brand__icontains=brand)
             
-            # Ürün özellik filtreleri
-            if tire_width:
-                queryset = queryset.filter(product__tire_width=tire_width)
-            
-            if tire_aspect_ratio:
-                queryset = queryset.filter(product__tire_aspect_ratio=tire_aspect_ratio)
-            
-            if tire_diameter:
-                queryset = queryset.filter(product__tire_diameter=tire_diameter)
-            
-            if battery_ampere:
-                queryset = queryset.filter(product__battery_ampere=battery_ampere)
-            
-            if rim_size:
-                queryset = queryset.filter(product__rim_size=rim_size)
+            # Ürün özellik filtreleri: tam değer, _min/_max aralıkları ve ?spec=225/45R17
+            queryset = apply_spec_filters(queryset, self.request.query_params, prefix='product__')
             
             if rim_bolt_pattern:
                 queryset = queryset.filter(product__rim_bolt_pattern=rim_bolt_pattern)
@@ -359,6 +348,7 @@ class StockItemViewSet(viewsets.ModelViewSet):
         })
     
     @action(detail=False, methods=['post'], url_path='bulk-price-update')
+    @idempotent
     def bulk_price_update(self, request):
         """
         Toplu fiyat güncelleme (zam/indirim)
@@ -439,6 +429,7 @@ class StockItemViewSet(viewsets.ModelViewSet):
 
     
     @action(detail=True, methods=['post'])
+    @idempotent
     def stock_movement(self, request, pk=None):
         """
         Stok hareketi (giriş/çıkış) kaydetme
@@ -521,8 +512,24 @@ class StockItemViewSet(viewsets.ModelViewSet):
         })
 
 
+def inventory_summary_validators(request):
+    """Envanter özeti: şirketin stok kalemleri ve depoları üzerinde MAX(updated_at) + COUNT"""
+    company = getattr(request.user, 'company', None)
+    if company is None:
+        return None, None
+    
+    stock_latest, stock_count = probe_queryset(StockItem.objects.filter(warehouse__company=company))
+    warehouse_latest, warehouse_count = probe_queryset(Warehouse.objects.filter(company=company))
+    latest = max(
+        (value for value in (stock_latest, warehouse_latest, company.updated_at) if value),
+        default=None
+    )
+    return (company.id, latest, stock_count, warehouse_count), latest
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_view(inventory_summary_validators)
 def inventory_summary(request):
     """
     Kullanıcının genel envanter özeti
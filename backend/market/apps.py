@@ -5,4 +5,8 @@ from django.apps import AppConfig
 class MarketConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'market'
-    verbose_name = 'B2B Pazaryeri'
\ No newline at end of file
+    verbose_name = 'B2B Pazaryeri'
+
+    def ready(self):
+        # Okuma modeli ve önbellek sinyallerini bağla
+        from . import signals  # noqa: F401
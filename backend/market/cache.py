@@ -0,0 +1,153 @@
+# backend/market/cache.py
+"""
+Pazaryeri önbelleği için sürüm sayaçları
+
+Önbellek anahtarları ilgili isim alanlarının sürümlerini içerir:
+- catalog: tüm katalog (fiyat/en iyi teklif/stokta var-yok, Product, Category değişiklikleri)
+- product: tek bir ürünün teklif sürümü (stok miktarı dahil her değişiklik)
+- company: şirket bazlı ilişki/abonelik sürümü (RetailerWholesaler, Subscription, Company)
+- plan: abonelik planı sürümü (komisyon oranı değişiklikleri)
+- stock: herhangi bir ürünün stok miktarı değiştiğinde artan sürüm (stok
+  toplamlarını gösteren/sıralayan liste yanıtları için)
+
+Geçersiz kılma sadece ilgili sayacı artırmaktır (O(1)); eski anahtarlar
+TTL ile kendiliğinden düşer. Böylece önbellek saatlerce yaşayabilir ve
+fiyat güncellemesinden sonra asla eski fiyat dönmez.
+"""
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.cache import cache
+from django.db import transaction
+
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY_PREFIX = 'market_version'
+
+
+def get_cache_timeout():
+    """Sürümlü market önbelleklerinin yaşam süresi (saniye)"""
+    return getattr(settings, 'MARKET_CACHE_TIMEOUT', 6 * 60 * 60)
+
+
+def _version_key(namespace, ident=None):
+    if ident is None:
+        return f"{VERSION_KEY_PREFIX}_{namespace}"
+    return f"{VERSION_KEY_PREFIX}_{namespace}_{ident}"
+
+
+def _initial_version():
+    # Anahtar silinirse (eviction) eski sürümlerle çakışmaması için zaman tabanlı başlangıç
+    return int(time.time() * 1000)
+
+
+def get_versions(*namespaces):
+    """
+    Birden fazla sürümü tek round-trip ile okur
+    namespaces: ('catalog', None), ('company', 5) gibi ikililer
+    """
+    keys = [_version_key(namespace, ident) for namespace, ident in namespaces]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _initial_version(), None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def get_version(namespace, ident=None):
+    return get_versions((namespace, ident))[0]
+
+
+def _bump(key):
+    """
+    Sayacı artırır; önbellek hataları yutulur
+
+    Commit sonrası çalıştığı için buradaki bir hata isteği 500'e çeviremez:
+    veri zaten kaydedilmiştir ve istemcinin yeniden denemesi işlemi tekrarlar.
+    """
+    try:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Sayaç yoksa yeni bir başlangıç değeri ata
+            cache.set(key, _initial_version(), None)
+    except Exception as e:
+        logger.warning(f"Market cache version bump failed for {key}: {e}")
+
+
+def bump_version(namespace, ident=None):
+    """
+    Sürüm sayacını artırır (transaction commit edildikten sonra)
+
+    Commit'ten önce artırmak, okuyucuların yeni sürüm anahtarı altına henüz
+    commit edilmemiş (eski) veriyi yazmasına neden olabilir.
+    """
+    key = _version_key(namespace, ident)
+    transaction.on_commit(lambda: _bump(key))
+
+
+def bump_catalog_version():
+    bump_version('catalog')
+
+
+def bump_stock_version():
+    bump_version('stock')
+
+
+def bump_product_versions(product_ids):
+    """Ürün sürümlerini tek bir on_commit geri çağrısında artırır"""
+    keys = [_version_key('product', pid) for pid in product_ids if pid is not None]
+    if not keys:
+        return
+
+    def bump_all():
+        for key in keys:
+            _bump(key)
+
+    transaction.on_commit(bump_all)
+
+
+def bump_company_version(company_id):
+    if company_id is not None:
+        bump_version('company', company_id)
+
+
+def bump_plan_version(plan_id):
+    if plan_id is not None:
+        bump_version('plan', plan_id)
+
+
+def get_company_plan_id(company):
+    """Şirketin abonelik planı ID'si (abonelik yoksa None)"""
+    try:
+        return company.subscription.plan_id
+    except ObjectDoesNotExist:
+        return None
+
+
+def company_version_token(company, include_stock=False):
+    """
+    Bir şirketin gördüğü fiyatları etkileyen tüm sürümleri tek bir token'da birleştirir
+    include_stock: stok miktarlarını içeren yanıtlar için stok sürümünü de ekler
+    """
+    namespaces = [
+        ('catalog', None),
+        ('company', company.id),
+        ('plan', get_company_plan_id(company)),
+    ]
+    if include_stock:
+        namespaces.append(('stock', None))
+    return '.'.join(str(version) for version in get_versions(*namespaces))
+
+
+def hash_params(params):
+    """Sorgu parametrelerinden kısa ve deterministik bir özet üretir"""
+    param_string = str(sorted(params.items()))
+    return hashlib.md5(param_string.encode()).hexdigest()[:12]
@@ -0,0 +1,107 @@
+# backend/market/export.py
+"""
+Pazaryeri katalog dışa aktarımı
+
+Perakendecilerin POS/ERP entegrasyonları tüm kataloğu tek istekte çeker.
+Satırlar values() + iterator() ile okunur (model nesnesi oluşturulmaz) ve
+RetailerPricing ile fiyatlanır; toptancı başına çarpan bir kez hesaplandığı
+için fiyatlandırma ek sorgu gerektirmez. Bellek kullanımı katalog
+büyüklüğünden bağımsızdır.
+"""
+from decimal import ROUND_HALF_UP
+
+from django.db.models import Q
+
+from core.streaming import DEFAULT_CHUNK_SIZE
+from .filters import filter_market_products, market_products
+from .pricing import TWO_PLACES
+
+
+EXPORT_FIELDS = [
+    'id',
+    'sku',
+    'name',
+    'brand',
+    'model',
+    'category',
+    'tire_width',
+    'tire_aspect_ratio',
+    'tire_diameter',
+    'battery_ampere',
+    'rim_size',
+    'rim_bolt_pattern',
+    'total_stock',
+    'available_stock',
+    'wholesaler_id',
+    'is_known_wholesaler',
+    'base_price',
+    'discount_rate',
+    'final_price',
+    'updated_at',
+]
+
+_VALUE_FIELDS = (
+    'id', 'sku', 'name', 'brand', 'model', 'category__name',
+    'tire_width', 'tire_aspect_ratio', 'tire_diameter',
+    'battery_ampere', 'rim_size', 'rim_bolt_pattern',
+    'total_stock', 'available_stock',
+    'best_offer__wholesaler_id', 'best_offer__sale_price',
+    'updated_at', 'best_offer__updated_at',
+)
+
+
+def export_queryset(filters, company, since=None):
+    """
+    Dışa aktarılacak ürünler (id sırasıyla)
+
+    since verilirse sadece ürün bilgisi veya en iyi teklifi o tarihten sonra
+    değişen ürünler döner. Pazaryerinden düşen ürünler delta'da yer almaz;
+    entegrasyonlar periyodik tam dışa aktarımla eşitlenmelidir.
+    """
+    queryset = filter_market_products(market_products(), filters, company)
+    if since is not None:
+        queryset = queryset.filter(
+            Q(updated_at__gt=since) | Q(best_offer__updated_at__gt=since)
+        )
+    return queryset.order_by('id').values(*_VALUE_FIELDS)
+
+
+def iter_export_rows(queryset, pricing, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Sunucu tarafı cursor ile satır satır fiyatlanmış kayıtlar üretir"""
+    for row in queryset.iterator(chunk_size=chunk_size):
+        wholesaler_id = row['best_offer__wholesaler_id']
+        base_price = row['best_offer__sale_price']
+
+        if base_price is not None:
+            discount_rate = pricing.get_discount_rate(wholesaler_id)
+            final_price = pricing.unit_price(base_price, wholesaler_id)
+            base_price = base_price.quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
+        else:
+            discount_rate = final_price = None
+
+        updated_at = max(
+            value for value in (row['updated_at'], row['best_offer__updated_at']) if value
+        )
+
+        yield {
+            'id': row['id'],
+            'sku': row['sku'],
+            'name': row['name'],
+            'brand': row['brand'],
+            'model': row['model'],
+            'category': row['category__name'],
+            'tire_width': row['tire_width'],
+            'tire_aspect_ratio': row['tire_aspect_ratio'],
+            'tire_diameter': row['tire_diameter'],
+            'battery_ampere': row['battery_ampere'],
+            'rim_size': row['rim_size'],
+            'rim_bolt_pattern': row['rim_bolt_pattern'],
+            'total_stock': row['total_stock'],
+            'available_stock': row['available_stock'],
+            'wholesaler_id': wholesaler_id,
+            'is_known_wholesaler': pricing.is_known_wholesaler(wholesaler_id),
+            'base_price': base_price,
+            'discount_rate': discount_rate,
+            'final_price': final_price,
+            'updated_at': updated_at,
+        }
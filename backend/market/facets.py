@@ -0,0 +1,106 @@
+# backend/market/facets.py
+"""
+Pazaryeri facet (filtre kenar çubuğu) sayımları
+
+PostgreSQL'de tüm facet'ler filtrelenmiş ürün kümesi üzerinde tek bir
+GROUPING SETS sorgusuyla sayılır. Diğer veritabanlarında her facet için
+ayrı bir GROUP BY sorgusu çalıştırılır.
+"""
+from django.db import connections
+from django.db.models import Count
+
+from core.db import is_postgres
+from products.models import Category
+
+
+# (facet adı, Product kolonu)
+FACET_FIELDS = (
+    ('brand', 'brand'),
+    ('category', 'category_id'),
+    ('tire_width', 'tire_width'),
+    ('tire_aspect_ratio', 'tire_aspect_ratio'),
+    ('tire_diameter', 'tire_diameter'),
+    ('battery_ampere', 'battery_ampere'),
+    ('rim_size', 'rim_size'),
+    ('rim_bolt_pattern', 'rim_bolt_pattern'),
+)
+
+
+def compute_facets(queryset):
+    """
+    Filtrelenmiş ürün queryset'i için facet sayımlarını döndürür
+
+    Dönüş: {'total': 120, 'facets': {'brand': [{'value': 'Michelin', 'count': 15}, ...], ...}}
+    Kategori facet'i 'label' (kategori adı) da içerir.
+    """
+    queryset = queryset.order_by()
+
+    if is_postgres(queryset.db):
+        total, counts = _grouping_sets_counts(queryset)
+    else:
+        total, counts = _per_facet_counts(queryset)
+
+    facets = {}
+    for name, _column in FACET_FIELDS:
+        values = [
+            {'value': value, 'count': count}
+            for value, count in counts.get(name, {}).items()
+            if value not in (None, '')
+        ]
+        values.sort(key=lambda item: (-item['count'], str(item['value'])))
+        facets[name] = values
+
+    _add_category_labels(facets['category'])
+    return {'total': total, 'facets': facets}
+
+
+def _grouping_sets_counts(queryset):
+    """Tüm facet'leri tek bir GROUPING SETS sorgusuyla sayar"""
+    columns = [column for _name, column in FACET_FIELDS]
+    inner_sql, params = queryset.values(*columns).query.sql_with_params()
+
+    quoted = [f'"{column}"' for column in columns]
+    sql = (
+        f"SELECT {', '.join(quoted)}, "
+        f"{', '.join(f'GROUPING({column})' for column in quoted)}, "
+        f"COUNT(*) "
+        f"FROM ({inner_sql}) AS facet_products "
+        f"GROUP BY GROUPING SETS ({', '.join(f'({column})' for column in quoted)}, ())"
+    )
+
+    total = 0
+    counts = {}
+    width = len(columns)
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        for row in cursor.fetchall():
+            values, grouping, count = row[:width], row[width:2 * width], row[-1]
+            if all(grouping):
+                # Boş grouping set () = toplam ürün sayısı
+                total = count
+                continue
+            index = grouping.index(0)
+            counts.setdefault(FACET_FIELDS[index][0], {})[values[index]] = count
+
+    return total, counts
+
+
+def _per_facet_counts(queryset):
+    """GROUPING SETS desteklemeyen veritabanları için yedek yol"""
+    counts = {}
+    for name, column in FACET_FIELDS:
+        counts[name] = {
+            row[column]: row['count']
+            for row in queryset.values(column).annotate(count=Count('id')).order_by()
+        }
+    return queryset.count(), counts
+
+
+def _add_category_labels(category_facets):
+    names = dict(
+        Category.objects.filter(
+            id__in=[item['value'] for item in category_facets]
+        ).values_list('id', 'name')
+    )
+    for item in category_facets:
+        item['label'] = names.get(item['value'], '')
@@ -0,0 +1,82 @@
+# backend/market/filters.py
+"""
+Pazaryeri ürün filtreleri
+
+Ürün listesi, facet sayımları ve dışa aktarım aynı filtre mantığını kullanır;
+böylece kenar çubuğundaki sayılar listedeki sonuçlarla her zaman tutarlıdır.
+"""
+from django.db.models import Exists, F, OuterRef
+
+from companies.models import RetailerWholesaler
+from core.search import search_queryset
+from products.models import Product
+from products.specs import apply_spec_filters
+from .offers import sellable_stock_items
+
+
+def market_products():
+    """
+    Pazaryerinde listelenebilir ürünler
+
+    Stok ve fiyat bilgileri ProductBestOffer okuma modelinden annotate edilir.
+    """
+    return Product.objects.filter(
+        is_active=True,
+        best_offer__isnull=False
+    ).annotate(
+        total_stock=F('best_offer__total_stock'),
+        available_stock=F('best_offer__available_stock'),
+        avg_sale_price=F('best_offer__avg_sale_price')
+    )
+
+
+def filter_market_products(queryset, filters, company, rank_search=False):
+    """
+    MarketProductFilterSerializer ile doğrulanmış filtreleri uygular (sıralama hariç)
+
+    rank_search=True ise arama sonucu 'search_rank' ile annotate edilir.
+    """
+    # Kategori filtresi
+    if filters.get('category'):
+        queryset = queryset.filter(category_id=filters['category'])
+
+    # Marka filtresi
+    if filters.get('brand'):
+        queryset = queryset.filter(brand__icontains=filters['brand'])
+
+    # Ürün özellik filtreleri: tipli kolonlar üzerinde tam değer, aralık ve ?spec=
+    queryset = apply_spec_filters(queryset, filters)
+    if filters.get('rim_bolt_pattern'):
+        queryset = queryset.filter(rim_bolt_pattern=filters['rim_bolt_pattern'])
+
+    # Fiyat aralığı filtresi (ortalama fiyat üzerinden)
+    if filters.get('min_price'):
+        queryset = queryset.filter(avg_sale_price__gte=filters['min_price'])
+    if filters.get('max_price'):
+        queryset = queryset.filter(avg_sale_price__lte=filters['max_price'])
+
+    # Sadece stokta olanlar
+    if filters.get('in_stock', True):
+        queryset = queryset.filter(total_stock__gt=0)
+
+    # Sadece bilinen toptancıların ürünleri
+    if filters.get('known_wholesalers_only'):
+        known_wholesaler_ids = RetailerWholesaler.objects.filter(
+            retailer=company,
+            is_active=True
+        ).values('wholesaler_id')
+
+        queryset = queryset.filter(Exists(
+            sellable_stock_items().filter(
+                product_id=OuterRef('pk'),
+                warehouse__company_id__in=known_wholesaler_ids
+            )
+        ))
+
+    # Arama (normalize edilmiş search_text üzerinden, core.search)
+    if filters.get('search'):
+        queryset = search_queryset(
+            queryset, filters['search'], rank=rank_search, vector_field='search_vector'
+        )
+
+    return queryset
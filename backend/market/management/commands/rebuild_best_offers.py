@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from market.offers import rebuild_best_offers
+
+
+class Command(BaseCommand):
+    help = 'Pazaryeri en iyi teklif tablosunu (ProductBestOffer) sıfırdan oluşturur'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Tek seferde işlenecek ürün sayısı',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔄 En iyi teklifler yeniden hesaplanıyor...')
+        refreshed = rebuild_best_offers(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'✅ {refreshed} ürün için en iyi teklif güncellendi.'))
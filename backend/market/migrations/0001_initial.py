@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('companies', '0002_retailerwholesaler_discount_rate'),
+        ('inventory', '0003_stockitem_barcode'),
+        ('products', '0002_product_battery_ampere_product_battery_voltage_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductBestOffer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sale_price', models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='Satış Fiyatı')),
+                ('available_quantity', models.IntegerField(default=0, help_text='En iyi stok kalemindeki rezerve edilmemiş miktar', verbose_name='Satılabilir Miktar')),
+                ('total_stock', models.IntegerField(default=0, verbose_name='Toplam Stok')),
+                ('available_stock', models.IntegerField(default=0, verbose_name='Toplam Satılabilir Stok')),
+                ('avg_sale_price', models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True, verbose_name='Ortalama Satış Fiyatı')),
+                ('offer_count', models.PositiveIntegerField(default=0, verbose_name='Teklif Sayısı')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')),
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='best_offer', to='products.product', verbose_name='Ürün')),
+                ('stock_item', models.ForeignKey(blank=True, help_text='Fiyatı tanımlı en ucuz satılabilir stok kalemi', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='inventory.stockitem', verbose_name='En İyi Stok Kalemi')),
+                ('wholesaler', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='companies.company', verbose_name='Toptancı')),
+            ],
+            options={
+                'verbose_name': 'Ürün En İyi Teklifi',
+                'verbose_name_plural': 'Ürün En İyi Teklifleri',
+                'indexes': [models.Index(fields=['sale_price'], name='market_prod_sale_pr_e770d4_idx'), models.Index(fields=['avg_sale_price'], name='market_prod_avg_sal_592044_idx'), models.Index(fields=['total_stock'], name='market_prod_total_s_7e510d_idx'), models.Index(fields=['wholesaler'], name='market_prod_wholesa_0fb3d5_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+from django.db.models import Sum, Avg, Count, F
+
+
+def backfill_best_offers(apps, schema_editor):
+    """Mevcut stok kalemlerinden ProductBestOffer tablosunu doldurur"""
+    StockItem = apps.get_model('inventory', 'StockItem')
+    ProductBestOffer = apps.get_model('market', 'ProductBestOffer')
+
+    stock_items = StockItem.objects.filter(
+        quantity__gt=0,
+        is_active=True,
+        is_sellable=True,
+        warehouse__is_active=True,
+        warehouse__company__company_type__in=['wholesaler', 'both'],
+    )
+
+    best_items = {}
+    for row in stock_items.filter(sale_price__isnull=False).values(
+        'id', 'product_id', 'warehouse__company_id',
+        'sale_price', 'quantity', 'reserved_quantity'
+    ).order_by('product_id', 'sale_price', '-quantity', 'id'):
+        best_items.setdefault(row['product_id'], row)
+
+    offers = []
+    for total in stock_items.values('product_id').annotate(
+        total_stock=Sum('quantity'),
+        available_stock=Sum(F('quantity') - F('reserved_quantity')),
+        avg_sale_price=Avg('sale_price'),
+        offer_count=Count('id')
+    ).order_by():
+        best = best_items.get(total['product_id'])
+        offers.append(ProductBestOffer(
+            product_id=total['product_id'],
+            stock_item_id=best['id'] if best else None,
+            wholesaler_id=best['warehouse__company_id'] if best else None,
+            sale_price=best['sale_price'] if best else None,
+            available_quantity=max(0, best['quantity'] - best['reserved_quantity']) if best else 0,
+            total_stock=total['total_stock'] or 0,
+            available_stock=total['available_stock'] or 0,
+            avg_sale_price=total['avg_sale_price'],
+            offer_count=total['offer_count'],
+        ))
+
+    ProductBestOffer.objects.bulk_create(offers, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_best_offers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0002_backfill_best_offers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarketplaceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_products', models.PositiveIntegerField(default=0, verbose_name='Stokta Ürün Sayısı')),
+                ('total_wholesalers', models.PositiveIntegerField(default=0, verbose_name='Toptancı Sayısı')),
+                ('categories_count', models.PositiveIntegerField(default=0, verbose_name='Kategori Sayısı')),
+                ('total_stock', models.PositiveBigIntegerField(default=0, verbose_name='Toplam Stok')),
+                ('wholesaler_offers', models.JSONField(blank=True, default=dict, help_text='Perakendeci tasarrufu hesaplamak için toptancı bazında en iyi teklif toplamları', verbose_name='Toptancı Teklifleri')),
+                ('computed_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Hesaplanma Tarihi')),
+            ],
+            options={
+                'verbose_name': 'Pazaryeri Görüntüsü',
+                'verbose_name_plural': 'Pazaryeri Görüntüleri',
+                'ordering': ['-computed_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,109 @@
+# backend/market/models.py
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from decimal import Decimal
+
+
+class ProductBestOffer(models.Model):
+    """
+    Pazaryeri okuma modeli - Her ürün için en iyi (en ucuz) satılabilir stok kalemi
+
+    StockItem değiştikçe market.offers.refresh_best_offers() tarafından güncellenir.
+    Pazaryeri listesi stok kalemlerini taramak yerine bu tabloya join yapar.
+    """
+    product = models.OneToOneField(
+        'products.Product',
+        on_delete=models.CASCADE,
+        related_name='best_offer',
+        verbose_name=_('Ürün')
+    )
+    stock_item = models.ForeignKey(
+        'inventory.StockItem',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        blank=True,
+        null=True,
+        verbose_name=_('En İyi Stok Kalemi'),
+        help_text=_('Fiyatı tanımlı en ucuz satılabilir stok kalemi')
+    )
+    wholesaler = models.ForeignKey(
+        'companies.Company',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        blank=True,
+        null=True,
+        verbose_name=_('Toptancı')
+    )
+
+    # En iyi teklifin fiyat ve miktar bilgileri
+    sale_price = models.DecimalField(
+        _('Satış Fiyatı'),
+        max_digits=12,
+        decimal_places=4,
+        blank=True,
+        null=True
+    )
+    available_quantity = models.IntegerField(
+        _('Satılabilir Miktar'),
+        default=0,
+        help_text=_('En iyi stok kalemindeki rezerve edilmemiş miktar')
+    )
+
+    # Ürünün tüm satılabilir stok kalemleri üzerinden toplamlar
+    total_stock = models.IntegerField(_('Toplam Stok'), default=0)
+    available_stock = models.IntegerField(_('Toplam Satılabilir Stok'), default=0)
+    avg_sale_price = models.DecimalField(
+        _('Ortalama Satış Fiyatı'),
+        max_digits=12,
+        decimal_places=4,
+        blank=True,
+        null=True
+    )
+    offer_count = models.PositiveIntegerField(_('Teklif Sayısı'), default=0)
+
+    updated_at = models.DateTimeField(_('Güncellenme Tarihi'), auto_now=True)
+
+    class Meta:
+        verbose_name = _('Ürün En İyi Teklifi')
+        verbose_name_plural = _('Ürün En İyi Teklifleri')
+        indexes = [
+            models.Index(fields=['sale_price']),
+            models.Index(fields=['avg_sale_price']),
+            models.Index(fields=['total_stock']),
+            models.Index(fields=['wholesaler']),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} → {self.stock_item_id} ({self.sale_price or Decimal('0.00')})"
+
+
+class MarketplaceSnapshot(models.Model):
+    """
+    Pazaryeri genel istatistiklerinin periyodik görüntüsü
+
+    market.tasks.refresh_marketplace_snapshot tarafından oluşturulur. İstatistik
+    endpoint'i en son kaydı okur ve üzerine perakendeciye özel değerleri
+    (bilinen toptancılar, iskonto ve tasarruf) ekler.
+    """
+    total_products = models.PositiveIntegerField(_('Stokta Ürün Sayısı'), default=0)
+    total_wholesalers = models.PositiveIntegerField(_('Toptancı Sayısı'), default=0)
+    categories_count = models.PositiveIntegerField(_('Kategori Sayısı'), default=0)
+    total_stock = models.PositiveBigIntegerField(_('Toplam Stok'), default=0)
+
+    # Toptancı bazında en iyi teklifler: {"<wholesaler_id>": {"products": 12, "offer_value": "1234.5000"}}
+    wholesaler_offers = models.JSONField(
+        _('Toptancı Teklifleri'),
+        default=dict,
+        blank=True,
+        help_text=_('Perakendeci tasarrufu hesaplamak için toptancı bazında en iyi teklif toplamları')
+    )
+
+    computed_at = models.DateTimeField(_('Hesaplanma Tarihi'), auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = _('Pazaryeri Görüntüsü')
+        verbose_name_plural = _('Pazaryeri Görüntüleri')
+        ordering = ['-computed_at']
+
+    def __str__(self):
+        return f"{self.computed_at:%d.%m.%Y %H:%M} - {self.total_products} ürün"
@@ -0,0 +1,203 @@
+# backend/market/offers.py
+"""
+ProductBestOffer okuma modelinin bakımı
+
+Pazaryeri listesi her istekte tüm stok kalemlerini taramak yerine
+ProductBestOffer tablosunu okur. Bu modüldeki fonksiyonlar tabloyu
+stok kalemlerindeki değişikliklere göre günceller.
+"""
+from django.db import transaction
+from django.db.models import Sum, Avg, Count, F
+
+from inventory.models import StockItem
+from .cache import bump_catalog_version, bump_product_versions, bump_stock_version
+from .models import ProductBestOffer
+
+
+# Pazaryerinde satılabilir sayılan stok kalemi koşulları
+SELLABLE_STOCK_FILTER = {
+    'quantity__gt': 0,
+    'is_active': True,
+    'is_sellable': True,
+    'warehouse__is_active': True,
+    'warehouse__company__company_type__in': ['wholesaler', 'both'],
+}
+
+
+def sellable_stock_items():
+    """Pazaryerinde satılabilir stok kalemleri queryset'i"""
+    return StockItem.objects.filter(**SELLABLE_STOCK_FILTER)
+
+
+# Katalog filtrelerinde/yüzeylerinde görünen teklif alanları; bunlardan biri
+# değişmedikçe (sadece stok miktarı oynadıysa) katalog sürümü artırılmaz,
+# sadece stok sürümü artırılır
+CATALOG_FIELDS = ('stock_item_id', 'wholesaler_id', 'sale_price', 'avg_sale_price')
+
+
+def _catalog_state(offer):
+    """Bir teklifin katalog önbelleğini etkileyen durumu (stokta var/yok dahil)"""
+    return tuple(offer[field] for field in CATALOG_FIELDS) + (
+        offer['total_stock'] > 0, offer['available_stock'] > 0,
+    )
+
+
+def refresh_best_offers(product_ids):
+    """
+    Verilen ürünlerin en iyi teklif kayıtlarını yeniden hesaplar
+
+    Yenilenen kayıt sayısını döndürür.
+    """
+    return _refresh_best_offers(product_ids)[0]
+
+
+@transaction.atomic
+def _refresh_best_offers(product_ids):
+    """
+    refresh_best_offers() gövdesi; (kayıt sayısı, değişen ürünler,
+    katalogda görünür şekilde değişen ürünler) döndürür
+
+    Ürün sayısından bağımsız olarak sabit sayıda sorgu çalıştırır:
+    mevcut kayıtlar, bir toplam sorgusu, bir aday sorgusu, bir silme ve bir upsert.
+    """
+    product_ids = {pid for pid in product_ids if pid is not None}
+    if not product_ids:
+        return 0, set(), set()
+
+    # Mevcut kayıtları kilitle: aynı ürünleri yenileyen eş zamanlı çağrılar
+    # sırayla çalışır ve toplamları bir öncekinin commit'inden sonra okur
+    previous = {
+        row['product_id']: row
+        for row in ProductBestOffer.objects.select_for_update().filter(
+            product_id__in=product_ids
+        ).order_by('product_id').values(
+            'product_id', 'total_stock', 'available_stock', *CATALOG_FIELDS
+        )
+    }
+
+    stock_items = sellable_stock_items().filter(product_id__in=product_ids)
+
+    # Ürün bazında toplamlar
+    totals = {
+        row['product_id']: row
+        for row in stock_items.values('product_id').annotate(
+            total_stock=Sum('quantity'),
+            available_stock=Sum(F('quantity') - F('reserved_quantity')),
+            avg_sale_price=Avg('sale_price'),
+            offer_count=Count('id')
+        ).order_by()
+    }
+
+    # En ucuz stok kalemi (eşitlikte en yüksek stok, sonra en eski kayıt)
+    best_items = {}
+    candidates = stock_items.filter(sale_price__isnull=False).values(
+        'id', 'product_id', 'warehouse__company_id',
+        'sale_price', 'quantity', 'reserved_quantity'
+    ).order_by('product_id', 'sale_price', '-quantity', 'id')
+    for row in candidates:
+        best_items.setdefault(row['product_id'], row)
+
+    offers = []
+    for product_id, total in totals.items():
+        best = best_items.get(product_id)
+        offers.append(ProductBestOffer(
+            product_id=product_id,
+            stock_item_id=best['id'] if best else None,
+            wholesaler_id=best['warehouse__company_id'] if best else None,
+            sale_price=best['sale_price'] if best else None,
+            available_quantity=max(0, best['quantity'] - best['reserved_quantity']) if best else 0,
+            total_stock=total['total_stock'] or 0,
+            available_stock=total['available_stock'] or 0,
+            avg_sale_price=total['avg_sale_price'],
+            offer_count=total['offer_count'],
+        ))
+
+    # Artık satılabilir stoğu olmayan ürünlerin kayıtlarını kaldır
+    removed = set(previous) - set(totals)
+    if removed:
+        ProductBestOffer.objects.filter(product_id__in=removed).delete()
+
+    changed = set(removed)
+    catalog_changed = set(removed)
+    for offer in offers:
+        current = {
+            field: getattr(offer, field)
+            for field in ('total_stock', 'available_stock') + CATALOG_FIELDS
+        }
+        old = previous.get(offer.product_id)
+        if old is None:
+            changed.add(offer.product_id)
+            catalog_changed.add(offer.product_id)
+            continue
+        if any(old[field] != value for field, value in current.items()):
+            changed.add(offer.product_id)
+        if _catalog_state(old) != _catalog_state(current):
+            catalog_changed.add(offer.product_id)
+
+    if offers:
+        ProductBestOffer.objects.bulk_create(
+            offers,
+            update_conflicts=True,
+            unique_fields=['product'],
+            update_fields=[
+                'stock_item', 'wholesaler', 'sale_price', 'available_quantity',
+                'total_stock', 'available_stock', 'avg_sale_price', 'offer_count',
+                'updated_at',
+            ],
+        )
+
+    return len(offers), changed, catalog_changed
+
+
+def stock_changed(product_ids):
+    """
+    Stok/fiyat değişikliğinden sonra çağrılır
+    Okuma modelini günceller; değişen ürünlerin sürümünü artırır.
+    Katalog sürümü sadece fiyat, en iyi teklif veya stokta var/yok durumu
+    değiştiğinde artırılır; salt miktar değişiklikleri sadece stok sürümünü
+    artırır (stok toplamlarını gösteren liste önbellekleri). Sinyalleri
+    atlayan toplu update() işlemleri bunu açıkça çağırmalıdır.
+    """
+    _, changed, catalog_changed = _refresh_best_offers(product_ids)
+    bump_product_versions(changed)
+    if changed:
+        bump_stock_version()
+    if catalog_changed:
+        bump_catalog_version()
+
+
+def stock_changed_on_commit(product_ids):
+    """
+    stock_changed() çağrısını transaction commit edildikten sonraya erteler
+
+    Böylece hesaplama sadece commit edilmiş stoğu okur; eş zamanlı
+    transaction'lar birbirinin henüz görünmeyen değişikliklerini ezemez.
+    Transaction dışında hemen çalışır.
+    """
+    product_ids = {pid for pid in product_ids if pid is not None}
+    if product_ids:
+        transaction.on_commit(lambda: stock_changed(product_ids))
+
+
+def refresh_best_offers_for_stock_items(stock_item_ids):
+    """Stok kalemi ID'lerinden etkilenen ürünleri bulup yeniden hesaplar"""
+    product_ids = StockItem.objects.filter(
+        id__in=stock_item_ids
+    ).values_list('product_id', flat=True).distinct()
+    return refresh_best_offers(set(product_ids))
+
+
+def rebuild_best_offers(chunk_size=500):
+    """Tüm okuma modelini sıfırdan oluşturur (yönetim komutu için)"""
+    ProductBestOffer.objects.exclude(
+        product_id__in=StockItem.objects.values('product_id')
+    ).delete()
+
+    product_ids = list(
+        StockItem.objects.values_list('product_id', flat=True).distinct().order_by('product_id')
+    )
+
+    refreshed = 0
+    for start in range(0, len(product_ids), chunk_size):
+        refreshed += refresh_best_offers(product_ids[start:start + chunk_size])
+    return refreshed
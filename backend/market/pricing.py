@@ -0,0 +1,176 @@
+# backend/market/pricing.py
+"""
+Dinamik fiyatlandırma motoru
+
+Formül: sale_price * (1 - toptancı iskontosu) * (1 + tyrex komisyonu)
+
+Pazaryeri listesi, sepet hesaplama ve sipariş oluşturma aynı motoru kullanır.
+Perakendecinin toptancı ilişkileri ve komisyon oranı istek başına bir kez
+yüklenir; ardından istenen sayıda stok kalemi ek sorgu olmadan fiyatlanır.
+"""
+import hashlib
+from collections import namedtuple
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.core.exceptions import ObjectDoesNotExist
+
+from companies.models import RetailerWholesaler
+
+
+TWO_PLACES = Decimal('0.01')
+
+# Aboneliği olmayan şirketler için varsayılan komisyon (%2.5)
+DEFAULT_COMMISSION_RATE = Decimal('0.025')
+
+
+PriceQuote = namedtuple('PriceQuote', [
+    'stock_item',
+    'base_price',           # Toptancı liste fiyatı
+    'discount_rate',        # Toptancı iskontosu (0.03 = %3)
+    'commission_rate',      # Tyrex komisyonu (0.025 = %2.5)
+    'unit_price',           # Perakendeciye satış fiyatı (2 hane)
+    'is_known_wholesaler',  # Perakendeci bu toptancıyla çalışıyor mu?
+])
+
+
+def get_discount_rate(relationship):
+    """
+    Perakendeci-toptancı ilişkisine göre iskonto oranını hesaplar
+    Kredi limitine göre kademeli iskonto, ilişki yoksa iskonto yok
+    """
+    if relationship is None:
+        return Decimal('0.00')
+
+    if relationship.credit_limit:
+        if relationship.credit_limit >= 100000:
+            return Decimal('0.05')  # %5 iskonto
+        elif relationship.credit_limit >= 50000:
+            return Decimal('0.03')  # %3 iskonto
+        else:
+            return Decimal('0.01')  # %1 iskonto
+
+    return Decimal('0.02')  # Varsayılan %2 iskonto
+
+
+def get_commission_rate(company):
+    """Şirketin abonelik planındaki Tyrex komisyonunu decimal olarak döndürür"""
+    if company is None:
+        return DEFAULT_COMMISSION_RATE
+    try:
+        return company.subscription.plan.get_tyrex_commission_decimal()
+    except ObjectDoesNotExist:
+        return DEFAULT_COMMISSION_RATE
+
+
+class RetailerPricing:
+    """
+    Bir perakendeci için istek kapsamlı fiyatlandırma bağlamı
+
+    İlişkiler ve komisyon ilk ihtiyaçta bir kez yüklenir; her toptancı için
+    (1 - iskonto) * (1 + komisyon) çarpanı önbelleğe alınır, böylece her
+    stok kalemi tek bir çarpma ile fiyatlanır.
+    """
+
+    def __init__(self, retailer):
+        self.retailer = retailer
+        self._commission_rate = None
+        self._relationships = None
+        self._factors = {}
+
+    @classmethod
+    def for_request(cls, request):
+        """İstek boyunca paylaşılan fiyatlandırma bağlamını döndürür"""
+        http_request = getattr(request, '_request', request)
+        pricing = getattr(http_request, '_retailer_pricing', None)
+        if pricing is None:
+            user = getattr(request, 'user', None)
+            pricing = cls(getattr(user, 'company', None))
+            http_request._retailer_pricing = pricing
+        return pricing
+
+    @property
+    def commission_rate(self):
+        if self._commission_rate is None:
+            self._commission_rate = get_commission_rate(self.retailer)
+        return self._commission_rate
+
+    @property
+    def relationships(self):
+        """Aktif toptancı ilişkileri: {wholesaler_id: RetailerWholesaler}"""
+        if self._relationships is None:
+            if self.retailer is None:
+                self._relationships = {}
+            else:
+                self._relationships = {
+                    relationship.wholesaler_id: relationship
+                    for relationship in RetailerWholesaler.objects.filter(
+                        retailer=self.retailer,
+                        is_active=True
+                    )
+                }
+        return self._relationships
+
+    def is_known_wholesaler(self, wholesaler_id):
+        return wholesaler_id in self.relationships
+
+    def get_relationship(self, wholesaler_id):
+        return self.relationships.get(wholesaler_id)
+
+    def get_discount_rate(self, wholesaler_id):
+        return self._get_factor(wholesaler_id)[0]
+
+    def _get_factor(self, wholesaler_id):
+        factor = self._factors.get(wholesaler_id)
+        if factor is None:
+            discount_rate = get_discount_rate(self.relationships.get(wholesaler_id))
+            multiplier = (Decimal('1') - discount_rate) * (Decimal('1') + self.commission_rate)
+            factor = self._factors[wholesaler_id] = (discount_rate, multiplier)
+        return factor
+
+    def unit_price(self, base_price, wholesaler_id):
+        """Toptancı liste fiyatından perakendeci birim fiyatını hesaplar"""
+        multiplier = self._get_factor(wholesaler_id)[1]
+        return (base_price * multiplier).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
+
+    def fingerprint(self):
+        """
+        Perakendecinin fiyatlarını etkileyen koşulların özeti
+        (komisyon ve toptancı bazında iskonto). Değişirse tüm fiyatlar değişebilir.
+        """
+        terms = sorted(
+            (wholesaler_id, str(self.get_discount_rate(wholesaler_id)))
+            for wholesaler_id in self.relationships
+        )
+        payload = f"{self.commission_rate}|{terms}"
+        return hashlib.md5(payload.encode()).hexdigest()[:16]
+
+    def quote(self, stock_item):
+        """Tek bir stok kalemini fiyatlar (fiyatı yoksa None)"""
+        base_price = stock_item.sale_price
+        if base_price is None:
+            return None
+
+        wholesaler_id = stock_item.warehouse.company_id
+        discount_rate = self.get_discount_rate(wholesaler_id)
+        unit_price = self.unit_price(base_price, wholesaler_id)
+
+        return PriceQuote(
+            stock_item=stock_item,
+            base_price=base_price,
+            discount_rate=discount_rate,
+            commission_rate=self.commission_rate,
+            unit_price=unit_price,
+            is_known_wholesaler=wholesaler_id in self.relationships,
+        )
+
+    def price_items(self, stock_items):
+        """
+        Stok kalemlerini toplu fiyatlar
+        Dönüş: {stock_item_id: PriceQuote} (fiyatı olmayanlar hariç)
+        """
+        quotes = {}
+        for stock_item in stock_items:
+            quote = self.quote(stock_item)
+            if quote is not None:
+                quotes[stock_item.id] = quote
+        return quotes
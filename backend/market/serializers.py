@@ -3,7 +3,8 @@ from django.db.models import Q, F, Case, When, Value, BooleanField
 from decimal import Decimal, ROUND_HALF_UP
 from products.models import Product
 from inventory.models import StockItem
-from companies.models import Company, RetailerWholesaler
+from companies.models import Company
+from .pricing import RetailerPricing
 
 
 class MarketProductSerializer(serializers.ModelSerializer):
@@ -79,37 +80,11 @@ class MarketProductSerializer(serializers.ModelSerializer):
         Dinamik hesaplanan final fiyat
         Formula: (sale_price * (1 - toptanci_iskontosu)) * (1 + tyrex_komisyonu)
         """
-        request = self.context.get('request')
-        if not request or not hasattr(request.user, 'company'):
+        quote = self._get_quote(obj)
+        if quote is None:
             return self.get_base_price(obj)
         
-        try:
-            user_company = request.user.company
-            subscription = user_company.subscription
-            tyrex_commission = subscription.plan.get_tyrex_commission_decimal()
-            
-            # Ürünün en iyi stok kalemini bul
-            best_stock_item = getattr(obj, 'best_stock_item', None)
-            if not best_stock_item or not best_stock_item.sale_price:
-                return self.get_base_price(obj)
-            
-            base_price = best_stock_item.sale_price
-            
-            # Toptancı iskontosunu hesapla
-            discount_rate = self._get_wholesaler_discount_rate(
-                user_company, 
-                best_stock_item.warehouse.company
-            )
-            
-            # Final fiyat hesaplama
-            discounted_price = base_price * (Decimal('1') - discount_rate)
-            final_price = discounted_price * (Decimal('1') + tyrex_commission)
-            
-            return str(final_price.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
-            
-        except Exception as e:
-            # Hata durumunda base price döndür
-            return self.get_base_price(obj)
+        return str(quote.unit_price)
     
     def get_discount_percentage(self, obj):
         """İndirim yüzdesini hesaplar"""
@@ -133,7 +108,7 @@ class MarketProductSerializer(serializers.ModelSerializer):
     
     def get_wholesaler_info(self, obj):
         """Ürünü satan toptancı bilgileri"""
-        best_stock_item = getattr(obj, 'best_stock_item', None)
+        best_stock_item = self._get_best_stock_item(obj)
         if not best_stock_item:
             return None
         
@@ -148,28 +123,19 @@ class MarketProductSerializer(serializers.ModelSerializer):
     
     def get_is_known_wholesaler(self, obj):
         """Bu ürünün toptancısı, perakendecinin çalıştığı toptancılardan biri mi?"""
-        request = self.context.get('request')
-        if not request or not hasattr(request.user, 'company'):
-            return False
-        
-        best_stock_item = getattr(obj, 'best_stock_item', None)
-        if not best_stock_item:
+        pricing = self._get_pricing()
+        best_stock_item = self._get_best_stock_item(obj)
+        if pricing is None or not best_stock_item:
             return False
         
-        wholesaler = best_stock_item.warehouse.company
-        user_company = request.user.company
-        
-        # Perakendecinin çalıştığı toptancılar arasında mı kontrol et
-        return RetailerWholesaler.objects.filter(
-            retailer=user_company,
-            wholesaler=wholesaler,
-            is_active=True
-        ).exists()
+        # Perakendecinin çalıştığı toptancılar istek başına bir kez yüklenir
+        return pricing.is_known_wholesaler(best_stock_item.warehouse.company_id)
     
     def get_attributes(self, obj):
         """Ürün özelliklerini döndürür"""
         attributes = []
-        for attr_value in obj.attribute_values.select_related('attribute'):
+        # prefetch_related ile yüklenen değerleri kullan (ürün başına sorgu yok)
+        for attr_value in obj.attribute_values.all():
             attributes.append({
                 'name': attr_value.attribute.name,
                 'value': attr_value.get_value(),
@@ -177,32 +143,38 @@ class MarketProductSerializer(serializers.ModelSerializer):
             })
         return attributes
     
-    def _get_wholesaler_discount_rate(self, retailer_company, wholesaler_company):
+    def _get_best_stock_item(self, obj):
         """
-        Perakendeci-toptancı ilişkisine göre iskonto oranını hesaplar
-        Şimdilik sabit değerler, ileride dinamik hale getirilebilir
+        Ürünün en iyi stok kalemini döndürür
+        Önce açıkça atanmış best_stock_item, yoksa ProductBestOffer okuma modeli
         """
-        try:
-            relationship = RetailerWholesaler.objects.get(
-                retailer=retailer_company,
-                wholesaler=wholesaler_company,
-                is_active=True
-            )
-            
-            # Kredi limitine göre iskonto hesapla (örnek mantık)
-            if relationship.credit_limit:
-                if relationship.credit_limit >= 100000:
-                    return Decimal('0.05')  # %5 iskonto
-                elif relationship.credit_limit >= 50000:
-                    return Decimal('0.03')  # %3 iskonto
-                else:
-                    return Decimal('0.01')  # %1 iskonto
-            
-            return Decimal('0.02')  # Varsayılan %2 iskonto
-            
-        except RetailerWholesaler.DoesNotExist:
-            # İlişki yoksa iskonto yok
-            return Decimal('0.00')
+        best_stock_item = getattr(obj, 'best_stock_item', None)
+        if best_stock_item is not None:
+            return best_stock_item
+        
+        best_offer = getattr(obj, 'best_offer', None)
+        if best_offer is not None:
+            return best_offer.stock_item
+        return None
+    
+    def _get_pricing(self):
+        """İstek kapsamlı fiyatlandırma bağlamı (market.pricing)"""
+        pricing = self.context.get('pricing')
+        if pricing is not None:
+            return pricing
+        
+        request = self.context.get('request')
+        if not request or not getattr(request.user, 'company', None):
+            return None
+        return RetailerPricing.for_request(request)
+    
+    def _get_quote(self, obj):
+        """Ürünün en iyi stok kalemi için fiyat teklifini döndürür"""
+        pricing = self._get_pricing()
+        best_stock_item = self._get_best_stock_item(obj)
+        if pricing is None or not best_stock_item:
+            return None
+        return pricing.quote(best_stock_item)
 
 
 class MarketProductFilterSerializer(serializers.Serializer):
@@ -211,6 +183,27 @@ class MarketProductFilterSerializer(serializers.Serializer):
     """
     category = serializers.IntegerField(required=False, help_text="Kategori ID'si")
     brand = serializers.CharField(required=False, max_length=100, help_text="Marka adı")
+    tire_width = serializers.CharField(required=False, max_length=10, help_text="Lastik genişliği (örn: 225)")
+    tire_aspect_ratio = serializers.CharField(required=False, max_length=10, help_text="Lastik yan oranı (örn: 45)")
+    tire_diameter = serializers.CharField(required=False, max_length=10, help_text="Lastik çapı (örn: 17)")
+    battery_ampere = serializers.CharField(required=False, max_length=10, help_text="Akü amperesi (örn: 60Ah)")
+    rim_size = serializers.CharField(required=False, max_length=10, help_text='Jant boyutu (örn: 17")')
+    rim_bolt_pattern = serializers.CharField(required=False, max_length=20, help_text="Jant bijon deseni (örn: 5x112)")
+    spec = serializers.CharField(
+        required=False,
+        max_length=100,
+        help_text='Özellik araması (örn: "225/45R17", "225 45 17", "çap 16-18")'
+    )
+    tire_width_min = serializers.DecimalField(required=False, max_digits=6, decimal_places=1)
+    tire_width_max = serializers.DecimalField(required=False, max_digits=6, decimal_places=1)
+    tire_aspect_ratio_min = serializers.DecimalField(required=False, max_digits=6, decimal_places=1)
+    tire_aspect_ratio_max = serializers.DecimalField(required=False, max_digits=6, decimal_places=1)
+    tire_diameter_min = serializers.DecimalField(required=False, max_digits=6, decimal_places=1)
+    tire_diameter_max = serializers.DecimalField(required=False, max_digits=6, decimal_places=1)
+    battery_ampere_min = serializers.DecimalField(required=False, max_digits=6, decimal_places=1)
+    battery_ampere_max = serializers.DecimalField(required=False, max_digits=6, decimal_places=1)
+    rim_size_min = serializers.DecimalField(required=False, max_digits=6, decimal_places=1)
+    rim_size_max = serializers.DecimalField(required=False, max_digits=6, decimal_places=1)
     min_price = serializers.DecimalField(
         required=False, 
         max_digits=10, 
@@ -248,6 +241,7 @@ class MarketProductFilterSerializer(serializers.Serializer):
             ('-total_stock', 'Stok miktarına göre azalan'),
             ('-created_at', 'Yeniden eskiye'),
             ('created_at', 'Eskiden yeniye'),
+            ('relevance', 'Arama ile en alakalı'),
         ],
         default='-created_at',
         help_text="Sıralama kriteri"
@@ -264,4 +258,5 @@ class MarketplaceStatsSerializer(serializers.Serializer):
     products_in_stock = serializers.IntegerField()
     average_discount = serializers.DecimalField(max_digits=5, decimal_places=2)
     categories_count = serializers.IntegerField()
-    your_potential_savings = serializers.DecimalField(max_digits=12, decimal_places=2)
\ No newline at end of file
+    your_potential_savings = serializers.DecimalField(max_digits=12, decimal_places=2)
+    snapshot_at = serializers.DateTimeField(help_text="Genel sayıların hesaplandığı zaman")
\ No newline at end of file
@@ -0,0 +1,118 @@
+# backend/market/signals.py
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from companies.models import Company, RetailerWholesaler
+from inventory.models import StockItem, Warehouse
+from products.models import Product, Category
+from subscriptions.models import Subscription, SubscriptionPlan
+from .cache import bump_catalog_version, bump_company_version, bump_plan_version
+from .offers import stock_changed_on_commit
+
+
+# En iyi teklif hesabını etkileyen StockItem alanları
+OFFER_FIELDS = {
+    'product', 'warehouse', 'quantity', 'reserved_quantity',
+    'sale_price', 'is_active', 'is_sellable',
+}
+
+
+@receiver(post_save, sender=StockItem)
+def stock_item_saved(sender, instance, update_fields=None, **kwargs):
+    """Stok kalemi fiyat/miktar/durum değiştiğinde en iyi teklifi güncelle"""
+    previous_product_id = getattr(instance, '_loaded_product_id', None)
+    instance._loaded_product_id = instance.product_id
+    if update_fields is not None and not OFFER_FIELDS.intersection(update_fields):
+        return
+    # Ürün değiştiyse eski ürün de yeniden hesaplanır
+    stock_changed_on_commit([instance.product_id, previous_product_id])
+
+
+@receiver(post_delete, sender=StockItem)
+def stock_item_deleted(sender, instance, **kwargs):
+    """Silinen stok kaleminin ürününü yeniden hesapla"""
+    stock_changed_on_commit([instance.product_id])
+
+
+@receiver(post_save, sender=Warehouse)
+def warehouse_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    """Depo aktiflik durumu değiştiğinde depodaki ürünleri yeniden hesapla"""
+    previous_is_active = getattr(instance, '_loaded_is_active', None)
+    instance._loaded_is_active = instance.is_active
+    if created:
+        return
+    if update_fields is not None and 'is_active' not in update_fields:
+        return
+    # Yüklenen değer biliniyorsa sadece gerçekten değiştiğinde (ör. isim değişikliği değil)
+    if previous_is_active is not None and previous_is_active == instance.is_active:
+        return
+    stock_changed_on_commit(
+        instance.stock_items.values_list('product_id', flat=True).distinct()
+    )
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def catalog_changed(sender, **kwargs):
+    """Ürün/kategori değişikliklerinde katalog önbelleğini geçersiz kıl"""
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=RetailerWholesaler)
+@receiver(post_delete, sender=RetailerWholesaler)
+def relationship_changed(sender, instance, **kwargs):
+    """Perakendecinin iskontoları değişti - sadece o şirketin önbelleği"""
+    bump_company_version(instance.retailer_id)
+
+
+# Pazaryeri görünürlüğünü/fiyatlandırmayı etkileyen Company alanları
+COMPANY_FIELDS = ('company_type', 'is_active')
+
+
+@receiver(pre_save, sender=Company)
+def company_changing(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Şirket türü veya aktiflik durumu değişiyor mu"""
+    instance._market_changes = set()
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not set(COMPANY_FIELDS).intersection(update_fields):
+        return
+    old = Company.objects.filter(pk=instance.pk).values(*COMPANY_FIELDS).first()
+    if old is not None:
+        instance._market_changes = {
+            field for field in COMPANY_FIELDS if old[field] != getattr(instance, field)
+        }
+
+
+@receiver(post_save, sender=Company)
+def company_changed(sender, instance, **kwargs):
+    """Şirketin önbelleğini geçersiz kıl; tür değiştiyse depolarındaki teklifleri yeniden hesapla"""
+    changes = getattr(instance, '_market_changes', set())
+    if not changes:
+        return
+    bump_company_version(instance.pk)
+    if 'company_type' in changes:
+        # SELLABLE_STOCK_FILTER toptancı türüne bağlıdır
+        stock_changed_on_commit(
+            StockItem.objects.filter(
+                warehouse__company=instance
+            ).values_list('product_id', flat=True).distinct()
+        )
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def subscription_changed(sender, instance, update_fields=None, **kwargs):
+    """Şirketin planı (komisyonu) değişti"""
+    # Kullanım sayaçları (api_calls_this_month vb.) fiyatları etkilemez
+    if update_fields is not None and not {'plan', 'status'}.intersection(update_fields):
+        return
+    bump_company_version(instance.company_id)
+
+
+@receiver(post_save, sender=SubscriptionPlan)
+def plan_changed(sender, instance, **kwargs):
+    """Plan komisyon oranı değişti - bu plandaki tüm şirketler"""
+    bump_plan_version(instance.id)
@@ -0,0 +1,158 @@
+# backend/market/stats.py
+"""
+Pazaryeri istatistikleri
+
+Genel sayılar periyodik olarak MarketplaceSnapshot tablosuna yazılır
+(market.tasks.refresh_marketplace_snapshot). Beat çalışmıyorsa veya geride
+kaldıysa bayat görüntü istek sırasında yenilenir (latest_snapshot).
+Perakendeciye özel değerler (bilinen toptancılar, ortalama iskonto ve
+potansiyel tasarruf) her istekte görüntü ve fiyatlandırma kurallarından
+sorgu gerektirmeden hesaplanır.
+"""
+import logging
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import MarketplaceSnapshot, ProductBestOffer
+from .offers import sellable_stock_items
+from .pricing import TWO_PLACES
+
+logger = logging.getLogger(__name__)
+
+# Eski görüntüler bu süreden sonra silinir (en son görüntü her zaman korunur)
+SNAPSHOT_RETENTION = timedelta(days=1)
+
+# Bayat görüntüyü aynı anda tek bir isteğin yeniden hesaplaması için kilit
+SNAPSHOT_REBUILD_LOCK = 'market:snapshot:rebuild'
+SNAPSHOT_REBUILD_LOCK_TIMEOUT = 60
+
+
+def build_snapshot():
+    """
+    Genel pazaryeri istatistiklerini hesaplayıp yeni bir görüntü kaydeder
+
+    Tüm genel sayılar satılabilir stok kalemleri üzerinde tek bir toplama
+    sorgusuyla, toptancı teklif toplamları da okuma modelinden tek bir
+    GROUP BY ile hesaplanır.
+    """
+    totals = sellable_stock_items().filter(product__is_active=True).aggregate(
+        total_products=Count('product', distinct=True),
+        total_wholesalers=Count(
+            'warehouse__company', distinct=True, filter=Q(warehouse__company__is_active=True)
+        ),
+        categories_count=Count('product__category', distinct=True),
+        total_stock=Sum('quantity'),
+    )
+
+    wholesaler_offers = {
+        str(row['wholesaler_id']): {
+            'products': row['products'],
+            'offer_value': str(row['offer_value']),
+        }
+        for row in ProductBestOffer.objects.filter(
+            product__is_active=True,
+            wholesaler__isnull=False,
+            sale_price__isnull=False,
+        ).values('wholesaler_id').annotate(
+            products=Count('id'),
+            offer_value=Sum('sale_price'),
+        ).order_by()
+    }
+
+    return MarketplaceSnapshot.objects.create(
+        total_products=totals['total_products'] or 0,
+        total_wholesalers=totals['total_wholesalers'] or 0,
+        categories_count=totals['categories_count'] or 0,
+        total_stock=totals['total_stock'] or 0,
+        wholesaler_offers=wholesaler_offers,
+    )
+
+
+def prune_snapshots(keep_after=None):
+    """Saklama süresini aşan eski görüntüleri siler"""
+    latest = MarketplaceSnapshot.objects.order_by('-computed_at').values_list('id', flat=True).first()
+    keep_after = keep_after or timezone.now() - SNAPSHOT_RETENTION
+    deleted, _ = MarketplaceSnapshot.objects.filter(
+        computed_at__lt=keep_after
+    ).exclude(id=latest).delete()
+    return deleted
+
+
+def snapshot_max_age():
+    """Görüntü bu süreden eskiyse bayat sayılır (yenileme aralığının iki katı)"""
+    return timedelta(seconds=2 * getattr(settings, 'MARKETPLACE_SNAPSHOT_INTERVAL', 5 * 60))
+
+
+def latest_snapshot():
+    """
+    En son görüntü
+    Hiç yoksa (ilk kurulum) senkron olarak oluşturulur. Bayatsa kilidi alan
+    istek yeniden hesaplar; kilidi alamayanlar mevcut görüntüyle devam eder.
+    """
+    snapshot = MarketplaceSnapshot.objects.order_by('-computed_at').first()
+    if snapshot is None:
+        return build_snapshot()
+    if snapshot.computed_at >= timezone.now() - snapshot_max_age():
+        return snapshot
+
+    try:
+        locked = cache.add(SNAPSHOT_REBUILD_LOCK, 1, timeout=SNAPSHOT_REBUILD_LOCK_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Snapshot rebuild lock failed: {e}")
+        locked = True
+    if not locked:
+        return snapshot
+
+    try:
+        snapshot = build_snapshot()
+        prune_snapshots()
+    finally:
+        try:
+            cache.delete(SNAPSHOT_REBUILD_LOCK)
+        except Exception:
+            pass
+    return snapshot
+
+
+def retailer_overlay(snapshot, pricing):
+    """
+    Perakendeciye özel istatistikler
+
+    - known_wholesalers: aktif toptancı ilişkisi sayısı
+    - average_discount: bilinen toptancıların iskonto oranlarının, en iyi teklif
+      sayısıyla ağırlıklı ortalaması (%)
+    - your_potential_savings: en iyi teklifi bilinen bir toptancıda olan her
+      üründen birer adet alındığında iskonto sayesinde ödenmeyen tutar
+    """
+    multiplier = Decimal('1') + pricing.commission_rate
+
+    offer_count = 0
+    weighted_discount = Decimal('0')
+    savings = Decimal('0')
+    for wholesaler_id in pricing.relationships:
+        discount_rate = pricing.get_discount_rate(wholesaler_id)
+        offers = snapshot.wholesaler_offers.get(str(wholesaler_id))
+        if not offers:
+            continue
+        offer_count += offers['products']
+        weighted_discount += discount_rate * offers['products']
+        savings += Decimal(offers['offer_value']) * discount_rate * multiplier
+
+    if offer_count:
+        average_discount = weighted_discount / offer_count
+    elif pricing.relationships:
+        rates = [pricing.get_discount_rate(wholesaler_id) for wholesaler_id in pricing.relationships]
+        average_discount = sum(rates) / len(rates)
+    else:
+        average_discount = Decimal('0')
+
+    return {
+        'known_wholesalers': len(pricing.relationships),
+        'average_discount': (average_discount * 100).quantize(TWO_PLACES, rounding=ROUND_HALF_UP),
+        'your_potential_savings': savings.quantize(TWO_PLACES, rounding=ROUND_HALF_UP),
+    }
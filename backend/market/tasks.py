@@ -0,0 +1,26 @@
+# backend/market/tasks.py
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_marketplace_snapshot():
+    """
+    Pazaryeri istatistik görüntüsünü yeniler (Celery beat ile periyodik)
+    """
+    from .stats import build_snapshot, prune_snapshots
+
+    snapshot = build_snapshot()
+    pruned = prune_snapshots()
+
+    logger.info(
+        f"Marketplace snapshot {snapshot.id}: {snapshot.total_products} products, "
+        f"{snapshot.total_wholesalers} wholesalers ({pruned} old snapshots pruned)"
+    )
+    return {
+        'success': True,
+        'snapshot_id': snapshot.id,
+        'pruned': pruned,
+    }
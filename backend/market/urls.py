@@ -2,6 +2,8 @@ from django.urls import path
 from .views import (
     MarketProductListView,
     marketplace_stats,
+    marketplace_facets,
+    marketplace_export,
     product_detail,
     clear_marketplace_cache
 )
@@ -13,6 +15,8 @@ urlpatterns = [
     path('products/', MarketProductListView.as_view(), name='product_list'),
     path('products/<int:product_id>/', product_detail, name='product_detail'),
     path('stats/', marketplace_stats, name='marketplace_stats'),
+    path('facets/', marketplace_facets, name='marketplace_facets'),
+    path('export/', marketplace_export, name='marketplace_export'),
     
     # Admin/Debug endpoint'leri
     path('clear-cache/', clear_marketplace_cache, name='clear_cache'),
@@ -2,17 +2,27 @@ from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q, Sum, Avg, Count, F, Case, When, Value, DecimalField
+from django.db.models import Count, Case, When, Value, DecimalField
 from django.db.models.functions import Coalesce
 from django.core.cache import cache
 from django.conf import settings
-from decimal import Decimal
-import hashlib
+from django.utils import timezone
 
-from products.models import Product, Category
+from products.models import Product
 from inventory.models import StockItem
-from companies.models import Company, RetailerWholesaler
+from core.conditional import conditional_view
+from core.pagination import CursorOptInPagination
+from core.streaming import export_response, get_export_format, get_since
 from subscriptions.permissions import HasMarketplaceAccess, HasDynamicPricing
+from .cache import (
+    bump_catalog_version, company_version_token, get_cache_timeout,
+    get_version, get_versions, hash_params
+)
+from .export import EXPORT_FIELDS, export_queryset, iter_export_rows
+from .facets import compute_facets
+from .pricing import RetailerPricing
+from .stats import latest_snapshot, retailer_overlay
+from .filters import filter_market_products, market_products
 from .serializers import (
     MarketProductSerializer, 
     MarketProductFilterSerializer,
@@ -20,6 +30,21 @@ from .serializers import (
 )
 
 
+def market_list_validators(view, request, *args, **kwargs):
+    """Liste ETag'i: şirket + fiyat/stok sürümleri + sorgu parametreleri (veritabanı sorgusu yok)"""
+    company = request.user.company
+    return (company.id, company_version_token(company, include_stock=True), hash_params(request.query_params.dict())), None
+
+
+def product_detail_validators(request, product_id):
+    """Ürün detayı ETag'i: şirket + fiyat sürümleri + ürün sürümü"""
+    company = request.user.company
+    return (
+        company.id, company_version_token(company),
+        product_id, get_version('product', product_id)
+    ), None
+
+
 class MarketProductListView(generics.ListAPIView):
     """
     B2B Pazaryeri ürün listesi API'si
@@ -28,82 +53,43 @@ class MarketProductListView(generics.ListAPIView):
     Sadece aboneliği olan ve pazaryeri erişimi bulunan kullanıcılar erişebilir.
     
     GET /api/v1/market/products/
+    GET /api/v1/market/products/?cursor=&no_count=true - Keyset sayfalaması
     """
     serializer_class = MarketProductSerializer
+    pagination_class = CursorOptInPagination
     permission_classes = [IsAuthenticated, HasMarketplaceAccess, HasDynamicPricing]
     
     def get_queryset(self):
         """
-        Optimize edilmiş queryset - select_related ve prefetch_related kullanır
+        Optimize edilmiş queryset - ProductBestOffer okuma modeline join yapar
+
+        Stok toplamları ve en iyi stok kalemi ProductBestOffer tablosunda
+        önceden hesaplandığı için bir sayfa katalog büyüklüğünden bağımsız
+        olarak sabit sayıda sorgu ile listelenir.
         """
-        user_company = self.request.user.company
-        
-        # Temel queryset - sadece stokta olan ürünler
-        queryset = Product.objects.filter(
-            is_active=True,
-            stock_items__quantity__gt=0,
-            stock_items__is_active=True,
-            stock_items__is_sellable=True,
-            stock_items__warehouse__is_active=True,
-            stock_items__warehouse__company__company_type__in=['wholesaler', 'both']
-        ).select_related(
-            'category'
+        # Stok ve fiyat bilgileri okuma modelinden gelir (market.filters)
+        queryset = market_products().select_related(
+            'category',
+            'category__parent',
+            'best_offer__stock_item__warehouse__company'
         ).prefetch_related(
-            'attribute_values__attribute',
-            'stock_items__warehouse__company'
-        ).distinct()
-        
-        # Stok ve fiyat hesaplamaları için annotate
-        queryset = queryset.annotate(
-            total_stock=Sum('stock_items__quantity'),
-            available_stock=Sum(
-                F('stock_items__quantity') - F('stock_items__reserved_quantity')
-            ),
-            avg_sale_price=Avg('stock_items__sale_price')
+            'attribute_values__attribute'
         )
         
-        # Her ürün için en iyi stok kalemini belirle (en düşük fiyatlı)
-        # Bu SubQuery ile yapılabilir ama performans için ayrı method kullanacağız
-        
         return queryset
     
-    def get_serializer_context(self):
-        """Serializer'a ek context bilgileri ekle"""
-        context = super().get_serializer_context()
-        
-        # Her ürün için en iyi stok kalemini önceden hesapla
-        queryset = self.get_queryset()
-        best_stock_items = {}
-        
-        for product in queryset:
-            # Her ürün için en düşük fiyatlı stok kalemini bul
-            best_stock = product.stock_items.filter(
-                quantity__gt=0,
-                is_active=True,
-                is_sellable=True,
-                warehouse__is_active=True,
-                sale_price__isnull=False
-            ).select_related('warehouse__company').order_by('sale_price').first()
-            
-            if best_stock:
-                best_stock_items[product.id] = best_stock
-                # Product nesnesine ekle (serializer'da kullanmak için)
-                product.best_stock_item = best_stock
-        
-        context['best_stock_items'] = best_stock_items
-        return context
-    
+    @conditional_view(market_list_validators)
     def list(self, request, *args, **kwargs):
         """
-        Liste endpoint'i - filtreleme ve önbellekleme ile
+        Liste endpoint'i - filtreleme, önbellekleme ve koşullu GET (ETag) ile
         """
         # Filtreleme parametrelerini validate et
         filter_serializer = MarketProductFilterSerializer(data=request.query_params)
         filter_serializer.is_valid(raise_exception=True)
         filters = filter_serializer.validated_data
         
-        # Cache key oluştur
-        cache_key = self._generate_cache_key(request.user.company.id, filters)
+        # Cache key oluştur (katalog/şirket/plan sürümlerini içerir)
+        cache_key = self._generate_cache_key(request.user.company, request.query_params)
         
         # Cache'den kontrol et
         cached_response = cache.get(cache_key)
@@ -120,63 +106,30 @@ class MarketProductListView(generics.ListAPIView):
             serializer = self.get_serializer(page, many=True)
             paginated_response = self.get_paginated_response(serializer.data)
             
-            # Cache'e kaydet (5 dakika)
-            cache.set(cache_key, paginated_response.data, 300)
+            # Cache'e kaydet (sürümlü anahtar, uzun TTL)
+            cache.set(cache_key, paginated_response.data, get_cache_timeout())
             return paginated_response
         
         serializer = self.get_serializer(queryset, many=True)
         response_data = serializer.data
         
         # Cache'e kaydet
-        cache.set(cache_key, response_data, 300)
+        cache.set(cache_key, response_data, get_cache_timeout())
         return Response(response_data)
     
     def _apply_custom_filters(self, queryset, filters):
-        """Özel filtreleri uygula"""
-        
-        # Kategori filtresi
-        if filters.get('category'):
-            queryset = queryset.filter(category_id=filters['category'])
-        
-        # Marka filtresi
-        if filters.get('brand'):
-            queryset = queryset.filter(brand__icontains=filters['brand'])
-        
-        # Fiyat aralığı filtresi (ortalama fiyat üzerinden)
-        if filters.get('min_price'):
-            queryset = queryset.filter(avg_sale_price__gte=filters['min_price'])
-        if filters.get('max_price'):
-            queryset = queryset.filter(avg_sale_price__lte=filters['max_price'])
-        
-        # Sadece stokta olanlar
-        if filters.get('in_stock', True):
-            queryset = queryset.filter(total_stock__gt=0)
-        
-        # Sadece bilinen toptancıların ürünleri
-        if filters.get('known_wholesalers_only'):
-            user_company = self.request.user.company
-            known_wholesaler_ids = RetailerWholesaler.objects.filter(
-                retailer=user_company,
-                is_active=True
-            ).values_list('wholesaler_id', flat=True)
-            
-            queryset = queryset.filter(
-                stock_items__warehouse__company_id__in=known_wholesaler_ids
-            )
-        
-        # Arama
-        if filters.get('search'):
-            search_term = filters['search']
-            queryset = queryset.filter(
-                Q(name__icontains=search_term) |
-                Q(brand__icontains=search_term) |
-                Q(sku__icontains=search_term) |
-                Q(model__icontains=search_term)
-            )
+        """Özel filtreleri ve sıralamayı uygula"""
+        queryset = filter_market_products(
+            queryset, filters, self.request.user.company, rank_search=True
+        )
+        search_term = filters.get('search')
         
         # Sıralama
         ordering = filters.get('ordering', '-created_at')
-        if ordering == 'final_price':
+        if ordering == 'relevance':
+            # Arama yoksa varsayılan sıralamaya dön
+            queryset = queryset.order_by('-search_rank', '-id') if search_term else queryset.order_by('-created_at')
+        elif ordering == 'final_price':
             # Final price'a göre sıralama için avg_sale_price kullan
             queryset = queryset.order_by('avg_sale_price')
         elif ordering == '-final_price':
@@ -186,13 +139,17 @@ class MarketProductListView(generics.ListAPIView):
         
         return queryset
     
-    def _generate_cache_key(self, company_id, filters):
-        """Cache key oluşturur"""
-        # Filtreleri string'e çevir ve hash'le
-        filter_string = str(sorted(filters.items()))
-        filter_hash = hashlib.md5(filter_string.encode()).hexdigest()[:8]
+    def _generate_cache_key(self, company, query_params):
+        """
+        Cache key oluşturur
+        Sürüm token'ı değiştiğinde (fiyat, stok, ilişki, plan güncellemesi) anahtar da değişir
+        """
+        # Sayfa/cursor dahil tüm parametreleri hash'le
+        filter_hash = hash_params(query_params.dict())
+        # Liste total_stock gösterir ve ona göre sıralanabilir
+        version_token = company_version_token(company, include_stock=True)
         
-        return f"market_products_{company_id}_{filter_hash}"
+        return f"market_products_{company.id}_{version_token}_{filter_hash}"
 
 
 @api_view(['GET'])
@@ -202,69 +159,115 @@ def marketplace_stats(request):
     Pazaryeri genel istatistikleri
     
     GET /api/v1/market/stats/
+    
+    Genel sayılar periyodik görüntüden (MarketplaceSnapshot) okunur;
+    perakendeciye özel değerler fiyatlandırma kurallarından hesaplanır.
     """
-    user_company = request.user.company
+    snapshot = latest_snapshot()
+    pricing = RetailerPricing.for_request(request)
+    
+    stats = {
+        'total_products': snapshot.total_products,
+        'total_wholesalers': snapshot.total_wholesalers,
+        'products_in_stock': snapshot.total_products,
+        'categories_count': snapshot.categories_count,
+        'snapshot_at': snapshot.computed_at,
+    }
+    stats.update(retailer_overlay(snapshot, pricing))
     
-    # Cache key
-    cache_key = f"marketplace_stats_{user_company.id}"
-    
-    # Cache'den kontrol et
-    cached_stats = cache.get(cache_key)
-    if cached_stats and not settings.DEBUG:
-        return Response(cached_stats)
-    
-    # İstatistikleri hesapla
-    stats = {}
-    
-    # Toplam ürün sayısı (stokta olanlar)
-    stats['total_products'] = Product.objects.filter(
-        is_active=True,
-        stock_items__quantity__gt=0,
-        stock_items__is_active=True,
-        stock_items__warehouse__company__company_type__in=['wholesaler', 'both']
-    ).distinct().count()
-    
-    # Toplam toptancı sayısı
-    stats['total_wholesalers'] = Company.objects.filter(
-        company_type__in=['wholesaler', 'both'],
-        is_active=True,
-        warehouses__stock_items__quantity__gt=0
-    ).distinct().count()
-    
-    # Kullanıcının bildiği toptancı sayısı
-    stats['known_wholesalers'] = RetailerWholesaler.objects.filter(
-        retailer=user_company,
-        is_active=True
-    ).count()
-    
-    # Stokta olan ürün sayısı
-    stats['products_in_stock'] = stats['total_products']  # Zaten filtreledik
-    
-    # Ortalama iskonto oranı (basit hesaplama)
-    stats['average_discount'] = Decimal('5.0')  # Şimdilik sabit
-    
-    # Kategori sayısı
-    stats['categories_count'] = Category.objects.filter(
-        products__stock_items__quantity__gt=0,
-        products__is_active=True
-    ).distinct().count()
-    
-    # Potansiyel tasarruf (örnek hesaplama)
-    # Bu daha karmaşık bir hesaplama olacak
-    stats['your_potential_savings'] = Decimal('15000.00')  # Şimdilik örnek
-    
-    # Serialize et
     serializer = MarketplaceStatsSerializer(stats)
-    response_data = serializer.data
+    return Response(serializer.data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, HasMarketplaceAccess])
+def marketplace_facets(request):
+    """
+    Pazaryeri filtre kenar çubuğu için facet sayımları
+    
+    GET /api/v1/market/facets/?category=1&brand=Michelin
+    
+    Ürün listesiyle aynı filtreleri kabul eder; marka, kategori ve ürün
+    özelliklerinin sayıları mevcut filtreler altında tek sorguda hesaplanır.
+    """
+    filter_serializer = MarketProductFilterSerializer(data=request.query_params)
+    filter_serializer.is_valid(raise_exception=True)
+    filters = filter_serializer.validated_data
     
-    # Cache'e kaydet (10 dakika)
-    cache.set(cache_key, response_data, 600)
+    user_company = request.user.company
     
+    # Sayımlar şirketten bağımsızdır; sadece bilinen toptancı filtresi şirkete özeldir
+    filter_hash = hash_params({
+        key: str(value) for key, value in filters.items() if key != 'ordering'
+    })
+    if filters.get('known_wholesalers_only'):
+        catalog_version, company_version = get_versions(('catalog', None), ('company', user_company.id))
+        scope = f"{catalog_version}_{user_company.id}_{company_version}"
+    else:
+        scope = get_version('catalog')
+    cache_key = f"market_facets_{scope}_{filter_hash}"
+    
+    cached_facets = cache.get(cache_key)
+    if cached_facets and not settings.DEBUG:
+        return Response(cached_facets)
+    
+    queryset = filter_market_products(market_products(), filters, user_company)
+    response_data = compute_facets(queryset)
+    
+    cache.set(cache_key, response_data, get_cache_timeout())
     return Response(response_data)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, HasMarketplaceAccess, HasDynamicPricing])
+def marketplace_export(request):
+    """
+    Perakendeciye özel fiyatlarla tüm katalog dışa aktarımı (akış)
+    
+    GET /api/v1/market/export/?export_format=ndjson|csv
+    GET /api/v1/market/export/?since=2025-01-01T00:00:00Z&pricing=<parmak izi>
+    
+    Ürün listesi filtrelerini kabul eder. Delta için ?since= veya
+    If-Modified-Since kullanılır; bir sonraki istek için yanıttaki
+    Last-Modified ve X-Pricing-Fingerprint başlıkları saklanmalıdır.
+    Parmak izi değiştiyse (iskonto/komisyon değişikliği) tam dışa aktarım yapılır.
+    """
+    filter_serializer = MarketProductFilterSerializer(data=request.query_params)
+    filter_serializer.is_valid(raise_exception=True)
+    filters = filter_serializer.validated_data
+    
+    export_format = get_export_format(request)
+    since = get_since(request)
+    started_at = timezone.now()
+    
+    pricing = RetailerPricing.for_request(request)
+    fingerprint = pricing.fingerprint()
+    
+    # Fiyatlandırma koşulları değiştiyse eski delta'nın üzerine tüm fiyatlar yeniden gönderilmeli
+    client_fingerprint = request.query_params.get('pricing')
+    if client_fingerprint and client_fingerprint != fingerprint:
+        since = None
+    
+    queryset = export_queryset(filters, request.user.company, since=since)
+    
+    if since is not None and 'If-Modified-Since' in request.headers and not queryset.exists():
+        return Response(status=status.HTTP_304_NOT_MODIFIED)
+    
+    response = export_response(
+        iter_export_rows(queryset, pricing),
+        export_format,
+        filename=f"tyrex-katalog-{started_at:%Y%m%d%H%M%S}",
+        fieldnames=EXPORT_FIELDS,
+        last_modified=started_at,
+    )
+    response['X-Export-Type'] = 'delta' if since is not None else 'full'
+    response['X-Pricing-Fingerprint'] = fingerprint
+    return response
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, HasMarketplaceAccess])
+@conditional_view(product_detail_validators)
 def product_detail(request, product_id):
     """
     Pazaryeri ürün detayı
@@ -272,13 +275,15 @@ def product_detail(request, product_id):
     GET /api/v1/market/products/{id}/
     """
     try:
-        product = Product.objects.select_related('category').prefetch_related(
-            'attribute_values__attribute',
-            'stock_items__warehouse__company'
+        product = Product.objects.select_related(
+            'category',
+            'best_offer__stock_item__warehouse__company'
+        ).prefetch_related(
+            'attribute_values__attribute'
         ).get(
             id=product_id,
             is_active=True,
-            stock_items__quantity__gt=0
+            best_offer__isnull=False
         )
     except Product.DoesNotExist:
         return Response(
@@ -286,30 +291,11 @@ def product_detail(request, product_id):
             status=status.HTTP_404_NOT_FOUND
         )
     
-    # En iyi stok kalemini ekle
-    best_stock = product.stock_items.filter(
-        quantity__gt=0,
-        is_active=True,
-        is_sellable=True,
-        warehouse__is_active=True,
-        sale_price__isnull=False
-    ).select_related('warehouse__company').order_by('sale_price').first()
-    
-    if best_stock:
-        product.best_stock_item = best_stock
-    
-    # Ek detay bilgileri
-    product.total_stock = product.stock_items.aggregate(
-        total=Sum('quantity')
-    )['total'] or 0
-    
-    product.available_stock = product.stock_items.aggregate(
-        available=Sum(F('quantity') - F('reserved_quantity'))
-    )['available'] or 0
-    
-    product.avg_sale_price = product.stock_items.aggregate(
-        avg_price=Avg('sale_price')
-    )['avg_price']
+    # Stok ve fiyat bilgileri okuma modelinden
+    best_offer = product.best_offer
+    product.total_stock = best_offer.total_stock
+    product.available_stock = best_offer.available_stock
+    product.avg_sale_price = best_offer.avg_sale_price
     
     serializer = MarketProductSerializer(
         product, 
@@ -333,9 +319,8 @@ def clear_marketplace_cache(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    # Tüm market cache'lerini temizle
-    cache_pattern = f"market_*"
-    cache.delete_pattern(cache_pattern)
+    # Tüm market cache'lerini geçersiz kıl (O(1) - keyspace taraması yok)
+    bump_catalog_version()
     
     return Response({
         'message': 'Pazaryeri cache\'i başarıyla temizlendi.'
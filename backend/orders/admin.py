@@ -1,9 +1,10 @@
 # backend/orders/admin.py
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
-from .models import Order, OrderItem, OrderStatusHistory
+from .models import Order, OrderArchive, OrderItem, OrderOutbox, OrderStatusHistory
+from .services import cancel_orders, transition_orders
 
 
 class OrderItemInline(admin.TabularInline):
@@ -119,6 +120,7 @@ class OrderAdmin(admin.ModelAdmin):
     
     readonly_fields = [
         'order_number', 'uuid', 'subtotal', 'total_amount', 
+        'total_quantity', 'line_count',
         'tyrex_commission_amount', 'order_date', 'confirmed_at',
         'shipped_at', 'delivered_at', 'canceled_at'
     ]
@@ -211,55 +213,46 @@ class OrderAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         return super().get_queryset(request).select_related(
             'retailer', 'wholesaler', 'retailer_user'
-        ).prefetch_related('items')
+        )
     
     # Toplu işlemler
     actions = ['mark_as_confirmed', 'mark_as_shipped', 'mark_as_canceled']
     
     def mark_as_confirmed(self, request, queryset):
-        """Seçili siparişleri onaylı yap"""
-        from django.utils import timezone
-        
-        updated = 0
-        for order in queryset.filter(status__in=['draft', 'pending']):
-            order.status = 'confirmed'
-            order.confirmed_at = timezone.now()
-            order.save(update_fields=['status', 'confirmed_at'])
-            
-            # Durum geçmişi kaydet
-            OrderStatusHistory.objects.create(
-                order=order,
-                old_status=order.status,
-                new_status='confirmed',
-                changed_by=request.user,
-                change_reason='Admin tarafından toplu onay'
-            )
-            updated += 1
+        """Seçili siparişleri onaylı yap (sadece bekleyen siparişler; taslaklar önce gönderilmeli)"""
+        selected = dict(queryset.values_list('pk', 'order_number'))
+        outcomes = transition_orders(
+            {order_id: 'confirmed' for order_id in selected},
+            user=request.user,
+            reason='Admin tarafından toplu onay'
+        )
+        updated = sum(1 for outcome in outcomes.values() if outcome['outcome'] == 'updated')
         
         self.message_user(
             request,
             f'{updated} sipariş onaylandı.'
         )
+        rejected = [
+            selected[order_id] for order_id, outcome in sorted(outcomes.items())
+            if outcome['outcome'] != 'updated'
+        ]
+        if rejected:
+            self.message_user(
+                request,
+                f'{len(rejected)} sipariş onaylanabilir durumda olmadığı için atlandı: {", ".join(rejected)}',
+                level=messages.WARNING
+            )
     mark_as_confirmed.short_description = "Seçili siparişleri onayla"
     
     def mark_as_shipped(self, request, queryset):
         """Seçili siparişleri kargoya verildi yap"""
-        from django.utils import timezone
-        
-        updated = 0
-        for order in queryset.filter(status='processing'):
-            order.status = 'shipped'
-            order.shipped_at = timezone.now()
-            order.save(update_fields=['status', 'shipped_at'])
-            
-            OrderStatusHistory.objects.create(
-                order=order,
-                old_status='processing',
-                new_status='shipped',
-                changed_by=request.user,
-                change_reason='Admin tarafından toplu kargo güncelleme'
-            )
-            updated += 1
+        order_ids = queryset.filter(status='processing').values_list('pk', flat=True)
+        outcomes = transition_orders(
+            {order_id: 'shipped' for order_id in order_ids},
+            user=request.user,
+            reason='Admin tarafından toplu kargo güncelleme'
+        )
+        updated = sum(1 for outcome in outcomes.values() if outcome['outcome'] == 'updated')
         
         self.message_user(
             request,
@@ -268,27 +261,16 @@ class OrderAdmin(admin.ModelAdmin):
     mark_as_shipped.short_description = "Seçili siparişleri kargoya verildi yap"
     
     def mark_as_canceled(self, request, queryset):
-        """Seçili siparişleri iptal et"""
-        from django.utils import timezone
-        
-        updated = 0
-        for order in queryset.filter(status__in=['draft', 'pending', 'confirmed']):
-            order.status = 'canceled'
-            order.canceled_at = timezone.now()
-            order.save(update_fields=['status', 'canceled_at'])
-            
-            OrderStatusHistory.objects.create(
-                order=order,
-                old_status=order.status,
-                new_status='canceled',
-                changed_by=request.user,
-                change_reason='Admin tarafından toplu iptal'
-            )
-            updated += 1
+        """Seçili siparişleri iptal et (stoklar geri eklenir)"""
+        result = cancel_orders(
+            queryset.values_list('pk', flat=True),
+            user=request.user,
+            reason='Admin tarafından toplu iptal'
+        )
         
         self.message_user(
             request,
-            f'{updated} sipariş iptal edildi.'
+            f'{len(result.canceled)} sipariş iptal edildi.'
         )
     mark_as_canceled.short_description = "Seçili siparişleri iptal et"
 
@@ -385,4 +367,50 @@ class OrderStatusHistoryAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         return super().get_queryset(request).select_related(
             'order', 'changed_by'
-        )
\ No newline at end of file
+        )
+
+@admin.register(OrderOutbox)
+class OrderOutboxAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'event_type',
+        'order',
+        'status',
+        'attempts',
+        'created_at',
+        'published_at',
+        'claimed_at',
+        'consumed_at'
+    ]
+    list_filter = ['status', 'event_type', 'created_at']
+    search_fields = ['order__order_number']
+    raw_id_fields = ['order']
+    readonly_fields = ['created_at', 'published_at', 'consumed_at']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('order')
+
+
+@admin.register(OrderArchive)
+class OrderArchiveAdmin(admin.ModelAdmin):
+    list_display = [
+        'order_number',
+        'retailer',
+        'wholesaler',
+        'status',
+        'total_amount',
+        'order_date',
+        'archived_at'
+    ]
+    list_filter = ['status', 'order_date']
+    search_fields = ['order_number']
+    raw_id_fields = ['retailer', 'wholesaler']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('retailer', 'wholesaler')
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -5,4 +5,8 @@ from django.apps import AppConfig
 class OrdersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'orders'
-    verbose_name = 'Siparişler'
\ No newline at end of file
+    verbose_name = 'Siparişler'
+
+    def ready(self):
+        # Rollup (OrderDailyStats) sinyallerini bağla
+        from . import signals  # noqa: F401
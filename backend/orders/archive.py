@@ -0,0 +1,184 @@
+# backend/orders/archive.py
+"""
+Sipariş arşivi (soğuk katman)
+
+Canlı Order/OrderItem/OrderStatusHistory tabloları bölümlenmez: bu tablolara
+birçok yabancı anahtar bağlıdır (stok rezervasyonları, giden kutusu, kalemler)
+ve PostgreSQL bölümlü tablolarda benzersiz kısıtların (order_number, id)
+bölüm anahtarını içermesini ister. Bunun yerine eski ve kapanmış siparişler
+aylık bölümlenmiş OrderArchive tablosuna taşınır; canlı tablolar küçük kalır.
+
+- Taşıma core.batch üzerinde parçalı çalışır (orders.batch_jobs.OrderArchiver);
+  yarıda kalırsa kaldığı yerden devam eder, tekrar çalıştırmak güvenlidir.
+- Arşivlenen siparişler rollup tablosunda kalır; istatistikler değişmez.
+- OrderSerializer çıktısı arşivlenir; /orders/{id}/ arşivdeki siparişi aynı
+  biçimde döndürür.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Order, OrderArchive
+from .signals import archiving
+
+
+ARCHIVE_STATUSES = ('delivered', 'canceled')
+PARTITION_PREFIX = 'orders_orderarchive_y'
+
+
+def get_archive_cutoff():
+    """Bu tarihten eski kapanmış siparişler arşivlenir"""
+    months = getattr(settings, 'ORDER_ARCHIVE_AFTER_MONTHS', 12)
+    start = month_start(timezone.localtime())
+    return add_months(start, -months)
+
+
+def month_start(value):
+    """Yerel saatle ayın ilk anı"""
+    value = timezone.localtime(value)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(start):
+    return f'{PARTITION_PREFIX}{start:%Y}m{start:%m}'
+
+
+def ensure_archive_partitions(first_month, last_month):
+    """
+    [first_month, last_month] aralığındaki her ay için arşiv bölümü oluşturur
+    PostgreSQL dışındaki veritabanlarında bir şey yapmaz.
+    Dönüş: yeni oluşturulan bölüm adları
+    """
+    if connection.vendor != 'postgresql':
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'orders_orderarchive'"
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+
+        created = []
+        current = month_start(first_month)
+        last = month_start(last_month)
+        while current <= last:
+            name = partition_name(current)
+            if name not in existing:
+                cursor.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF orders_orderarchive '
+                    'FOR VALUES FROM (%s) TO (%s)',
+                    [current, add_months(current, 1)]
+                )
+                created.append(name)
+            current = add_months(current, 1)
+    return created
+
+
+def archivable_orders(cutoff=None):
+    """Arşive taşınabilecek siparişler"""
+    return Order.objects.filter(
+        status__in=ARCHIVE_STATUSES,
+        order_date__lt=cutoff or get_archive_cutoff()
+    )
+
+
+def archive_orders(order_ids, cutoff=None):
+    """
+    Siparişleri (kalemleri ve geçmişiyle) arşive taşır ve canlı tablolardan siler
+    Tek transaction; zaten arşivde olanlar tekrar yazılmaz.
+    Dönüş: taşınan sipariş sayısı
+    """
+    from .serializers import OrderSerializer
+
+    orders = list(
+        archivable_orders(cutoff).filter(pk__in=order_ids).select_related(
+            'retailer', 'wholesaler', 'retailer_user'
+        ).prefetch_related(
+            'items__product__category', 'items__warehouse__company', 'status_history'
+        ).order_by('pk')
+    )
+    if not orders:
+        return 0
+
+    archives = [
+        OrderArchive(
+            order_id=order.pk,
+            order_number=order.order_number,
+            retailer_id=order.retailer_id,
+            wholesaler_id=order.wholesaler_id,
+            status=order.status,
+            order_date=order.order_date,
+            total_amount=order.total_amount,
+            currency=order.currency,
+            data=OrderSerializer(order).data,
+            history=[
+                {
+                    'old_status': entry.old_status,
+                    'new_status': entry.new_status,
+                    'changed_by': entry.changed_by_id,
+                    'change_reason': entry.change_reason,
+                    'notes': entry.notes,
+                    'changed_at': entry.changed_at.isoformat(),
+                }
+                for entry in order.status_history.all()
+            ],
+        )
+        for order in orders
+    ]
+
+    with transaction.atomic():
+        ensure_archive_partitions(
+            min(order.order_date for order in orders),
+            max(order.order_date for order in orders)
+        )
+        OrderArchive.objects.bulk_create(archives, ignore_conflicts=True)
+        with archiving():
+            Order.objects.filter(pk__in=[order.pk for order in orders]).delete()
+    return len(orders)
+
+
+def get_archived_order(company, order_id):
+    """Şirketin (perakendeci veya toptancı olarak) erişebildiği arşiv kaydı"""
+    try:
+        order_id = int(order_id)
+    except (TypeError, ValueError):
+        return None
+    archive = OrderArchive.objects.filter(pk=order_id).first()
+    if archive is None or company.pk not in (archive.retailer_id, archive.wholesaler_id):
+        return None
+    return archive
+
+
+def archive_months_ahead():
+    """create_order_partitions için varsayılan ileri ay sayısı"""
+    return getattr(settings, 'ORDER_ARCHIVE_PARTITIONS_AHEAD', 3)
+
+
+def partition_window(months_ahead=None):
+    """
+    Oluşturulması gereken bölüm aralığı: en eski arşivlenebilir/arşivlenmiş
+    siparişin ayından, arşiv sınırının months_ahead ay sonrasına kadar
+    """
+    months_ahead = archive_months_ahead() if months_ahead is None else months_ahead
+    cutoff = get_archive_cutoff()
+    oldest = [
+        value for value in (
+            Order.objects.filter(status__in=ARCHIVE_STATUSES).order_by('order_date').values_list(
+                'order_date', flat=True
+            ).first(),
+            OrderArchive.objects.order_by('order_date').values_list('order_date', flat=True).first(),
+        )
+        if value is not None
+    ]
+    first = month_start(min(oldest) if oldest else cutoff - timedelta(days=1))
+    return first, add_months(cutoff, months_ahead)
@@ -0,0 +1,59 @@
+# backend/orders/batch_jobs.py
+"""
+Sipariş bakım işleri (core.batch)
+"""
+from datetime import timedelta
+
+from django.db.models.functions import Now
+from django.utils import timezone
+
+from core.batch import BatchJob, register
+
+from .archive import archivable_orders, archive_orders, get_archive_cutoff
+from .models import Order
+
+
+@register
+class StaleOrderFlagger(BatchJob):
+    """
+    stale_days günden uzun süredir bekleyen siparişleri işaretler
+    Her sipariş bir kez işaretlenir (stale_flagged_at).
+    """
+    name = 'orders.flag_stale'
+    stale_days = 7
+
+    def __init__(self):
+        self.cutoff = timezone.now() - timedelta(days=self.stale_days)
+
+    def get_queryset(self):
+        return Order.objects.filter(
+            status='pending',
+            order_date__lt=self.cutoff,
+            stale_flagged_at__isnull=True
+        )
+
+    def process_chunk(self, ids):
+        return self.get_queryset().filter(pk__in=ids).update(
+            internal_notes=f"{self.stale_days} günden uzun süredir bekleyen sipariş. Otomatik kontrol gerekli.",
+            stale_flagged_at=Now(),
+            updated_at=Now()
+        )
+
+
+@register
+class OrderArchiver(BatchJob):
+    """
+    ORDER_ARCHIVE_AFTER_MONTHS aydan eski teslim edilmiş/iptal edilmiş
+    siparişleri arşiv tablosuna taşır (orders.archive)
+    """
+    name = 'orders.archive'
+    chunk_size = 200
+
+    def __init__(self):
+        self.cutoff = get_archive_cutoff()
+
+    def get_queryset(self):
+        return archivable_orders(self.cutoff)
+
+    def process_chunk(self, ids):
+        return archive_orders(ids, self.cutoff)
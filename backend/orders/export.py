@@ -0,0 +1,111 @@
+# backend/orders/export.py
+"""
+Muhasebe için sipariş dışa aktarımı
+
+Finans ekipleri aylarca siparişi sipariş API'sini sayfalayarak çekmek yerine
+tek istekte dışa aktarır. Her sipariş kalemi bir satırdır; sipariş alanları
+kalem satırına düzleştirilir. Satırlar values() + iterator() ile okunur
+(model nesnesi ve kalem başına ürün/kategori sorgusu yoktur); bellek
+kullanımı sipariş sayısından bağımsızdır.
+
+Siparişler OrderViewSet.get_queryset() ile seçilir; liste filtreleri aynen
+geçerlidir. Arşive taşınmış siparişler (orders.archive) dahil değildir.
+"""
+from core.streaming import DEFAULT_CHUNK_SIZE
+from .models import OrderItem
+
+
+EXPORT_FIELDS = [
+    'order_id',
+    'order_number',
+    'order_date',
+    'status',
+    'payment_status',
+    'retailer_id',
+    'retailer_name',
+    'wholesaler_id',
+    'wholesaler_name',
+    'currency',
+    'order_subtotal',
+    'order_tax_amount',
+    'order_shipping_cost',
+    'order_discount_amount',
+    'order_total_amount',
+    'payment_terms_days',
+    'due_date',
+    'item_id',
+    'product_id',
+    'product_sku',
+    'product_name',
+    'product_brand',
+    'category',
+    'warehouse',
+    'quantity',
+    'unit_price',
+    'discount_percentage',
+    'discount_amount',
+    'total_price',
+    'is_canceled',
+]
+
+_VALUE_FIELDS = (
+    'id', 'order_id', 'order__order_number', 'order__order_date',
+    'order__status', 'order__payment_status',
+    'order__retailer_id', 'order__retailer__name',
+    'order__wholesaler_id', 'order__wholesaler__name',
+    'order__currency', 'order__subtotal', 'order__tax_amount',
+    'order__shipping_cost', 'order__discount_amount', 'order__total_amount',
+    'order__payment_terms_days', 'order__due_date',
+    'product_id', 'product_sku', 'product_name', 'product_brand',
+    'product__category__name', 'warehouse__name',
+    'quantity', 'unit_price', 'discount_percentage', 'discount_amount',
+    'total_price', 'is_canceled',
+)
+
+
+def export_queryset(orders):
+    """
+    Siparişlerin kalemleri (sipariş tarihi, sipariş ve kalem sırasıyla)
+
+    orders: filtrelenmiş sipariş queryset'i; alt sorgu olarak kullanılır.
+    """
+    return OrderItem.objects.filter(
+        order_id__in=orders.order_by().values('pk')
+    ).order_by('order__order_date', 'order_id', 'id').values(*_VALUE_FIELDS)
+
+
+def iter_export_rows(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Sunucu tarafı cursor ile kalem satırlarını düzleştirerek üretir"""
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield {
+            'order_id': row['order_id'],
+            'order_number': row['order__order_number'],
+            'order_date': row['order__order_date'],
+            'status': row['order__status'],
+            'payment_status': row['order__payment_status'],
+            'retailer_id': row['order__retailer_id'],
+            'retailer_name': row['order__retailer__name'],
+            'wholesaler_id': row['order__wholesaler_id'],
+            'wholesaler_name': row['order__wholesaler__name'],
+            'currency': row['order__currency'],
+            'order_subtotal': row['order__subtotal'],
+            'order_tax_amount': row['order__tax_amount'],
+            'order_shipping_cost': row['order__shipping_cost'],
+            'order_discount_amount': row['order__discount_amount'],
+            'order_total_amount': row['order__total_amount'],
+            'payment_terms_days': row['order__payment_terms_days'],
+            'due_date': row['order__due_date'],
+            'item_id': row['id'],
+            'product_id': row['product_id'],
+            'product_sku': row['product_sku'],
+            'product_name': row['product_name'],
+            'product_brand': row['product_brand'],
+            'category': row['product__category__name'],
+            'warehouse': row['warehouse__name'],
+            'quantity': row['quantity'],
+            'unit_price': row['unit_price'],
+            'discount_percentage': row['discount_percentage'],
+            'discount_amount': row['discount_amount'],
+            'total_price': row['total_price'],
+            'is_canceled': row['is_canceled'],
+        }
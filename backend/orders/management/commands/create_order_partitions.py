@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from core.batch import run_summary
+from core.db import is_postgres
+from orders.archive import ensure_archive_partitions, partition_name, partition_window
+from orders.batch_jobs import OrderArchiver
+
+
+class Command(BaseCommand):
+    help = 'Sipariş arşivinin aylık bölümlerini oluşturur (isteğe bağlı olarak eski siparişleri arşivler)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            help='Arşiv sınırından sonra kaç aylık bölüm açılacak (varsayılan ORDER_ARCHIVE_PARTITIONS_AHEAD)',
+        )
+        parser.add_argument(
+            '--archive',
+            action='store_true',
+            help='Bölümlerden sonra eski kapanmış siparişleri arşive taşı',
+        )
+
+    def handle(self, *args, **options):
+        first, last = partition_window(options['months_ahead'])
+        self.stdout.write(
+            f'🔄 Arşiv bölümleri hazırlanıyor ({partition_name(first)} - {partition_name(last)})...'
+        )
+
+        if is_postgres():
+            created = ensure_archive_partitions(first, last)
+            self.stdout.write(self.style.SUCCESS(f'✅ {len(created)} yeni bölüm oluşturuldu.'))
+        else:
+            self.stdout.write(self.style.WARNING('⚠️ Bölümleme sadece PostgreSQL\'de desteklenir, atlandı.'))
+
+        if options['archive']:
+            self.stdout.write('🔄 Eski siparişler arşive taşınıyor...')
+            summary = run_summary(OrderArchiver().run())
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {summary['affected']} sipariş arşivlendi ({summary['status']})."
+            ))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from companies.models import Company
+from orders.rollups import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = 'Sipariş rollup tablosunu (OrderDailyStats) sipariş tablosundan yeniden oluşturur'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--company',
+            type=int,
+            help='Sadece bu şirketin satırlarını yeniden oluştur (şirket ID)',
+        )
+
+    def handle(self, *args, **options):
+        company = None
+        if options['company']:
+            try:
+                company = Company.objects.get(id=options['company'])
+            except Company.DoesNotExist:
+                raise CommandError(f"ID {options['company']} ile şirket bulunamadı.")
+
+        target = company.name if company else 'tüm şirketler'
+        self.stdout.write(f'🔄 Sipariş istatistikleri yeniden oluşturuluyor ({target})...')
+
+        rows = rebuild_daily_stats(company)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ {rows} rollup satırı oluşturuldu.'))
@@ -0,0 +1,38 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from orders.outbox import relay_outbox
+
+
+class Command(BaseCommand):
+    help = 'Sipariş olayları giden kutusunu Celery\'ye yayınlar (--loop ile sürekli çalışan relay)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Sürekli çalış; her turdan sonra --interval saniye bekle',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=None,
+            help='Turlar arası bekleme (saniye, varsayılan ORDER_OUTBOX_RELAY_INTERVAL)',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        if interval is None:
+            interval = getattr(settings, 'ORDER_OUTBOX_RELAY_INTERVAL', 5)
+
+        self.stdout.write('🔄 Sipariş olayları yayınlanıyor...')
+        while True:
+            published = relay_outbox()
+            if published or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f'✅ {published} olay yayınlandı.'))
+            if not options['loop']:
+                break
+            if not published:
+                time.sleep(interval)
@@ -0,0 +1,38 @@
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.core.management.base import BaseCommand
+
+from orders.models import Order
+
+
+class Command(BaseCommand):
+    help = 'Sipariş kalem sayaçlarını (total_quantity, line_count) kalemlerle karşılaştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Uyuşmayan siparişlerin sayaçlarını yeniden hesapla',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔄 Sipariş sayaçları kontrol ediliyor...')
+
+        mismatched = list(
+            Order.objects.annotate(
+                actual_quantity=Coalesce(Sum('items__quantity'), 0),
+                actual_lines=Count('items')
+            ).filter(
+                ~Q(total_quantity=F('actual_quantity')) | ~Q(line_count=F('actual_lines'))
+            ).values_list('id', flat=True)
+        )
+
+        if not mismatched:
+            self.stdout.write(self.style.SUCCESS('✅ Tüm sipariş sayaçları doğru.'))
+            return
+
+        self.stdout.write(self.style.WARNING(f'⚠️ {len(mismatched)} siparişte sayaç uyuşmazlığı var.'))
+
+        if options['fix']:
+            updated = Order.sync_item_counters(Order.objects.filter(id__in=mismatched))
+            self.stdout.write(self.style.SUCCESS(f'✅ {updated} siparişin sayaçları düzeltildi.'))
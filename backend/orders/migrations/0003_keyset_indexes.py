@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_retailerwholesaler_discount_rate'),
+        ('orders', '0002_rename_orders_orde_order_n_87e0c5_idx_orders_orde_order_n_f3ada5_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['retailer', '-created_at', '-id'], name='orders_orde_retaile_10f2be_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['wholesaler', '-created_at', '-id'], name='orders_orde_wholesa_85a2d4_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from core.db import postgres_only_sql
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY transaction içinde çalışamaz
+    atomic = False
+
+    dependencies = [
+        ('orders', '0003_keyset_indexes'),
+        ('products', '0005_search_indexes'),  # pg_trgm eklentisi
+    ]
+
+    operations = [
+        # Django'nun icontains sorgusu UPPER("order_number"::text) LIKE UPPER(...) üretir;
+        # indeks ifadesi bununla birebir aynı olmalı
+        postgres_only_sql(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS orders_order_number_trgm "
+            "ON orders_order USING gin ((UPPER(order_number::text)) gin_trgm_ops)",
+            "DROP INDEX CONCURRENTLY IF EXISTS orders_order_number_trgm",
+        ),
+    ]
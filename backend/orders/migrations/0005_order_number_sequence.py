@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from core.db import postgres_only_sql
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_order_number_trgm_index'),
+    ]
+
+    operations = [
+        # Her nextval() 100 numaralık bir aralık ayırır (orders.numbering.BLOCK_SIZE)
+        postgres_only_sql(
+            "CREATE SEQUENCE IF NOT EXISTS orders_order_number_seq "
+            "AS bigint INCREMENT BY 100 START WITH 1 MINVALUE 1",
+            "DROP SEQUENCE IF EXISTS orders_order_number_seq",
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:21
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_retailerwholesaler_discount_rate'),
+        ('orders', '0005_order_number_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('retailer', 'Perakendeci'), ('wholesaler', 'Toptancı')], max_length=20, verbose_name='Rol')),
+                ('date', models.DateField(verbose_name='Gün')),
+                ('status', models.CharField(choices=[('draft', 'Taslak'), ('pending', 'Beklemede'), ('confirmed', 'Onaylandı'), ('processing', 'İşleniyor'), ('shipped', 'Kargoya Verildi'), ('delivered', 'Teslim Edildi'), ('canceled', 'İptal Edildi'), ('rejected', 'Reddedildi')], max_length=20, verbose_name='Sipariş Durumu')),
+                ('order_count', models.IntegerField(default=0, verbose_name='Sipariş Sayısı')),
+                ('total_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Toplam Tutar')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_daily_stats', to='companies.company', verbose_name='Şirket')),
+                ('counterparty', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='companies.company', verbose_name='Karşı Taraf')),
+            ],
+            options={
+                'verbose_name': 'Günlük Sipariş İstatistiği',
+                'verbose_name_plural': 'Günlük Sipariş İstatistikleri',
+                'indexes': [models.Index(fields=['company', 'role', 'date'], name='orders_orde_company_c31693_idx')],
+                'constraints': [models.UniqueConstraint(fields=('company', 'role', 'counterparty', 'date', 'status'), name='orders_daily_stats_unique')],
+            },
+        ),
+    ]
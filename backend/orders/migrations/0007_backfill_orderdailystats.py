@@ -0,0 +1,44 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill(apps, schema_editor):
+    """Mevcut siparişlerden rollup satırlarını oluşturur (rebuild_order_stats ile aynı)"""
+    Order = apps.get_model('orders', 'Order')
+    OrderDailyStats = apps.get_model('orders', 'OrderDailyStats')
+
+    rows = []
+    for role, company_field, counterparty_field in (
+        ('retailer', 'retailer_id', 'wholesaler_id'),
+        ('wholesaler', 'wholesaler_id', 'retailer_id'),
+    ):
+        grouped = Order.objects.annotate(day=TruncDate('order_date')).values(
+            company_field, counterparty_field, 'day', 'status'
+        ).annotate(order_count=Count('id'), amount=Sum('total_amount')).order_by()
+        for row in grouped:
+            rows.append(OrderDailyStats(
+                company_id=row[company_field],
+                role=role,
+                counterparty_id=row[counterparty_field],
+                date=row['day'],
+                status=row['status'],
+                order_count=row['order_count'],
+                total_amount=row['amount'] or 0,
+            ))
+    OrderDailyStats.objects.bulk_create(rows, batch_size=1000)
+
+
+def clear(apps, schema_editor):
+    apps.get_model('orders', 'OrderDailyStats').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_orderdailystats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, clear),
+    ]
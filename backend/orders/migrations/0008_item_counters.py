@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:24
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    """Mevcut siparişlerin sayaçlarını kalemlerden doldurur (Order.sync_item_counters ile aynı)"""
+    Order = apps.get_model('orders', 'Order')
+    OrderItem = apps.get_model('orders', 'OrderItem')
+
+    items = OrderItem.objects.filter(order_id=OuterRef('pk')).order_by().values('order_id')
+    Order.objects.update(
+        total_quantity=Coalesce(
+            Subquery(items.annotate(total=Sum('quantity')).values('total'), output_field=IntegerField()),
+            0
+        ),
+        line_count=Coalesce(
+            Subquery(items.annotate(count=Count('id')).values('count'), output_field=IntegerField()),
+            0
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_backfill_orderdailystats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='line_count',
+            field=models.PositiveIntegerField(default=0, help_text='Farklı ürün (kalem) sayısı', verbose_name='Kalem Sayısı'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='total_quantity',
+            field=models.PositiveIntegerField(default=0, help_text='Sipariş kalemlerindeki toplam ürün adedi', verbose_name='Toplam Adet'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0008_item_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('order_created', 'Sipariş Oluşturuldu')], max_length=50, verbose_name='Olay Tipi')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Veri')),
+                ('status', models.CharField(choices=[('pending', 'Yayın Bekliyor'), ('published', 'Yayınlandı')], default='pending', max_length=20, verbose_name='Durum')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Yayın Denemesi')),
+                ('last_error', models.TextField(blank=True, verbose_name='Son Hata')),
+                ('available_at', models.DateTimeField(auto_now_add=True, help_text='Başarısız yayından sonra bir sonraki deneme zamanı', verbose_name='Yayınlanabilir Tarih')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('published_at', models.DateTimeField(blank=True, null=True, verbose_name='Yayın Tarihi')),
+                ('consumed_at', models.DateTimeField(blank=True, null=True, verbose_name='İşlenme Tarihi')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox_events', to='orders.order', verbose_name='Sipariş')),
+            ],
+            options={
+                'verbose_name': 'Sipariş Olayı',
+                'verbose_name_plural': 'Sipariş Olayları',
+                'indexes': [models.Index(fields=['status', 'available_at'], name='orders_orde_status_9b1e3d_idx')],
+            },
+        ),
+    ]
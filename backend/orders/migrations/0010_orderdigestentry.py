@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_notification_digest'),
+        ('orders', '0009_orderoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderDigestEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='digest_entry', to='orders.order', verbose_name='Sipariş')),
+                ('wholesaler', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_digest_entries', to='companies.company', verbose_name='Toptancı')),
+            ],
+            options={
+                'verbose_name': 'Özet Bildirim Kaydı',
+                'verbose_name_plural': 'Özet Bildirim Kayıtları',
+                'indexes': [models.Index(fields=['wholesaler', 'created_at'], name='orders_orde_wholesa_8d8404_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_notification_digest'),
+        ('orders', '0010_orderdigestentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='stale_flagged_at',
+            field=models.DateTimeField(blank=True, help_text='Uzun süredir bekleyen sipariş olarak işaretlendiği tarih', null=True, verbose_name='Gecikme İşareti'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'order_date'], name='orders_orde_status_389324_idx'),
+        ),
+    ]
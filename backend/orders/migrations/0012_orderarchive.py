@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# PostgreSQL: order_date'e göre aylık RANGE bölümlü tablo. Bölüm anahtarı
+# birincil anahtarda yer almak zorunda olduğundan PK (order_id, order_date)'dir.
+# Aylık bölümler create_order_partitions komutuyla eklenir; aralığı olmayan
+# satırlar DEFAULT bölüme düşer.
+POSTGRES_ARCHIVE_DDL = [
+    """
+    CREATE TABLE orders_orderarchive (
+        order_id bigint NOT NULL,
+        order_number varchar(50) NOT NULL,
+        retailer_id bigint NOT NULL
+            REFERENCES companies_company (id) DEFERRABLE INITIALLY DEFERRED,
+        wholesaler_id bigint NOT NULL
+            REFERENCES companies_company (id) DEFERRABLE INITIALLY DEFERRED,
+        status varchar(20) NOT NULL,
+        order_date timestamp with time zone NOT NULL,
+        total_amount numeric(12, 2) NOT NULL,
+        currency varchar(3) NOT NULL,
+        data jsonb NOT NULL,
+        history jsonb NOT NULL,
+        archived_at timestamp with time zone NOT NULL,
+        PRIMARY KEY (order_id, order_date)
+    ) PARTITION BY RANGE (order_date)
+    """,
+    "ALTER TABLE orders_orderarchive ALTER COLUMN data SET COMPRESSION lz4",
+    "ALTER TABLE orders_orderarchive ALTER COLUMN history SET COMPRESSION lz4",
+    "CREATE TABLE orders_orderarchive_default PARTITION OF orders_orderarchive DEFAULT",
+    "CREATE INDEX orders_orde_retaile_af8058_idx ON orders_orderarchive (retailer_id, order_date)",
+    "CREATE INDEX orders_orde_wholesa_f1d409_idx ON orders_orderarchive (wholesaler_id, order_date)",
+    "CREATE INDEX orders_orde_order_n_c5662e_idx ON orders_orderarchive (order_number)",
+]
+
+
+def create_archive_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for statement in POSTGRES_ARCHIVE_DDL:
+            schema_editor.execute(statement)
+    else:
+        schema_editor.create_model(apps.get_model('orders', 'OrderArchive'))
+
+
+def drop_archive_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        # Bölümler ana tabloyla birlikte silinir
+        schema_editor.execute("DROP TABLE IF EXISTS orders_orderarchive CASCADE")
+    else:
+        schema_editor.delete_model(apps.get_model('orders', 'OrderArchive'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_notification_digest'),
+        ('orders', '0011_order_stale_flagged_at'),
+    ]
+
+    operations = [
+        # Model durumu; tablo aşağıda veritabanına göre oluşturulur
+        migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.CreateModel(
+                name='OrderArchive',
+                fields=[
+                    ('order_id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='Sipariş ID')),
+                    ('order_number', models.CharField(max_length=50, verbose_name='Sipariş Numarası')),
+                    ('status', models.CharField(choices=[('draft', 'Taslak'), ('pending', 'Beklemede'), ('confirmed', 'Onaylandı'), ('processing', 'İşleniyor'), ('shipped', 'Kargoya Verildi'), ('delivered', 'Teslim Edildi'), ('canceled', 'İptal Edildi'), ('rejected', 'Reddedildi')], max_length=20, verbose_name='Sipariş Durumu')),
+                    ('order_date', models.DateTimeField(verbose_name='Sipariş Tarihi')),
+                    ('total_amount', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Toplam Tutar')),
+                    ('currency', models.CharField(default='TRY', max_length=3, verbose_name='Para Birimi')),
+                    ('data', models.JSONField(help_text='Arşivleme anındaki OrderSerializer çıktısı', verbose_name='Sipariş Verisi')),
+                    ('history', models.JSONField(default=list, verbose_name='Durum Geçmişi')),
+                    ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Arşivlenme Tarihi')),
+                    ('retailer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders_as_retailer', to='companies.company', verbose_name='Perakendeci')),
+                    ('wholesaler', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders_as_wholesaler', to='companies.company', verbose_name='Toptancı')),
+                ],
+                options={
+                    'verbose_name': 'Arşivlenmiş Sipariş',
+                    'verbose_name_plural': 'Arşivlenmiş Siparişler',
+                    'indexes': [models.Index(fields=['retailer', 'order_date'], name='orders_orde_retaile_af8058_idx'), models.Index(fields=['wholesaler', 'order_date'], name='orders_orde_wholesa_f1d409_idx'), models.Index(fields=['order_number'], name='orders_orde_order_n_c5662e_idx')],
+                },
+            ),
+        ]),
+        migrations.RunPython(create_archive_table, drop_archive_table),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0012_orderarchive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderoutbox',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, help_text='Tüketicinin olayı işlemeye başladığı an (süreli kilit)', null=True, verbose_name='Alınma Tarihi'),
+        ),
+    ]
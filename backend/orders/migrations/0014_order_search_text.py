@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0013_orderoutbox_claimed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Sipariş numarası, perakendeci/toptancı adı ve notların normalize edilmiş hali', verbose_name='Arama Metni'),
+        ),
+    ]
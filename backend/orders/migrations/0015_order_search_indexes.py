@@ -0,0 +1,47 @@
+from django.db import migrations
+
+from core.db import postgres_only_sql
+from core.search import build_search_text
+
+
+def backfill_search_text(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+
+    batch = []
+    fields = ['id', 'order_number', 'notes', 'retailer__name', 'wholesaler__name']
+    orders = Order.objects.select_related('retailer', 'wholesaler').only(*fields)
+    for order in orders.iterator(chunk_size=1000):
+        order.search_text = build_search_text(
+            order.order_number, order.retailer.name, order.wholesaler.name, order.notes
+        )
+        batch.append(order)
+        if len(batch) >= 1000:
+            Order.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        Order.objects.bulk_update(batch, ['search_text'])
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY transaction içinde çalışamaz
+    atomic = False
+
+    dependencies = [
+        ('orders', '0014_order_search_text'),
+        ('products', '0005_search_indexes'),  # pg_trgm eklentisi
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        postgres_only_sql(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS orders_order_search_text_trgm "
+            "ON orders_order USING gin (search_text gin_trgm_ops)",
+            "DROP INDEX CONCURRENTLY IF EXISTS orders_order_search_text_trgm",
+        ),
+        # Sipariş numarası artık search_text üzerinden aranıyor
+        postgres_only_sql(
+            "DROP INDEX CONCURRENTLY IF EXISTS orders_order_number_trgm",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS orders_order_number_trgm "
+            "ON orders_order USING gin ((UPPER(order_number::text)) gin_trgm_ops)",
+        ),
+    ]
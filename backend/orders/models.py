@@ -5,6 +5,8 @@ from django.core.validators import MinValueValidator
 from decimal import Decimal
 import uuid
 
+from core.search import build_search_text
+
 
 class Order(models.Model):
     """
@@ -119,6 +121,18 @@ class Order(models.Model):
         default='TRY'
     )
     
+    # Kalem sayaçları (denormalize; OrderItem değişikliklerinde senkronlanır)
+    total_quantity = models.PositiveIntegerField(
+        _('Toplam Adet'),
+        default=0,
+        help_text=_('Sipariş kalemlerindeki toplam ürün adedi')
+    )
+    line_count = models.PositiveIntegerField(
+        _('Kalem Sayısı'),
+        default=0,
+        help_text=_('Farklı ürün (kalem) sayısı')
+    )
+    
     # Tyrex komisyonu
     tyrex_commission_rate = models.DecimalField(
         _('Tyrex Komisyon Oranı (%)'),
@@ -176,6 +190,21 @@ class Order(models.Model):
         null=True,
         help_text=_('Sadece sistem kullanıcıları tarafından görülür')
     )
+    stale_flagged_at = models.DateTimeField(
+        _('Gecikme İşareti'),
+        blank=True,
+        null=True,
+        help_text=_('Uzun süredir bekleyen sipariş olarak işaretlendiği tarih')
+    )
+    
+    # Arama (core.search) - save() ile güncellenir
+    search_text = models.TextField(
+        _('Arama Metni'),
+        blank=True,
+        default='',
+        editable=False,
+        help_text=_('Sipariş numarası, perakendeci/toptancı adı ve notların normalize edilmiş hali')
+    )
     
     # Tarihler
     order_date = models.DateTimeField(
@@ -207,6 +236,9 @@ class Order(models.Model):
     created_at = models.DateTimeField(_('Oluşturulma Tarihi'), auto_now_add=True)
     updated_at = models.DateTimeField(_('Güncellenme Tarihi'), auto_now=True)
     
+    SEARCH_FIELDS = ('order_number', 'notes')
+    SEARCH_RELATED = ('retailer', 'wholesaler')
+    
     class Meta:
         verbose_name = _('Sipariş')
         verbose_name_plural = _('Siparişler')
@@ -217,18 +249,32 @@ class Order(models.Model):
             models.Index(fields=['wholesaler', 'status']),
             models.Index(fields=['order_date']),
             models.Index(fields=['status', 'payment_status']),
+            models.Index(fields=['status', 'order_date']),
+            # Keyset sayfalaması (-created_at, -id)
+            models.Index(fields=['retailer', '-created_at', '-id']),
+            models.Index(fields=['wholesaler', '-created_at', '-id']),
         ]
     
     def __str__(self):
         return f"Sipariş #{self.order_number} - {self.retailer.name} → {self.wholesaler.name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Rollup farkını hesaplamak için yüklenen durum
+        from .rollups import rollup_state
+        instance._rollup_state = rollup_state(instance)
+        return instance
+    
     def save(self, *args, **kwargs):
-        """Sipariş kaydederken otomatik hesaplamalar"""
-        # Sipariş numarası oluştur
+        """
+        Sipariş kaydederken otomatik hesaplamalar
+        Durum/tutar değişiklikleri OrderDailyStats'a aynı transaction içinde yansır.
+        """
+        # Sipariş numarası oluştur (sequence tabanlı, çakışmasız)
         if not self.order_number:
-            from django.utils import timezone
-            timestamp = timezone.now().strftime('%Y%m%d%H%M%S')
-            self.order_number = f"ORD-{timestamp}-{self.retailer.id}"
+            from .numbering import next_order_number
+            self.order_number = next_order_number()
         
         # Order date'i set et (eğer yoksa)
         if not self.order_date:
@@ -254,15 +300,60 @@ class Order(models.Model):
             from datetime import timedelta
             self.due_date = self.order_date + timedelta(days=self.payment_terms_days)
         
-        super().save(*args, **kwargs)
+        # Arama metni
+        update_fields = kwargs.get('update_fields')
+        search_fields = {*self.SEARCH_FIELDS, *self.SEARCH_RELATED}
+        if update_fields is None or set(update_fields) & search_fields:
+            self.search_text = self.build_search_text()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'search_text'}
+        
+        from django.db import transaction
+        from .rollups import record_order_change, rollup_state
+        
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Veritabanından yüklenmemiş (elle oluşturulmuş) nesnelerde önceki durum bilinmez
+            if adding or hasattr(self, '_rollup_state'):
+                new_state = rollup_state(self)
+                record_order_change(None if adding else self._rollup_state, new_state)
+                self._rollup_state = new_state
+    
+    def build_search_text(self):
+        return build_search_text(
+            self.order_number, self.retailer.name, self.wholesaler.name, self.notes
+        )
     
     def get_total_items(self):
-        """Toplam ürün adeti"""
-        return sum(item.quantity for item in self.items.all())
+        """Toplam ürün adeti (denormalize sayaç)"""
+        return self.total_quantity
     
     def get_total_unique_products(self):
-        """Farklı ürün sayısı"""
-        return self.items.count()
+        """Farklı ürün sayısı (denormalize sayaç)"""
+        return self.line_count
+    
+    @classmethod
+    def sync_item_counters(cls, queryset=None):
+        """
+        total_quantity / line_count sayaçlarını kalemlerden tek UPDATE ile yeniden hesaplar
+        Dönüş: güncellenen sipariş sayısı
+        """
+        from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+        from django.db.models.functions import Coalesce
+        
+        items = OrderItem.objects.filter(order_id=OuterRef('pk')).order_by().values('order_id')
+        queryset = cls.objects.all() if queryset is None else queryset
+        return queryset.update(
+            total_quantity=Coalesce(
+                Subquery(items.annotate(total=Sum('quantity')).values('total'), output_field=IntegerField()),
+                0
+            ),
+            line_count=Coalesce(
+                Subquery(items.annotate(count=Count('id')).values('count'), output_field=IntegerField()),
+                0
+            )
+        )
     
     def can_be_canceled(self):
         """İptal edilebilir mi?"""
@@ -400,6 +491,14 @@ class OrderItem(models.Model):
     
     def save(self, *args, **kwargs):
         """Sipariş kalemi kaydederken otomatik hesaplamalar"""
+        self.fill_computed_fields()
+        super().save(*args, **kwargs)
+    
+    def fill_computed_fields(self):
+        """
+        Ürün snapshot'ı ve toplam fiyatı hesaplar
+        bulk_create save() çağırmadığı için toplu oluşturmadan önce çağrılmalıdır.
+        """
         # Ürün bilgilerini snapshot olarak kaydet
         if self.product:
             self.product_name = self.product.name
@@ -411,8 +510,6 @@ class OrderItem(models.Model):
             self.total_price = (
                 (self.quantity * self.unit_price) - self.discount_amount
             ).quantize(Decimal('0.01'))
-        
-        super().save(*args, **kwargs)
     
     def get_discount_percentage_calculated(self):
         """Gerçek indirim yüzdesini hesapla"""
@@ -485,4 +582,197 @@ class OrderStatusHistory(models.Model):
         ordering = ['-changed_at']
     
     def __str__(self):
-        return f"{self.order.order_number} - {self.old_status} → {self.new_status}"
\ No newline at end of file
+        return f"{self.order.order_number} - {self.old_status} → {self.new_status}"
+
+class OrderDailyStats(models.Model):
+    """
+    Sipariş rollup tablosu - şirket, rol, karşı taraf, gün ve durum başına
+
+    Her sipariş iki satıra yansır: perakendecinin 'retailer' satırı ve
+    toptancının 'wholesaler' satırı. Order.save() ve silme sinyali satırları
+    aynı transaction içinde günceller (orders.rollups); toplu update() yapan
+    kod yolları rollups.record_order_changes() çağırmalıdır.
+    Özet ve istatistik uç noktaları sipariş tablosu yerine bu tabloyu okur.
+    """
+    ROLE_CHOICES = [
+        ('retailer', _('Perakendeci')),
+        ('wholesaler', _('Toptancı')),
+    ]
+    
+    company = models.ForeignKey(
+        'companies.Company',
+        on_delete=models.CASCADE,
+        related_name='order_daily_stats',
+        verbose_name=_('Şirket')
+    )
+    role = models.CharField(_('Rol'), max_length=20, choices=ROLE_CHOICES)
+    counterparty = models.ForeignKey(
+        'companies.Company',
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('Karşı Taraf')
+    )
+    date = models.DateField(_('Gün'))
+    status = models.CharField(_('Sipariş Durumu'), max_length=20, choices=Order.STATUS_CHOICES)
+    
+    # Ortalama = total_amount / order_count
+    order_count = models.IntegerField(_('Sipariş Sayısı'), default=0)
+    total_amount = models.DecimalField(
+        _('Toplam Tutar'),
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal('0.00')
+    )
+    
+    class Meta:
+        verbose_name = _('Günlük Sipariş İstatistiği')
+        verbose_name_plural = _('Günlük Sipariş İstatistikleri')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['company', 'role', 'counterparty', 'date', 'status'],
+                name='orders_daily_stats_unique'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['company', 'role', 'date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.company_id}/{self.role} {self.date} {self.status}: {self.order_count}"
+
+
+class OrderOutbox(models.Model):
+    """
+    Sipariş olayları giden kutusu (transactional outbox)
+
+    Olay, siparişle aynı transaction içinde yazılır; commit edilmeyen sipariş
+    için olay da oluşmaz. Relay (orders.outbox.relay_outbox) commit edilmiş
+    olayları toplu olarak Celery'ye yayınlar. Teslimat en az bir kezdir;
+    tüketici olayı claimed_at ile süreli kilitler, iş bitince consumed_at
+    doldurulur. Tamamlanmış olayın tekrarları elenir.
+    """
+    EVENT_CHOICES = [
+        ('order_created', _('Sipariş Oluşturuldu')),
+    ]
+    
+    STATUS_CHOICES = [
+        ('pending', _('Yayın Bekliyor')),
+        ('published', _('Yayınlandı')),
+    ]
+    
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.CASCADE,
+        related_name='outbox_events',
+        verbose_name=_('Sipariş')
+    )
+    event_type = models.CharField(_('Olay Tipi'), max_length=50, choices=EVENT_CHOICES)
+    payload = models.JSONField(_('Veri'), default=dict, blank=True)
+    status = models.CharField(_('Durum'), max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(_('Yayın Denemesi'), default=0)
+    last_error = models.TextField(_('Son Hata'), blank=True)
+    available_at = models.DateTimeField(
+        _('Yayınlanabilir Tarih'),
+        auto_now_add=True,
+        help_text=_('Başarısız yayından sonra bir sonraki deneme zamanı')
+    )
+    created_at = models.DateTimeField(_('Oluşturulma Tarihi'), auto_now_add=True)
+    published_at = models.DateTimeField(_('Yayın Tarihi'), null=True, blank=True)
+    claimed_at = models.DateTimeField(
+        _('Alınma Tarihi'),
+        null=True,
+        blank=True,
+        help_text=_('Tüketicinin olayı işlemeye başladığı an (süreli kilit)')
+    )
+    consumed_at = models.DateTimeField(_('İşlenme Tarihi'), null=True, blank=True)
+    
+    class Meta:
+        verbose_name = _('Sipariş Olayı')
+        verbose_name_plural = _('Sipariş Olayları')
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_type} #{self.order_id} ({self.status})"
+
+
+class OrderDigestEntry(models.Model):
+    """
+    Toptancı özet bildirimi kuyruğu
+
+    Toplu bildirim penceresi açık toptancıların siparişleri burada bekler;
+    özet gönderilirken satırlar silinerek alınır (orders.tasks.send_wholesaler_digest).
+    """
+    order = models.OneToOneField(
+        Order,
+        on_delete=models.CASCADE,
+        related_name='digest_entry',
+        verbose_name=_('Sipariş')
+    )
+    wholesaler = models.ForeignKey(
+        'companies.Company',
+        on_delete=models.CASCADE,
+        related_name='order_digest_entries',
+        verbose_name=_('Toptancı')
+    )
+    created_at = models.DateTimeField(_('Oluşturulma Tarihi'), auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('Özet Bildirim Kaydı')
+        verbose_name_plural = _('Özet Bildirim Kayıtları')
+        indexes = [
+            models.Index(fields=['wholesaler', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.wholesaler_id}: {self.order_id}"
+
+
+class OrderArchive(models.Model):
+    """
+    Soğuk sipariş arşivi
+
+    Teslim edilmiş/iptal edilmiş ve ORDER_ARCHIVE_AFTER_MONTHS aydan eski
+    siparişler (kalemleri ve durum geçmişiyle) canlı tablolardan buraya
+    taşınır (orders.archive). data alanı OrderSerializer çıktısını aynen
+    saklar; /orders/{id}/ arşivlenmiş siparişi de döndürür.
+
+    PostgreSQL'de tablo order_date'e göre aylık bölümlenmiştir (RANGE
+    partition); birincil anahtar (order_id, order_date) olur ve JSON
+    sütunları lz4 ile sıkıştırılır. Bölümler create_order_partitions
+    komutuyla oluşturulur.
+    """
+    order_id = models.BigIntegerField(_('Sipariş ID'), primary_key=True)
+    order_number = models.CharField(_('Sipariş Numarası'), max_length=50)
+    retailer = models.ForeignKey(
+        'companies.Company',
+        on_delete=models.CASCADE,
+        related_name='archived_orders_as_retailer',
+        verbose_name=_('Perakendeci')
+    )
+    wholesaler = models.ForeignKey(
+        'companies.Company',
+        on_delete=models.CASCADE,
+        related_name='archived_orders_as_wholesaler',
+        verbose_name=_('Toptancı')
+    )
+    status = models.CharField(_('Sipariş Durumu'), max_length=20, choices=Order.STATUS_CHOICES)
+    order_date = models.DateTimeField(_('Sipariş Tarihi'))
+    total_amount = models.DecimalField(_('Toplam Tutar'), max_digits=12, decimal_places=2)
+    currency = models.CharField(_('Para Birimi'), max_length=3, default='TRY')
+    data = models.JSONField(_('Sipariş Verisi'), help_text=_('Arşivleme anındaki OrderSerializer çıktısı'))
+    history = models.JSONField(_('Durum Geçmişi'), default=list)
+    archived_at = models.DateTimeField(_('Arşivlenme Tarihi'), auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('Arşivlenmiş Sipariş')
+        verbose_name_plural = _('Arşivlenmiş Siparişler')
+        indexes = [
+            models.Index(fields=['retailer', 'order_date']),
+            models.Index(fields=['wholesaler', 'order_date']),
+            models.Index(fields=['order_number']),
+        ]
+    
+    def __str__(self):
+        return f"Arşiv #{self.order_number}"
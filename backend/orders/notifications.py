@@ -0,0 +1,686 @@
+# backend/orders/notifications.py
+"""
+Toptancı sipariş bildirimleri (email, API, SMS)
+
+Kanallar bir iş parçacığı havuzunda eşzamanlı gönderilir; yavaş bir kanal
+diğerlerini bekletmez. Her kanal kendi başına değerlendirilir:
+
+- Başarısız kanal sadece kendisi için yeniden denenir
+  (tasks.retry_order_notification); başarılı kanallar tekrar gönderilmez.
+- Toptancı + kanal başına devre kesici: art arda NOTIFICATION_CIRCUIT_THRESHOLD
+  hata olursa kanal NOTIFICATION_CIRCUIT_COOLDOWN saniye denenmez.
+  Durum Django cache'inde tutulur (tüm worker'lar paylaşır).
+
+HTTP oturumu (requests.Session) ve SMTP bağlantısı worker işlemi içinde
+tekrar kullanılır; her bildirimde yeni TCP/TLS bağlantısı açılmaz.
+Kanal fonksiyonları veritabanına erişmez; sipariş ve ilişkileri çağıran
+tarafından önceden yüklenir.
+
+Toptancı notification_digest_window tanımladıysa siparişler tek tek değil,
+pencere dolunca (veya notification_digest_max_orders sipariş birikince)
+dispatch_digest() ile kanal başına tek bildirimde gönderilir.
+"""
+import logging
+import os
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+CHANNELS = ('email', 'api', 'sms')
+
+_pool_lock = threading.Lock()
+_pool = {'pid': None, 'executor': None, 'session': None}
+_local = threading.local()
+
+
+def _get_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _executor():
+    """İşlem başına iş parçacığı havuzu (fork sonrası yeniden oluşturulur)"""
+    pid = os.getpid()
+    with _pool_lock:
+        if _pool['pid'] != pid:
+            _pool.update(
+                pid=pid,
+                executor=ThreadPoolExecutor(
+                    max_workers=len(CHANNELS),
+                    thread_name_prefix='order-notify'
+                ),
+                session=None
+            )
+        return _pool['executor']
+
+
+def get_http_session():
+    """İşlem başına paylaşılan requests.Session (bağlantı havuzu)"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    _executor()
+    with _pool_lock:
+        if _pool['session'] is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=_get_setting('NOTIFICATION_HTTP_POOL_SIZE', 20)
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers['User-Agent'] = 'Tyrex-B2B/1.0'
+            _pool['session'] = session
+        return _pool['session']
+
+
+def get_mail_connection():
+    """
+    İş parçacığı başına açık tutulan SMTP bağlantısı
+    SMTP bağlantıları iş parçacıkları arasında paylaşılamaz. Bağlantı
+    NOTIFICATION_SMTP_IDLE_CHECK saniyeden uzun boşta kaldıysa NOOP ile
+    denetlenir; sunucu kapatmışsa yeniden açılır.
+    """
+    connection = getattr(_local, 'mail_connection', None)
+    if connection is not None and getattr(_local, 'mail_pid', None) != os.getpid():
+        connection = None
+    if connection is not None and not _mail_connection_alive(connection):
+        _reset_mail_connection()
+        connection = None
+    if connection is None:
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        _local.mail_connection = connection
+        _local.mail_pid = os.getpid()
+    _local.mail_used_at = time.monotonic()
+    return connection
+
+
+def _mail_connection_alive(connection):
+    idle = time.monotonic() - getattr(_local, 'mail_used_at', 0)
+    if idle < _get_setting('NOTIFICATION_SMTP_IDLE_CHECK', 30):
+        return True
+    smtp = getattr(connection, 'connection', None)
+    if smtp is None:
+        # SMTP dışı backend'ler (locmem, console) veya kapalı bağlantı
+        return True
+    try:
+        return smtp.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+
+def _reset_mail_connection():
+    connection = getattr(_local, 'mail_connection', None)
+    _local.mail_connection = None
+    if connection is not None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+class CircuitBreaker:
+    """Toptancı + kanal başına hata sayacı (Django cache)"""
+
+    def __init__(self, channel, wholesaler_id):
+        self.failures_key = f'notify:cb:failures:{channel}:{wholesaler_id}'
+        self.open_key = f'notify:cb:open:{channel}:{wholesaler_id}'
+
+    @property
+    def threshold(self):
+        return _get_setting('NOTIFICATION_CIRCUIT_THRESHOLD', 5)
+
+    @property
+    def cooldown(self):
+        return _get_setting('NOTIFICATION_CIRCUIT_COOLDOWN', 5 * 60)
+
+    def is_open(self):
+        try:
+            return cache.get(self.open_key) is not None
+        except Exception as e:
+            logger.warning(f"Circuit breaker read failed: {e}")
+            return False
+
+    def record_success(self):
+        try:
+            cache.delete_many([self.failures_key, self.open_key])
+        except Exception as e:
+            logger.warning(f"Circuit breaker reset failed: {e}")
+
+    def record_failure(self):
+        try:
+            cache.add(self.failures_key, 0, timeout=self.cooldown)
+            failures = cache.incr(self.failures_key)
+            if failures >= self.threshold:
+                cache.set(self.open_key, timezone.now().isoformat(), timeout=self.cooldown)
+                cache.delete(self.failures_key)
+        except Exception as e:
+            logger.warning(f"Circuit breaker update failed: {e}")
+
+
+def build_order_details(order):
+    """
+    Bildirimlerde kullanılan sipariş özeti
+    order: retailer, wholesaler, retailer_user ve items__product/items__warehouse yüklenmiş olmalı
+    """
+    return {
+        'order_number': order.order_number,
+        'retailer_name': order.retailer.name,
+        'retailer_email': order.retailer.email,
+        'retailer_phone': order.retailer.phone,
+        'retailer_user': f"{order.retailer_user.first_name} {order.retailer_user.last_name}",
+        'total_amount': str(order.total_amount),
+        'currency': order.currency,
+        'order_date': order.order_date.strftime('%d.%m.%Y %H:%M'),
+        'payment_terms_days': order.payment_terms_days,
+        'delivery_address': order.delivery_address,
+        'delivery_contact': order.delivery_contact,
+        'delivery_phone': order.delivery_phone,
+        'notes': order.notes,
+        'items': [
+            {
+                'product_name': item.product_name,
+                'product_sku': item.product_sku,
+                'product_brand': item.product_brand,
+                'quantity': item.quantity,
+                'unit_price': str(item.unit_price),
+                'total_price': str(item.total_price),
+                'warehouse_name': item.warehouse.name
+            }
+            for item in order.items.all()
+        ]
+    }
+
+
+def render_order_html(order_details):
+    """Tek siparişin email HTML bölümleri (bilgiler, perakendeci, teslimat, kalemler, notlar)"""
+    html = f"""
+            <h3>Sipariş Bilgileri</h3>
+            <ul>
+                <li><strong>Sipariş No:</strong> {order_details['order_number']}</li>
+                <li><strong>Tarih:</strong> {order_details['order_date']}</li>
+                <li><strong>Toplam:</strong> {order_details['total_amount']} {order_details['currency']}</li>
+                <li><strong>Ödeme Vadesi:</strong> {order_details['payment_terms_days']} gün</li>
+            </ul>
+
+            <h3>Perakendeci Bilgileri</h3>
+            <ul>
+                <li><strong>Şirket:</strong> {order_details['retailer_name']}</li>
+                <li><strong>Email:</strong> {order_details['retailer_email']}</li>
+                <li><strong>Telefon:</strong> {order_details['retailer_phone']}</li>
+                <li><strong>Sipariş Veren:</strong> {order_details['retailer_user']}</li>
+            </ul>
+
+            <h3>Teslimat Bilgileri</h3>
+            <ul>
+                <li><strong>Adres:</strong> {order_details['delivery_address']}</li>
+                <li><strong>İletişim:</strong> {order_details['delivery_contact']}</li>
+                <li><strong>Telefon:</strong> {order_details['delivery_phone']}</li>
+            </ul>
+
+            <h3>Sipariş Kalemleri</h3>
+            <table border="1" style="border-collapse: collapse; width: 100%;">
+                <tr>
+                    <th>Ürün</th>
+                    <th>SKU</th>
+                    <th>Marka</th>
+                    <th>Miktar</th>
+                    <th>Birim Fiyat</th>
+                    <th>Toplam</th>
+                    <th>Depo</th>
+                </tr>
+    """
+
+    for item in order_details['items']:
+        html += f"""
+                <tr>
+                    <td>{item['product_name']}</td>
+                    <td>{item['product_sku']}</td>
+                    <td>{item['product_brand']}</td>
+                    <td>{item['quantity']}</td>
+                    <td>{item['unit_price']} TRY</td>
+                    <td>{item['total_price']} TRY</td>
+                    <td>{item['warehouse_name']}</td>
+                </tr>
+        """
+
+    html += f"""
+            </table>
+
+            <h3>Notlar</h3>
+            <p>{order_details['notes'] or 'Not yok'}</p>
+    """
+    return html
+
+
+def _wrap_html(title, body):
+    return f"""
+        <html>
+        <body>
+            <h2>{title}</h2>
+            {body}
+            <hr>
+            <p><small>Bu email Tyrex B2B Pazaryeri sistemi tarafından otomatik olarak gönderilmiştir.</small></p>
+        </body>
+        </html>
+    """
+
+
+def _send_email(subject, text, html, recipient):
+    """
+    Açık tutulan SMTP bağlantısı üzerinden gönderir
+    Sunucu boştaki bağlantıyı kapatmışsa (SMTPServerDisconnected) yeni bir
+    bağlantıyla bir kez daha denenir; hata sadece ikinci denemede raporlanır.
+    """
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=text,  # Plain text fallback
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[recipient],
+        connection=get_mail_connection()
+    )
+    message.attach_alternative(html, 'text/html')
+    try:
+        message.send(fail_silently=False)
+    except smtplib.SMTPServerDisconnected:
+        logger.info("SMTP connection was closed by the server, reconnecting")
+        _reset_mail_connection()
+        message.connection = get_mail_connection()
+        try:
+            message.send(fail_silently=False)
+        except Exception:
+            _reset_mail_connection()
+            raise
+    except Exception:
+        # Bağlantı bozulmuş olabilir; bir sonraki gönderim yeniden bağlanır
+        _reset_mail_connection()
+        raise
+
+
+def send_order_email_notification(order, order_details):
+    """
+    Email bildirimi gönder
+    """
+    try:
+        _send_email(
+            subject=f"Yeni Sipariş: {order.order_number} - {order.retailer.name}",
+            text=f"Yeni sipariş: {order.order_number}",
+            html=_wrap_html('Yeni Sipariş Bildirimi', render_order_html(order_details)),
+            recipient=order.wholesaler.email
+        )
+
+        return {
+            'success': True,
+            'method': 'email',
+            'recipient': order.wholesaler.email
+        }
+
+    except Exception as e:
+        logger.error(f"Email notification failed: {str(e)}")
+        return {
+            'success': False,
+            'method': 'email',
+            'error': str(e)
+        }
+
+
+def wholesaler_api_endpoint(wholesaler):
+    # Toptancının API endpoint'ini al (şimdilik mock)
+    # Gerçek uygulamada bu bilgi Company modelinde tutulabilir
+    return f"https://api.{wholesaler.name.lower().replace(' ', '')}.com/orders/incoming"
+
+
+def build_api_payload(order_id, order_details):
+    """Tek siparişin API payload'ı"""
+    return {
+        'source': 'tyrex_b2b',
+        'source_order_id': order_id,
+        'order_number': order_details['order_number'],
+        'retailer': {
+            'name': order_details['retailer_name'],
+            'email': order_details['retailer_email'],
+            'phone': order_details['retailer_phone'],
+            'contact_person': order_details['retailer_user']
+        },
+        'order_info': {
+            'total_amount': order_details['total_amount'],
+            'currency': order_details['currency'],
+            'payment_terms_days': order_details['payment_terms_days'],
+            'order_date': order_details['order_date'],
+            'notes': order_details['notes']
+        },
+        'delivery': {
+            'address': order_details['delivery_address'],
+            'contact': order_details['delivery_contact'],
+            'phone': order_details['delivery_phone']
+        },
+        'items': order_details['items']
+    }
+
+
+def _post_api(endpoint, wholesaler, payload, idempotency_key):
+    """Toptancı API'sine POST (havuzdaki bağlantı tekrar kullanılır)"""
+    headers = {
+        'Content-Type': 'application/json',
+        'Authorization': f'Bearer {get_wholesaler_api_token(wholesaler)}',
+        # Aynı bildirimin tekrar gönderimi toptancıda çift kayıt oluşturmasın
+        'Idempotency-Key': idempotency_key,
+    }
+    response = get_http_session().post(
+        endpoint,
+        json=payload,
+        headers=headers,
+        timeout=(
+            _get_setting('NOTIFICATION_CONNECT_TIMEOUT', 3),
+            _get_setting('NOTIFICATION_READ_TIMEOUT', 10)
+        )
+    )
+    if response.status_code == 200:
+        return response.json()
+    raise Exception(f"API Error {response.status_code}: {response.text[:500]}")
+
+
+def _api_enabled():
+    # Şimdilik mock response (gerçek API çağrısı ayarla açılır)
+    return _get_setting('WHOLESALER_API_NOTIFICATIONS_ENABLED', False)
+
+
+def send_order_api_notification(order, order_details):
+    """
+    Toptancının API'sine sipariş bildirimi gönder
+    """
+    try:
+        api_endpoint = wholesaler_api_endpoint(order.wholesaler)
+
+        if not _api_enabled():
+            # Simüle edilmiş başarılı response
+            response_data = {
+                'success': True,
+                'wholesaler_order_id': f"WHL-{order.id}-{timezone.now().strftime('%Y%m%d%H%M%S')}",
+                'estimated_processing_time': '2-3 iş günü',
+                'contact_person': 'Satış Departmanı',
+                'message': 'Sipariş başarıyla alındı ve işleme alınacak'
+            }
+        else:
+            response_data = _post_api(
+                api_endpoint,
+                order.wholesaler,
+                build_api_payload(order.id, order_details),
+                idempotency_key=f'tyrex-order-{order.id}'
+            )
+
+        return {
+            'success': True,
+            'method': 'api',
+            'endpoint': api_endpoint,
+            'response': response_data
+        }
+
+    except Exception as e:
+        logger.error(f"API notification failed: {str(e)}")
+        return {
+            'success': False,
+            'method': 'api',
+            'error': str(e)
+        }
+
+
+def send_order_sms_notification(order, order_details):
+    """
+    SMS bildirimi gönder
+    """
+    try:
+        # SMS servis sağlayıcısına göre implementasyon
+        # Şimdilik mock implementation
+
+        if not order.wholesaler.phone:
+            return {
+                'success': False,
+                'method': 'sms',
+                'error': 'Toptancı telefon numarası bulunamadı',
+                # Tekrar denemek sonucu değiştirmez
+                'permanent': True
+            }
+
+        message = f"""
+TYREX B2B - Yeni Sipariş
+Sipariş No: {order_details['order_number']}
+Perakendeci: {order_details['retailer_name']}
+Toplam: {order_details['total_amount']} {order_details['currency']}
+Detaylar için email'inizi kontrol edin.
+        """.strip()
+
+        # Mock SMS gönderimi
+        logger.info(f"SMS would be sent to {order.wholesaler.phone}: {message}")
+
+        return {
+            'success': True,
+            'method': 'sms',
+            'recipient': order.wholesaler.phone,
+            'message_length': len(message)
+        }
+
+    except Exception as e:
+        logger.error(f"SMS notification failed: {str(e)}")
+        return {
+            'success': False,
+            'method': 'sms',
+            'error': str(e)
+        }
+
+
+def get_wholesaler_api_token(wholesaler):
+    """
+    Toptancı için API token'ı al
+    Gerçek uygulamada bu bilgi güvenli bir şekilde saklanmalı
+    """
+    # Mock token
+    return f"tyrex_token_{wholesaler.id}_mock"
+
+
+def send_digest_email_notification(wholesaler, orders, details_list):
+    """
+    Özet email bildirimi (birden fazla sipariş tek email)
+    """
+    try:
+        total = sum(Decimal(details['total_amount']) for details in details_list)
+        summary = f"""
+            <p><strong>{len(details_list)}</strong> yeni sipariş, toplam <strong>{total} TRY</strong>.</p>
+        """
+        body = summary + '<hr>'.join(render_order_html(details) for details in details_list)
+        _send_email(
+            subject=f"Yeni Siparişler ({len(details_list)}) - Tyrex B2B",
+            text='Yeni siparişler: ' + ', '.join(details['order_number'] for details in details_list),
+            html=_wrap_html('Sipariş Özeti', body),
+            recipient=wholesaler.email
+        )
+
+        return {
+            'success': True,
+            'method': 'email',
+            'recipient': wholesaler.email,
+            'order_count': len(details_list)
+        }
+
+    except Exception as e:
+        logger.error(f"Digest email notification failed: {str(e)}")
+        return {
+            'success': False,
+            'method': 'email',
+            'error': str(e)
+        }
+
+
+def send_digest_api_notification(wholesaler, orders, details_list):
+    """
+    Toptancının API'sine toplu sipariş bildirimi (tek istek)
+    """
+    try:
+        api_endpoint = wholesaler_api_endpoint(wholesaler) + '/batch'
+        order_ids = [order.id for order in orders]
+
+        if not _api_enabled():
+            # Simüle edilmiş başarılı response
+            stamp = timezone.now().strftime('%Y%m%d%H%M%S')
+            response_data = {
+                'success': True,
+                'orders': [
+                    {'source_order_id': order_id, 'wholesaler_order_id': f"WHL-{order_id}-{stamp}"}
+                    for order_id in order_ids
+                ],
+                'message': 'Siparişler başarıyla alındı ve işleme alınacak'
+            }
+        else:
+            response_data = _post_api(
+                api_endpoint,
+                wholesaler,
+                {
+                    'source': 'tyrex_b2b',
+                    'orders': [
+                        build_api_payload(order.id, details)
+                        for order, details in zip(orders, details_list)
+                    ]
+                },
+                idempotency_key=f"tyrex-orders-{order_ids[0]}-{order_ids[-1]}-{len(order_ids)}"
+            )
+
+        return {
+            'success': True,
+            'method': 'api',
+            'endpoint': api_endpoint,
+            'order_count': len(order_ids),
+            'response': response_data
+        }
+
+    except Exception as e:
+        logger.error(f"Digest API notification failed: {str(e)}")
+        return {
+            'success': False,
+            'method': 'api',
+            'error': str(e)
+        }
+
+
+def send_digest_sms_notification(wholesaler, orders, details_list):
+    """
+    Özet SMS bildirimi
+    """
+    try:
+        if not wholesaler.phone:
+            return {
+                'success': False,
+                'method': 'sms',
+                'error': 'Toptancı telefon numarası bulunamadı',
+                'permanent': True
+            }
+
+        total = sum(Decimal(details['total_amount']) for details in details_list)
+        message = f"""
+TYREX B2B - {len(details_list)} Yeni Sipariş
+Toplam: {total} TRY
+Detaylar için email'inizi kontrol edin.
+        """.strip()
+
+        # Mock SMS gönderimi
+        logger.info(f"SMS would be sent to {wholesaler.phone}: {message}")
+
+        return {
+            'success': True,
+            'method': 'sms',
+            'recipient': wholesaler.phone,
+            'message_length': len(message)
+        }
+
+    except Exception as e:
+        logger.error(f"Digest SMS notification failed: {str(e)}")
+        return {
+            'success': False,
+            'method': 'sms',
+            'error': str(e)
+        }
+
+
+CHANNEL_SENDERS = {
+    'email': send_order_email_notification,
+    'api': send_order_api_notification,
+    'sms': send_order_sms_notification,
+}
+
+DIGEST_SENDERS = {
+    'email': send_digest_email_notification,
+    'api': send_digest_api_notification,
+    'sms': send_digest_sms_notification,
+}
+
+
+def _send_channel(channel, sender, wholesaler_id, args):
+    """Tek kanalı devre kesici kontrolüyle gönderir"""
+    breaker = CircuitBreaker(channel, wholesaler_id)
+    if breaker.is_open():
+        return {
+            'success': False,
+            'method': channel,
+            'error': 'Kanal geçici olarak devre dışı (art arda hata)',
+            'circuit_open': True,
+            'retry_after': breaker.cooldown
+        }
+
+    result = sender(*args)
+    if result['success']:
+        breaker.record_success()
+    elif not result.get('permanent'):
+        breaker.record_failure()
+    return result
+
+
+def _dispatch(senders, wholesaler_id, args, channels):
+    channels = list(channels)
+    if len(channels) == 1:
+        channel = channels[0]
+        return {channel: _send_channel(channel, senders[channel], wholesaler_id, args)}
+
+    executor = _executor()
+    futures = {
+        channel: executor.submit(_send_channel, channel, senders[channel], wholesaler_id, args)
+        for channel in channels
+    }
+
+    results = {}
+    for channel, future in futures.items():
+        try:
+            results[channel] = future.result()
+        except Exception as e:
+            logger.error(f"Notification channel {channel} crashed: {e}")
+            results[channel] = {'success': False, 'method': channel, 'error': str(e)}
+    return results
+
+
+def dispatch(order, order_details, channels=CHANNELS):
+    """
+    Tek siparişin kanallarını eşzamanlı gönderir
+    Dönüş: {kanal: sonuç}
+    """
+    return _dispatch(CHANNEL_SENDERS, order.wholesaler_id, (order, order_details), channels)
+
+
+def dispatch_digest(wholesaler, orders, details_list, channels=CHANNELS):
+    """
+    Birden fazla siparişi kanal başına tek bildirimle gönderir
+    Devre kesici tekil bildirimlerle ortaktır (toptancı + kanal).
+    """
+    return _dispatch(DIGEST_SENDERS, wholesaler.id, (wholesaler, orders, details_list), channels)
+
+
+def needs_retry(result):
+    """Başarısız ve kalıcı olmayan sonuçlar yeniden denenir"""
+    return not result['success'] and not result.get('permanent')
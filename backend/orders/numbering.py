@@ -0,0 +1,75 @@
+# backend/orders/numbering.py
+"""
+Sipariş numarası üretici
+
+Biçim: ORD-YYYYMMDD-NNNNNNNN (ör. ORD-20250114-00012345)
+
+Sayaç PostgreSQL sequence'inden (orders_order_number_seq) gelir. Sequence
+BLOCK_SIZE adım ile artar: her nextval() çağrısı bir işleme BLOCK_SIZE
+numaralık bir aralık ayırır ve numaralar bu aralıktan bellekte dağıtılır.
+Böylece saniyede binlerce numara tek bir satırda kilit beklemeden, yeniden
+deneme gerektirmeden üretilir. Sequence transaction'a bağlı olmadığından
+geri alınan siparişler ve yeniden başlatılan işlemler numara boşluğu bırakır;
+numaralar benzersizdir ama ardışık değildir.
+
+Tarih ön eki numaranın üretildiği günü gösterir; benzersizlik sayaçtan gelir.
+"""
+import os
+import re
+import threading
+
+from django.db import connection
+from django.utils import timezone
+
+
+# 0005_order_number_sequence migration'ındaki INCREMENT BY ile aynı olmalı
+BLOCK_SIZE = 100
+SEQUENCE_NAME = 'orders_order_number_seq'
+NUMBER_WIDTH = 8
+
+_NUMBER_RE = re.compile(r'^ORD-\d{8}-(\d+)$')
+
+_lock = threading.Lock()
+_block = {'pid': None, 'next': 0, 'end': 0}
+
+
+def format_order_number(value, date=None):
+    """Sayaç değerinden sipariş numarası"""
+    date = date or timezone.localdate()
+    return f"ORD-{date:%Y%m%d}-{value:0{NUMBER_WIDTH}d}"
+
+
+def _reserve_block():
+    """Yeni bir numara aralığı ayırır: [başlangıç, başlangıç + BLOCK_SIZE)"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT nextval(%s)", [SEQUENCE_NAME])
+            return cursor.fetchone()[0]
+
+    # Geliştirme/test veritabanları: sequence yok, en büyük mevcut numaradan
+    # devam edilir (tek işlemli kullanım içindir)
+    from .models import Order
+
+    highest = 0
+    for order_number in Order.objects.filter(
+        order_number__regex=r'^ORD-[0-9]{8}-[0-9]+$'
+    ).values_list('order_number', flat=True).iterator():
+        highest = max(highest, int(_NUMBER_RE.match(order_number).group(1)))
+    return max(highest + 1, _block['end'])
+
+
+def next_order_number(date=None):
+    """
+    Sıradaki sipariş numarasını döndürür
+
+    İşlem (process) başına bir aralık önbelleğe alınır; fork sonrası alt
+    işlemler ebeveynin aralığını paylaşmasın diye pid kontrol edilir.
+    """
+    pid = os.getpid()
+    with _lock:
+        if _block['pid'] != pid or _block['next'] >= _block['end']:
+            start = _reserve_block()
+            _block.update(pid=pid, next=start, end=start + BLOCK_SIZE)
+        value = _block['next']
+        _block['next'] += 1
+    return format_order_number(value, date)
@@ -0,0 +1,182 @@
+# backend/orders/outbox.py
+"""
+Sipariş olayları için transactional outbox
+
+İstek yolunda broker'a bağlanılmaz: enqueue() olayı siparişle aynı
+transaction içinde OrderOutbox tablosuna yazar. relay_outbox() commit edilmiş
+bekleyen olayları partiler halinde kilitler (SKIP LOCKED; birden fazla relay
+aynı satırı almaz), tek bir broker bağlantısı üzerinden yayınlar ve
+yayınlananları tek UPDATE ile işaretler.
+
+Teslimat en az bir kezdir: yayın sonrası işaretleme yapılamazsa olay tekrar
+yayınlanır. Tüketici claim() ile olayı süreli olarak kilitler (claimed_at) ve
+iş bitince complete() ile consumed_at alanını doldurur. Görev hata verirse
+release() kilidi bırakır; worker ölürse kilit ORDER_OUTBOX_CLAIM_TIMEOUT sonunda
+düşer. Tamamlanmamış yayınlanmış olaylar relay tarafından yeniden kuyruğa
+alınır (requeue_stranded); sadece tamamlanmış olayın tekrarları atlanır.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OrderOutbox
+
+logger = logging.getLogger(__name__)
+
+
+def _get_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _event_tasks():
+    """Olay tipi -> Celery görevi"""
+    from .tasks import send_order_to_wholesaler
+
+    return {
+        'order_created': send_order_to_wholesaler,
+    }
+
+
+def enqueue(order, event_type, payload=None):
+    """Olayı giden kutusuna yazar (çağıranın transaction'ı içinde)"""
+    return OrderOutbox.objects.create(order=order, event_type=event_type, payload=payload or {})
+
+
+def _claim_timeout():
+    return timedelta(seconds=_get_setting('ORDER_OUTBOX_CLAIM_TIMEOUT', 5 * 60))
+
+
+def claim(event_id):
+    """
+    Tüketici tarafı tekrar eleme (süreli kilit)
+    Olay tamamlanmamış ve başka bir tüketicide (süresi dolmamış) kilitli değilse
+    kilitlenir ve True döner; aksi halde False.
+    """
+    if event_id is None:
+        return True
+    now = timezone.now()
+    return bool(
+        OrderOutbox.objects.filter(pk=event_id, consumed_at__isnull=True).filter(
+            Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - _claim_timeout())
+        ).update(claimed_at=now)
+    )
+
+
+def complete(event_id):
+    """Olayı işlenmiş olarak işaretler; sonraki teslimler atlanır"""
+    if event_id is not None:
+        OrderOutbox.objects.filter(pk=event_id).update(consumed_at=timezone.now())
+
+
+def release(event_id):
+    """Başarısız işlemden sonra kilidi bırakır; olay yeniden teslim edilebilir"""
+    if event_id is not None:
+        OrderOutbox.objects.filter(pk=event_id, consumed_at__isnull=True).update(claimed_at=None)
+
+
+def requeue_stranded():
+    """
+    Yayınlanmış ama kilit süresi içinde tamamlanmamış olayları yeniden yayına alır
+    (görev kaybolduysa veya hata verdiyse). ORDER_OUTBOX_MAX_ATTEMPTS yayından
+    sonra olay bırakılır.
+    Dönüş: yeniden kuyruğa alınan olay sayısı
+    """
+    now = timezone.now()
+    expired = now - _claim_timeout()
+    return OrderOutbox.objects.filter(
+        status='published',
+        consumed_at__isnull=True,
+        published_at__lt=expired,
+        attempts__lt=_get_setting('ORDER_OUTBOX_MAX_ATTEMPTS', 10)
+    ).filter(
+        Q(claimed_at__isnull=True) | Q(claimed_at__lt=expired)
+    ).update(status='pending', available_at=now)
+
+
+def _publish(events):
+    """
+    Olayları tek broker bağlantısıyla yayınlar
+    Dönüş: (yayınlanan id'ler, {id: hata})
+    """
+    from celery import current_app
+
+    tasks = _event_tasks()
+    published, failed = [], {}
+    with current_app.producer_or_acquire() as producer:
+        for event in events:
+            task = tasks.get(event.event_type)
+            if task is None:
+                failed[event.pk] = f'Bilinmeyen olay tipi: {event.event_type}'
+                continue
+            try:
+                task.apply_async(
+                    args=[event.order_id],
+                    kwargs={'event_id': event.pk},
+                    producer=producer
+                )
+            except Exception as e:
+                failed[event.pk] = str(e)
+            else:
+                published.append(event.pk)
+    return published, failed
+
+
+def relay_outbox(batch_size=None):
+    """
+    Bekleyen olayları yayınlar
+    Dönüş: yayınlanan olay sayısı
+    """
+    batch_size = batch_size or _get_setting('ORDER_OUTBOX_BATCH_SIZE', 500)
+    requeued = requeue_stranded()
+    if requeued:
+        logger.warning(f"Requeued {requeued} unconsumed outbox events")
+    total = 0
+    while True:
+        with transaction.atomic():
+            events = list(
+                OrderOutbox.objects.select_for_update(skip_locked=True).filter(
+                    status='pending',
+                    available_at__lte=timezone.now()
+                ).order_by('pk')[:batch_size]
+            )
+            if not events:
+                break
+
+            published, failed = _publish(events)
+
+            now = timezone.now()
+            if published:
+                OrderOutbox.objects.filter(pk__in=published).update(
+                    status='published',
+                    published_at=now,
+                    attempts=F('attempts') + 1,
+                    last_error=''
+                )
+            for pk, error in failed.items():
+                logger.error(f"Outbox event {pk} publish failed: {error}")
+                attempts = next(event.attempts for event in events if event.pk == pk) + 1
+                OrderOutbox.objects.filter(pk=pk).update(
+                    attempts=attempts,
+                    last_error=error[:1000],
+                    available_at=now + timedelta(seconds=min(2 ** attempts, 15 * 60))
+                )
+
+        total += len(published)
+        if failed or len(events) < batch_size:
+            # Broker sorunluysa bu turda daha fazla deneme yapılmaz
+            break
+    return total
+
+
+def prune_outbox(days=None):
+    """İşlenmiş eski olayları siler"""
+    days = _get_setting('ORDER_OUTBOX_RETENTION_DAYS', 7) if days is None else days
+    deleted, _ = OrderOutbox.objects.filter(
+        status='published',
+        published_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    return deleted
@@ -0,0 +1,203 @@
+# backend/orders/rollups.py
+"""
+OrderDailyStats rollup bakımı ve okuma yardımcıları
+
+Bir siparişin rollup durumu (perakendeci, toptancı, gün, durum, tutar)
+değiştiğinde eski satırdan düşülür, yeni satıra eklenir. Artırım
+UPDATE ... SET order_count = order_count + n ile yapılır; satır yoksa
+oluşturulur (eşzamanlı oluşturmada benzersiz kısıt yakalanıp tekrar artırılır).
+"""
+from collections import Counter, namedtuple
+from datetime import date
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from .models import Order, OrderArchive, OrderDailyStats
+
+
+TWO_PLACES = Decimal('0.01')
+
+RollupState = namedtuple('RollupState', [
+    'retailer_id', 'wholesaler_id', 'date', 'status', 'total_amount',
+])
+
+
+def rollup_state(order):
+    """Siparişin rollup'a yansıyan alanları (yüklenmemiş alan varsa None)"""
+    values = order.__dict__
+    if not all(name in values for name in ('retailer_id', 'wholesaler_id', 'status', 'total_amount', 'order_date')):
+        return None
+    if values['order_date'] is None:
+        return None
+    return RollupState(
+        values['retailer_id'],
+        values['wholesaler_id'],
+        timezone.localdate(values['order_date']),
+        values['status'],
+        values['total_amount'] or Decimal('0.00'),
+    )
+
+
+def _row_keys(state):
+    """Bir sipariş durumunun güncellediği iki rollup satırının anahtarları"""
+    yield {
+        'company_id': state.retailer_id, 'role': 'retailer',
+        'counterparty_id': state.wholesaler_id, 'date': state.date, 'status': state.status,
+    }
+    yield {
+        'company_id': state.wholesaler_id, 'role': 'wholesaler',
+        'counterparty_id': state.retailer_id, 'date': state.date, 'status': state.status,
+    }
+
+
+def _apply(key, count, amount):
+    updated = OrderDailyStats.objects.filter(**key).update(
+        order_count=F('order_count') + count,
+        total_amount=F('total_amount') + amount
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            OrderDailyStats.objects.create(**key, order_count=count, total_amount=amount)
+    except IntegrityError:
+        OrderDailyStats.objects.filter(**key).update(
+            order_count=F('order_count') + count,
+            total_amount=F('total_amount') + amount
+        )
+
+
+def record_order_changes(changes):
+    """
+    Rollup'a değişiklikleri uygular
+
+    changes: [(eski RollupState veya None, yeni RollupState veya None), ...]
+    Aynı satıra düşen değişiklikler birleştirilir; satır başına tek UPDATE.
+    Çağıranın transaction'ı içinde çalışmalıdır.
+    """
+    counts = Counter()
+    amounts = {}
+    for old, new in changes:
+        if old == new:
+            continue
+        for state, sign in ((old, -1), (new, 1)):
+            if state is None:
+                continue
+            for key in _row_keys(state):
+                row = tuple(sorted(key.items()))
+                counts[row] += sign
+                amounts[row] = amounts.get(row, Decimal('0.00')) + sign * state.total_amount
+
+    # Deterministik sıra: eşzamanlı işlemler satırları aynı sırayla kilitler
+    for row in sorted(counts.keys() | amounts.keys(), key=repr):
+        count, amount = counts[row], amounts.get(row, Decimal('0.00'))
+        if count or amount:
+            _apply(dict(row), count, amount)
+
+
+def record_order_change(old, new):
+    record_order_changes([(old, new)])
+
+
+def rebuild_daily_stats(company=None):
+    """
+    Rollup tablosunu sipariş tablosundan (ve arşivden) yeniden oluşturur
+    company verilirse sadece o şirketin (her iki rol) satırları yenilenir.
+    Dönüş: oluşturulan satır sayısı
+    """
+    sources = [Order.objects.all(), OrderArchive.objects.all()]
+    stats = OrderDailyStats.objects.all()
+    if company is not None:
+        stats = stats.filter(company=company)
+
+    counts = Counter()
+    amounts = {}
+    for source in sources:
+        for role in ('retailer', 'wholesaler'):
+            company_field, counterparty_field = (
+                ('retailer_id', 'wholesaler_id') if role == 'retailer' else ('wholesaler_id', 'retailer_id')
+            )
+            queryset = source if company is None else source.filter(**{company_field: company.pk})
+            grouped = queryset.annotate(day=TruncDate('order_date')).values(
+                company_field, counterparty_field, 'day', 'status'
+            ).annotate(
+                order_count=Count('pk'),
+                amount=Sum('total_amount')
+            ).order_by()
+            for row in grouped:
+                key = (row[company_field], role, row[counterparty_field], row['day'], row['status'])
+                counts[key] += row['order_count']
+                amounts[key] = amounts.get(key, Decimal('0.00')) + (row['amount'] or Decimal('0.00'))
+
+    rows = []
+    for key, order_count in counts.items():
+        company_id, role, counterparty_id, day, status = key
+        rows.append(OrderDailyStats(
+            company_id=company_id,
+            role=role,
+            counterparty_id=counterparty_id,
+            date=day,
+            status=status,
+            order_count=order_count,
+            total_amount=amounts[key],
+        ))
+
+    with transaction.atomic():
+        stats.delete()
+        OrderDailyStats.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def company_stats(company, role):
+    """Şirketin rol bazındaki rollup satırları"""
+    return OrderDailyStats.objects.filter(company=company, role=role)
+
+
+def totals(stats):
+    """Toplam sipariş sayısı, tutar ve ortalama"""
+    result = stats.aggregate(order_count=Sum('order_count'), total_amount=Sum('total_amount'))
+    count = result['order_count'] or 0
+    amount = (result['total_amount'] or Decimal('0.00')).quantize(TWO_PLACES)
+    average = (amount / count).quantize(TWO_PLACES) if count else Decimal('0.00')
+    return count, amount, average
+
+
+def status_counts(stats):
+    """{durum: sipariş sayısı} (sıfır olanlar hariç)"""
+    return {
+        row['status']: row['count']
+        for row in stats.values('status').annotate(count=Sum('order_count')).order_by()
+        if row['count']
+    }
+
+
+def top_counterparties(stats, limit=5):
+    """En çok sipariş yapılan karşı taraflar"""
+    rows = stats.values('counterparty_id', 'counterparty__name').annotate(
+        order_count=Sum('order_count'),
+        amount=Sum('total_amount')
+    ).filter(order_count__gt=0).order_by('-order_count', 'counterparty_id')[:limit]
+    return [{**row, 'amount': (row['amount'] or Decimal('0.00')).quantize(TWO_PLACES)} for row in rows]
+
+
+def monthly_trend(stats, months=12):
+    """Son N ayın aylık sipariş sayısı ve tutarı"""
+    today = timezone.localdate()
+    first_month = today.year * 12 + today.month - 1 - (months - 1)
+    start = date(first_month // 12, first_month % 12 + 1, 1)
+    return [
+        {
+            'month': row['month'].strftime('%Y-%m'),
+            'order_count': row['order_count'],
+            'total_amount': str((row['amount'] or Decimal('0.00')).quantize(TWO_PLACES)),
+        }
+        for row in stats.filter(date__gte=start).annotate(month=TruncMonth('date')).values('month').annotate(
+            order_count=Sum('order_count'),
+            amount=Sum('total_amount')
+        ).order_by('month')
+        if row['order_count']
+    ]
@@ -1,106 +1,29 @@
 # backend/orders/serializers.py
 from rest_framework import serializers
 from django.db import transaction
+from django.db.models import Sum
 from django.utils import timezone
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from .models import Order, OrderItem, OrderStatusHistory
+from .outbox import enqueue
 from products.models import Product
-from inventory.models import StockItem, Warehouse
-from companies.models import Company, RetailerWholesaler
+from inventory.models import StockItem, StockReservation, Warehouse
+from inventory.services import decrement_stock, reserve_stock
+from companies.models import Company
+from market.offers import stock_changed_on_commit
+from market.pricing import RetailerPricing
 
 
 class OrderItemCreateSerializer(serializers.Serializer):
     """
     Sipariş kalemi oluşturma için serializer
+
+    Sadece alan doğrulaması yapar; ürün ve stok kontrolleri tüm kalemler için
+    OrderCreateSerializer.validate içinde toplu olarak yapılır.
     """
     product_id = serializers.IntegerField()
     quantity = serializers.IntegerField(min_value=1)
     stock_item_id = serializers.IntegerField(required=False)
-    
-    def validate_product_id(self, value):
-        """Ürünün var olduğunu kontrol et"""
-        try:
-            product = Product.objects.get(id=value, is_active=True)
-            return value
-        except Product.DoesNotExist:
-            raise serializers.ValidationError(f'ID {value} ile aktif ürün bulunamadı.')
-    
-    def validate(self, attrs):
-        """Stok kontrolü ve en iyi stok kalemi seçimi"""
-        product_id = attrs['product_id']
-        quantity = attrs['quantity']
-        stock_item_id = attrs.get('stock_item_id')
-        
-        # Kullanıcının şirketi var mı?
-        request = self.context.get('request')
-        if not request or not hasattr(request.user, 'company') or not request.user.company:
-            raise serializers.ValidationError('Sipariş vermek için şirkete bağlı olmalısınız.')
-        
-        retailer = request.user.company
-        
-        # Belirli bir stok kalemi belirtilmişse onu kullan
-        if stock_item_id:
-            try:
-                stock_item = StockItem.objects.select_related(
-                    'product', 'warehouse', 'warehouse__company'
-                ).get(
-                    id=stock_item_id,
-                    product_id=product_id,
-                    is_active=True,
-                    is_sellable=True
-                )
-                
-                # Yeterli stok var mı?
-                available = stock_item.get_available_quantity()
-                if available < quantity:
-                    raise serializers.ValidationError(
-                        f'Yetersiz stok. Mevcut: {available}, İstenen: {quantity}'
-                    )
-                
-                attrs['stock_item'] = stock_item
-                return attrs
-                
-            except StockItem.DoesNotExist:
-                raise serializers.ValidationError(f'ID {stock_item_id} ile stok kalemi bulunamadı.')
-        
-        # En iyi stok kalemini otomatik seç
-        # Öncelik: Çalıştığı toptancılar > En düşük fiyat > En yüksek stok
-        product = Product.objects.get(id=product_id)
-        
-        # Çalıştığı toptancıları al
-        known_wholesaler_ids = RetailerWholesaler.objects.filter(
-            retailer=retailer,
-            is_active=True
-        ).values_list('wholesaler_id', flat=True)
-        
-        # Stok kalemlerini filtrele
-        stock_items = StockItem.objects.filter(
-            product=product,
-            is_active=True,
-            is_sellable=True,
-            quantity__gte=quantity,
-            warehouse__is_active=True,
-            warehouse__company__company_type__in=['wholesaler', 'both'],
-            sale_price__isnull=False
-        ).select_related('warehouse', 'warehouse__company')
-        
-        if not stock_items.exists():
-            raise serializers.ValidationError(
-                f'{product.name} için yeterli stok bulunamadı.'
-            )
-        
-        # Önce bilinen toptancıları dene
-        known_stock_items = stock_items.filter(
-            warehouse__company_id__in=known_wholesaler_ids
-        ).order_by('sale_price', '-quantity')
-        
-        if known_stock_items.exists():
-            attrs['stock_item'] = known_stock_items.first()
-        else:
-            # Bilinen toptancı yoksa en ucuzunu seç
-            attrs['stock_item'] = stock_items.order_by('sale_price', '-quantity').first()
-        
-        return attrs
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
@@ -191,102 +114,147 @@ class OrderCreateSerializer(serializers.Serializer):
         return value
     
     def validate(self, attrs):
-        """Genel validasyon - ürünlerin stok kontrolü"""
-        wholesaler_id = attrs['wholesaler_id']
+        """
+        Genel validasyon - tüm kalemlerin ürün ve stok kontrolü
+
+        Ürünler ve aday stok kalemleri kalem sayısından bağımsız olarak tek
+        sorguda okunur; seçim bellekte yapılır.
+        """
+        request = self.context.get('request')
+        if not request or not hasattr(request.user, 'company') or not request.user.company:
+            raise serializers.ValidationError('Sipariş vermek için şirkete bağlı olmalısınız.')
+        
+        items = attrs['items']
+        pricing = RetailerPricing.for_request(request)
+        
+        product_ids = [item['product_id'] for item in items]
+        products = Product.objects.filter(is_active=True).in_bulk(product_ids)
         
-        # Her bir item için stok kontrolü ve fiyat hesaplama
+        # Tüm ürünlerin stok kalemleri tek sorguda (en ucuzdan pahalıya, eşitlikte en yüksek stok)
+        candidates = {}
+        for stock_item in StockItem.objects.filter(
+            product_id__in=products.keys(),
+            is_active=True,
+            is_sellable=True
+        ).select_related('warehouse', 'warehouse__company').order_by('sale_price', '-quantity', 'id'):
+            candidates.setdefault(stock_item.product_id, []).append(stock_item)
+        
+        # Sepette tutulan (rezerve) miktarlar: {stock_item_id: miktar}
+        held = dict(
+            StockReservation.objects.filter(
+                company=request.user.company,
+                status='active',
+                stock_item__product_id__in=products.keys()
+            ).values('stock_item_id').annotate(total=Sum('quantity')).values_list('stock_item_id', 'total')
+        )
+        
+        errors = []
         validated_items = []
-        for item_data in attrs['items']:
-            item_serializer = OrderItemCreateSerializer(
-                data=item_data,
-                context=self.context
-            )
-            item_serializer.is_valid(raise_exception=True)
-            
-            stock_item = item_serializer.validated_data['stock_item']
+        for item in items:
+            product = products.get(item['product_id'])
+            if product is None:
+                errors.append({'product_id': [f"ID {item['product_id']} ile aktif ürün bulunamadı."]})
+                continue
             
-            # Not: Artık farklı toptancılardan ürünlere izin veriyoruz
-            # En uygun fiyatlı stok kalemini kullanacağız
+            stock_item, error = self._select_stock_item(
+                product, item, candidates.get(product.id, []), pricing, held
+            )
+            if error:
+                errors.append({'non_field_errors': [error]})
+                continue
             
-            validated_items.append({
-                **item_serializer.validated_data,
-                'stock_item': stock_item
-            })
+            errors.append({})
+            validated_items.append({**item, 'product': product, 'stock_item': stock_item})
+        
+        if any(errors):
+            raise serializers.ValidationError({'items': errors})
         
         attrs['validated_items'] = validated_items
         return attrs
     
+    @staticmethod
+    def _select_stock_item(product, item, stock_items, pricing, held):
+        """
+        Kalem için stok kalemi seçer
+        Öncelik: Belirtilen stok kalemi > Sepette rezerve edilen > Çalıştığı toptancılar
+        > En düşük fiyat > En yüksek stok
+        Alıcının kendi rezervasyonu kullanılabilir stoğa sayılır.
+        Dönüş: (stock_item, hata mesajı)
+        """
+        quantity = item['quantity']
+        stock_item_id = item.get('stock_item_id')
+        
+        def available(stock_item):
+            return stock_item.get_available_quantity() + held.get(stock_item.id, 0)
+        
+        # Belirli bir stok kalemi belirtilmişse onu kullan
+        if stock_item_id:
+            stock_item = next((si for si in stock_items if si.id == stock_item_id), None)
+            if stock_item is None:
+                return None, f'ID {stock_item_id} ile stok kalemi bulunamadı.'
+            if stock_item.sale_price is None:
+                return None, f'ID {stock_item_id} stok kaleminin satış fiyatı yok.'
+            
+            if available(stock_item) < quantity:
+                return None, f'Yetersiz stok. Mevcut: {available(stock_item)}, İstenen: {quantity}'
+            return stock_item, None
+        
+        # En iyi stok kalemini otomatik seç (liste zaten fiyata göre sıralı)
+        eligible = [
+            si for si in stock_items
+            if available(si) >= quantity
+            and si.sale_price is not None
+            and si.warehouse.is_active
+            and si.warehouse.company.company_type in ('wholesaler', 'both')
+        ]
+        if not eligible:
+            return None, f'{product.name} için yeterli stok bulunamadı.'
+        
+        # Önce sepette tutulan kalem, sonra bilinen toptancılar, yoksa en ucuzu
+        reserved = [si for si in eligible if si.id in held]
+        known = [si for si in eligible if pricing.is_known_wholesaler(si.warehouse.company_id)]
+        return (reserved or known or eligible)[0], None
+    
     @transaction.atomic
     def create(self, validated_data):
         """
         Sipariş ve sipariş kalemlerini oluşturur
+
+        Sorgu sayısı kalem sayısından bağımsızdır: kalemler bulk_create ile
+        eklenir, stoklar kilitlenip tek koşullu UPDATE ... CASE ile düşülür.
+        Doğrulamadan sonra stok tükenmişse InsufficientStockError yükselir.
         """
         request = self.context['request']
         retailer = request.user.company
         retailer_user = request.user
         
-        # Abonelik ve commission bilgilerini al
-        try:
-            subscription = retailer.subscription
-            tyrex_commission_rate = subscription.plan.get_tyrex_commission_decimal() * 100
-        except:
-            tyrex_commission_rate = Decimal('2.50')  # Varsayılan
+        # Fiyatlandırma bağlamı (ilişkiler ve komisyon bir kez yüklenir)
+        pricing = RetailerPricing.for_request(request)
+        tyrex_commission_rate = pricing.commission_rate * 100
         
         # Toptancı ve ilişki bilgilerini al
         wholesaler = Company.objects.get(id=validated_data['wholesaler_id'])
         
-        try:
-            retailer_wholesaler = RetailerWholesaler.objects.get(
-                retailer=retailer,
-                wholesaler=wholesaler,
-                is_active=True
-            )
+        retailer_wholesaler = pricing.get_relationship(wholesaler.id)
+        if retailer_wholesaler is not None:
             payment_terms_days = retailer_wholesaler.payment_terms_days
-        except RetailerWholesaler.DoesNotExist:
+        else:
             payment_terms_days = 30  # Varsayılan
         
-        # Sipariş toplamını hesapla
+        # Sipariş toplamını hesapla (tüm kalemler tek geçişte fiyatlanır)
         subtotal = Decimal('0.00')
         validated_items = validated_data['validated_items']
+        quotes = pricing.price_items(item['stock_item'] for item in validated_items)
         
         for item in validated_items:
-            stock_item = item['stock_item']
-            quantity = item['quantity']
-            
-            # Dinamik fiyat hesaplama (market serializer'dan)
-            base_price = stock_item.sale_price
-            
-            # Toptancı iskontosunu hesapla
-            try:
-                relationship = RetailerWholesaler.objects.get(
-                    retailer=retailer,
-                    wholesaler=wholesaler,
-                    is_active=True
-                )
-                
-                # Kredi limitine göre iskonto hesapla
-                if relationship.credit_limit:
-                    if relationship.credit_limit >= 100000:
-                        discount_rate = Decimal('0.05')  # %5 iskonto
-                    elif relationship.credit_limit >= 50000:
-                        discount_rate = Decimal('0.03')  # %3 iskonto
-                    else:
-                        discount_rate = Decimal('0.01')  # %1 iskonto
-                else:
-                    discount_rate = Decimal('0.02')  # Varsayılan %2 iskonto
-            except RetailerWholesaler.DoesNotExist:
-                discount_rate = Decimal('0.00')  # İlişki yoksa iskonto yok
-            
-            # Final fiyat hesaplama
-            discounted_price = base_price * (Decimal('1') - discount_rate)
-            final_price = discounted_price * (Decimal('1') + (tyrex_commission_rate / 100))
+            quote = quotes[item['stock_item'].id]
             
-            item['unit_price'] = final_price.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-            item['wholesaler_reference_price'] = base_price
+            item['unit_price'] = quote.unit_price
+            item['wholesaler_reference_price'] = quote.base_price
             
-            subtotal += item['unit_price'] * quantity
+            subtotal += item['unit_price'] * item['quantity']
         
-        # Sipariş oluştur
+        # Sipariş oluştur (kalem sayaçları bellekte hesaplanır)
         order = Order.objects.create(
             retailer=retailer,
             wholesaler=wholesaler,
@@ -296,6 +264,8 @@ class OrderCreateSerializer(serializers.Serializer):
             subtotal=subtotal,
             total_amount=subtotal,  # Şimdilik basit, sonra tax vs eklenebilir
             currency='TRY',
+            total_quantity=sum(item['quantity'] for item in validated_items),
+            line_count=len(validated_items),
             tyrex_commission_rate=tyrex_commission_rate,
             payment_terms_days=payment_terms_days,
             delivery_address=validated_data.get('delivery_address', ''),
@@ -305,28 +275,36 @@ class OrderCreateSerializer(serializers.Serializer):
             order_date=timezone.now()  # Explicit olarak set et
         )
         
-        # Sipariş kalemlerini oluştur ve stokları güncelle
+        # Sipariş kalemlerini hazırla (snapshot ve toplamlar bellekte hesaplanır)
         order_items = []
         for item in validated_items:
             stock_item = item['stock_item']
-            quantity = item['quantity']
-            
-            # Stok miktarını düşür
-            stock_item.quantity -= quantity
-            stock_item.save(update_fields=['quantity'])
-            
-            # Sipariş kalemini oluştur
-            order_item = OrderItem.objects.create(
+            order_item = OrderItem(
                 order=order,
-                product=stock_item.product,
+                product=item['product'],
                 warehouse=stock_item.warehouse,
                 stock_item=stock_item,
-                quantity=quantity,
+                quantity=item['quantity'],
                 unit_price=item['unit_price'],
                 wholesaler_reference_price=item['wholesaler_reference_price']
             )
+            order_item.fill_computed_fields()
             order_items.append(order_item)
         
+        OrderItem.objects.bulk_create(order_items)
+        
+        # Stokları kilitleyip tek sorguda düş; sepetteki rezervasyonlar siparişe
+        # dönüştürülür. Yetersizse InsufficientStockError yükselir ve transaction
+        # (sipariş dahil) geri alınır
+        decrement_stock(
+            {item['stock_item'].id: item['quantity'] for item in validated_items},
+            holds=StockReservation.objects.filter(company=retailer),
+            order=order
+        )
+        
+        # En iyi teklifleri commit sonrası yenile (toplu update sinyal tetiklemez)
+        stock_changed_on_commit(item['product'].id for item in validated_items)
+        
         # Durum geçmişi kaydı
         OrderStatusHistory.objects.create(
             order=order,
@@ -334,23 +312,12 @@ class OrderCreateSerializer(serializers.Serializer):
             new_status='pending',
             changed_by=retailer_user,
             change_reason='Sipariş oluşturuldu',
-            notes=f'Toplam {len(order_items)} kalem, {order.get_total_items()} adet ürün'
+            notes=f'Toplam {order.line_count} kalem, {order.total_quantity} adet ürün'
         )
         
-        # Celery görevi tetikle (asenkron toptancı bildirimi)
-        try:
-            from .tasks import send_order_to_wholesaler
-            send_order_to_wholesaler.delay(order.id)
-        except ImportError:
-            # Celery yoksa skip et
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning("Celery not available, skipping order notification task")
-        except Exception as e:
-            # Diğer hatalar
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Failed to trigger order notification task: {e}")
+        # Toptancı bildirimi: olay aynı transaction'da giden kutusuna yazılır,
+        # commit sonrası relay Celery'ye yayınlar (orders.outbox)
+        enqueue(order, 'order_created')
         
         return order
 
@@ -474,6 +441,19 @@ class OrderListSerializer(serializers.ModelSerializer):
         return obj.get_total_items()
 
 
+# Geçerli durum geçişleri (tekil ve toplu durum güncelleme)
+VALID_TRANSITIONS = {
+    'draft': ['pending', 'canceled'],
+    'pending': ['confirmed', 'canceled', 'rejected'],
+    'confirmed': ['processing', 'canceled'],
+    'processing': ['shipped', 'canceled'],
+    'shipped': ['delivered'],
+    'delivered': [],  # Teslim edilen sipariş değiştirilemez
+    'canceled': [],   # İptal edilen sipariş değiştirilemez
+    'rejected': [],   # Reddedilen sipariş değiştirilemez
+}
+
+
 class OrderStatusUpdateSerializer(serializers.Serializer):
     """
     Sipariş durumu güncelleme serializer'ı
@@ -487,20 +467,8 @@ class OrderStatusUpdateSerializer(serializers.Serializer):
         if not order:
             return value
         
-        # Geçerli durum geçişleri
-        valid_transitions = {
-            'draft': ['pending', 'canceled'],
-            'pending': ['confirmed', 'canceled', 'rejected'],
-            'confirmed': ['processing', 'canceled'],
-            'processing': ['shipped', 'canceled'],
-            'shipped': ['delivered'],
-            'delivered': [],  # Teslim edilen sipariş değiştirilemez
-            'canceled': [],   # İptal edilen sipariş değiştirilemez
-            'rejected': [],   # Reddedilen sipariş değiştirilemez
-        }
-        
         current_status = order.status
-        if value not in valid_transitions.get(current_status, []):
+        if value not in VALID_TRANSITIONS.get(current_status, []):
             raise serializers.ValidationError(
                 f'{order.get_status_display()} durumundan {dict(Order.STATUS_CHOICES)[value]} durumuna geçiş yapılamaz.'
             )
@@ -508,20 +476,72 @@ class OrderStatusUpdateSerializer(serializers.Serializer):
         return value
 
 
+class OrderBulkCancelSerializer(serializers.Serializer):
+    """
+    Toplu sipariş iptali serializer'ı
+    """
+    order_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=500
+    )
+    reason = serializers.CharField(required=False, allow_blank=True, max_length=200)
+
+
+class OrderStatusChangeSerializer(serializers.Serializer):
+    """
+    Toplu durum güncellemede tek bir sipariş
+    """
+    order_id = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES)
+
+
+class OrderBulkStatusSerializer(serializers.Serializer):
+    """
+    Toplu sipariş durumu güncelleme serializer'ı
+
+    Ya tek hedef durum: {"order_ids": [...], "status": "confirmed"}
+    ya da sipariş başına: {"updates": [{"order_id": 1, "status": "shipped"}, ...]}
+    Geçişler VALID_TRANSITIONS tablosuna göre sipariş bazında kontrol edilir.
+    """
+    MAX_ORDERS = 500
+    
+    order_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_ORDERS
+    )
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES, required=False)
+    updates = OrderStatusChangeSerializer(many=True, required=False, allow_empty=False, max_length=MAX_ORDERS)
+    notes = serializers.CharField(required=False, allow_blank=True)
+    
+    def validate(self, attrs):
+        if 'updates' in attrs:
+            if 'order_ids' in attrs or 'status' in attrs:
+                raise serializers.ValidationError('updates ile order_ids/status birlikte kullanılamaz.')
+            changes = {}
+            for update in attrs['updates']:
+                if update['order_id'] in changes:
+                    raise serializers.ValidationError(
+                        f"Sipariş ID {update['order_id']} birden fazla kez gönderildi."
+                    )
+                changes[update['order_id']] = update['status']
+        elif 'order_ids' in attrs and 'status' in attrs:
+            changes = {order_id: attrs['status'] for order_id in attrs['order_ids']}
+        else:
+            raise serializers.ValidationError('order_ids ve status ya da updates gönderilmelidir.')
+        
+        attrs['changes'] = changes
+        return attrs
+
+
 class CartItemSerializer(serializers.Serializer):
     """
     Sepet kalemi için basit serializer (sipariş öncesi)
     """
     product_id = serializers.IntegerField()
     quantity = serializers.IntegerField(min_value=1)
-    
-    def validate_product_id(self, value):
-        """Ürünün var olduğunu kontrol et"""
-        try:
-            Product.objects.get(id=value, is_active=True)
-            return value
-        except Product.DoesNotExist:
-            raise serializers.ValidationError(f'ID {value} ile aktif ürün bulunamadı.')
 
 
 class CartCalculationSerializer(serializers.Serializer):
@@ -530,6 +550,11 @@ class CartCalculationSerializer(serializers.Serializer):
     """
     wholesaler_id = serializers.IntegerField()
     items = CartItemSerializer(many=True)
+    hold = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text='True ise seçilen stoklar ödeme süresi boyunca rezerve edilir'
+    )
     
     def validate_wholesaler_id(self, value):
         """Toptancının var olduğunu kontrol et"""
@@ -543,74 +568,90 @@ class CartCalculationSerializer(serializers.Serializer):
         except Company.DoesNotExist:
             raise serializers.ValidationError(f'ID {value} ile aktif toptancı bulunamadı.')
     
+    def validate_items(self, value):
+        """Sepetteki ürünlerin aktif olduğunu tek sorguda kontrol et"""
+        # Aynı ürünün birden fazla kez eklenmemesini kontrol et (sipariş oluşturmadaki gibi)
+        product_id_list = [item['product_id'] for item in value]
+        if len(product_id_list) != len(set(product_id_list)):
+            raise serializers.ValidationError('Aynı ürün birden fazla kez eklenemez.')
+        
+        product_ids = set(product_id_list)
+        active_ids = set(
+            Product.objects.filter(id__in=product_ids, is_active=True).values_list('id', flat=True)
+        )
+        missing = product_ids - active_ids
+        if missing:
+            raise serializers.ValidationError(
+                f'ID {", ".join(str(pid) for pid in sorted(missing))} ile aktif ürün bulunamadı.'
+            )
+        return value
+    
     def calculate_cart(self):
-        """Sepet toplamını hesapla (sipariş oluşturmadan)"""
+        """
+        Sepet toplamını hesapla (sipariş oluşturmadan)
+
+        hold=True ise seçilen stok kalemleri süreli olarak rezerve edilir
+        (önceki rezervasyonlar yenilenir); yetersiz stokta InsufficientStockError.
+        """
         request = self.context['request']
-        retailer = request.user.company
+        pricing = RetailerPricing.for_request(request)
         
         validated_data = self.validated_data
+        hold = validated_data.get('hold', False)
         wholesaler_id = validated_data['wholesaler_id']
         wholesaler = Company.objects.get(id=wholesaler_id)
         
+        items = validated_data['items']
+        products = Product.objects.in_bulk([item['product_id'] for item in items])
+        
+        # Tüm ürünlerin aday stok kalemleri tek sorguda (en ucuzdan pahalıya)
+        candidates = {}
+        for stock_item in StockItem.objects.filter(
+            product_id__in=products.keys(),
+            is_active=True,
+            is_sellable=True,
+            sale_price__isnull=False,
+            warehouse__is_active=True
+        ).select_related('warehouse', 'warehouse__company').order_by('sale_price', 'id'):
+            candidates.setdefault(stock_item.product_id, []).append(stock_item)
+        
+        # Şirketin kendi önceki rezervasyonları seçimi etkilemesin; reserve_stock()
+        # onları yeni rezervasyonla aynı transaction içinde bırakır
+        own_holds = {}
+        if hold:
+            own_holds = dict(
+                StockReservation.objects.filter(
+                    company=request.user.company,
+                    status='active',
+                    stock_item__product_id__in=products.keys()
+                ).values('stock_item_id').annotate(total=Sum('quantity')).values_list('stock_item_id', 'total')
+            )
+        
         cart_items = []
+        held_quantities = {}
         total = Decimal('0.00')
         
-        for item_data in validated_data['items']:
-            product = Product.objects.get(id=item_data['product_id'])
+        for item_data in items:
+            product = products[item_data['product_id']]
             quantity = item_data['quantity']
             
             # En iyi stok kalemini bul (tüm aktif warehouse'lardan)
-            stock_items = StockItem.objects.filter(
-                product=product,
-                is_active=True,
-                is_sellable=True,
-                quantity__gte=quantity,
-                sale_price__isnull=False,
-                warehouse__is_active=True
-            ).select_related('warehouse', 'warehouse__company').order_by('sale_price')
-            
-            if not stock_items.exists():
+            stock_item = next(
+                (si for si in candidates.get(product.id, [])
+                 if (si.get_available_quantity() + own_holds.get(si.id, 0) if hold else si.quantity) >= quantity),
+                None
+            )
+            if stock_item is None:
                 continue
             
-            stock_item = stock_items.first()
-            actual_wholesaler = stock_item.warehouse.company
-            
-            # Fiyat hesaplama (gerçek toptancıya göre)
-            base_price = stock_item.sale_price
-            
-            try:
-                relationship = RetailerWholesaler.objects.get(
-                    retailer=retailer,
-                    wholesaler=actual_wholesaler,
-                    is_active=True
-                )
-                
-                if relationship.credit_limit:
-                    if relationship.credit_limit >= 100000:
-                        discount_rate = Decimal('0.05')
-                    elif relationship.credit_limit >= 50000:
-                        discount_rate = Decimal('0.03')
-                    else:
-                        discount_rate = Decimal('0.01')
-                else:
-                    discount_rate = Decimal('0.02')
-            except RetailerWholesaler.DoesNotExist:
-                discount_rate = Decimal('0.00')
-            
-            # Tyrex komisyonu
-            try:
-                subscription = retailer.subscription
-                tyrex_commission_rate = subscription.plan.get_tyrex_commission_decimal()
-            except:
-                tyrex_commission_rate = Decimal('0.025')
-            
-            discounted_price = base_price * (Decimal('1') - discount_rate)
-            final_price = discounted_price * (Decimal('1') + tyrex_commission_rate)
-            final_price = final_price.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            # Fiyat hesaplama (gerçek toptancıya göre, ek sorgu yok)
+            quote = pricing.quote(stock_item)
+            final_price = quote.unit_price
             
             item_total = final_price * quantity
             total += item_total
             
+            held_quantities[stock_item.id] = held_quantities.get(stock_item.id, 0) + quantity
             cart_items.append({
                 'product': {
                     'id': product.id,
@@ -621,8 +662,8 @@ class CartCalculationSerializer(serializers.Serializer):
                 'quantity': quantity,
                 'available_stock': stock_item.get_available_quantity(),
                 'unit_price': str(final_price),
-                'wholesaler_reference_price': str(base_price),
-                'discount_percentage': str((discount_rate * 100).quantize(Decimal('0.1'))),
+                'wholesaler_reference_price': str(quote.base_price),
+                'discount_percentage': str((quote.discount_rate * 100).quantize(Decimal('0.1'))),
                 'item_total': str(item_total),
                 'warehouse': {
                     'id': stock_item.warehouse.id,
@@ -645,10 +686,7 @@ class CartCalculationSerializer(serializers.Serializer):
                 'unique_products': 0
             }
         
-        # Mixed wholesaler - ilk item'in wholesaler'ını kullan
-        first_item_wholesaler = cart_items[0]['warehouse']
-        
-        return {
+        cart = {
             'wholesaler': {
                 'id': wholesaler.id,  # API'den gelen original 
                 'name': f"Karışık Toptancılar"  # Mixed wholesalers
@@ -659,4 +697,15 @@ class CartCalculationSerializer(serializers.Serializer):
             'currency': 'TRY',
             'total_items': sum(item['quantity'] for item in cart_items),
             'unique_products': len(cart_items)
-        }
\ No newline at end of file
+        }
+        
+        if hold:
+            reservations = reserve_stock(
+                request.user.company, held_quantities, user=request.user
+            )
+            cart['hold'] = {
+                'expires_at': reservations[0].expires_at,
+                'reservation_ids': [reservation.id for reservation in reservations]
+            }
+        
+        return cart
@@ -0,0 +1,215 @@
+# backend/orders/services.py
+"""
+Sipariş işlemleri için toplu (set tabanlı) servisler
+
+İptal ve toplu durum geçişi akışları API (tekil ve toplu) ile admin
+aksiyonları arasında ortaktır.
+Toplu update() kullanıldığı için Order.save() rollup kancası çalışmaz;
+rollup değişiklikleri burada rollups.record_order_changes() ile uygulanır.
+"""
+from collections import defaultdict, namedtuple
+
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import Now
+from django.utils import timezone
+
+from inventory.services import increment_stock
+from market.offers import stock_changed_on_commit
+
+from .models import Order, OrderItem, OrderStatusHistory
+from .rollups import record_order_changes, rollup_state
+from .serializers import VALID_TRANSITIONS
+
+
+# Doğrudan iptalde (iptal endpoint'leri, admin aksiyonu) izin verilen durumlar;
+# Order.can_be_canceled() ile aynıdır
+CANCELABLE_STATUSES = ('draft', 'pending', 'confirmed')
+
+# Durum geçişiyle 'canceled' hedefine izin verilen durumlar; geçiş doğrulaması
+# ile kilit altındaki kontrol aynı kaynağı (VALID_TRANSITIONS) kullanır
+TRANSITION_CANCELABLE_STATUSES = tuple(
+    status for status, targets in VALID_TRANSITIONS.items() if 'canceled' in targets
+)
+
+# Hedef duruma göre doldurulan zaman damgası
+STATUS_TIMESTAMPS = {
+    'confirmed': 'confirmed_at',
+    'shipped': 'shipped_at',
+    'delivered': 'delivered_at',
+}
+
+CancelResult = namedtuple('CancelResult', [
+    'canceled',        # iptal edilen Order nesneleri (eski durumlarıyla)
+    'skipped_ids',     # bulunamayan veya iptal edilemeyen sipariş id'leri
+    'restocked',       # stoğa geri eklenen toplam adet
+])
+
+
+def cancel_orders(order_ids, user=None, reason='Kullanıcı tarafından iptal edildi',
+                  item_reason='Sipariş iptal edildi', notes='', statuses=CANCELABLE_STATUSES):
+    """
+    Siparişleri iptal eder ve stokları geri ekler
+
+    order_ids: iptal edilecek sipariş id'leri (yetki kontrolü çağırana aittir)
+    notes: durum geçmişine stok notundan önce eklenecek açıklama
+    statuses: iptal edilebilir durumlar (durum geçişleri için TRANSITION_CANCELABLE_STATUSES)
+    - Siparişler id sırasıyla kilitlenir; iptal edilebilir durumda olmayanlar atlanır.
+    - Kalem miktarları stok kalemi başına toplanıp tek UPDATE ile geri eklenir.
+    - Kalem iptal işaretleri, sipariş durumları ve durum geçmişi toplu yazılır.
+    Sorgu sayısı sipariş/kalem sayısından bağımsızdır.
+    """
+    order_ids = set(order_ids)
+    if not order_ids:
+        return CancelResult([], [], 0)
+
+    with transaction.atomic():
+        orders = list(
+            Order.objects.select_for_update().filter(
+                pk__in=order_ids,
+                status__in=statuses
+            ).order_by('pk').only(
+                'id', 'order_number', 'status', 'retailer_id', 'wholesaler_id',
+                'order_date', 'total_amount', 'total_quantity'
+            )
+        )
+        skipped_ids = sorted(order_ids - {order.pk for order in orders})
+        if not orders:
+            return CancelResult([], skipped_ids, 0)
+
+        canceled_ids = [order.pk for order in orders]
+        now = timezone.now()
+
+        items = OrderItem.objects.filter(order_id__in=canceled_ids, is_canceled=False)
+        quantities = {
+            row['stock_item_id']: row['quantity']
+            for row in items.values('stock_item_id').annotate(quantity=Sum('quantity')).order_by()
+        }
+        product_ids = increment_stock(quantities)
+
+        items.update(is_canceled=True, canceled_at=now, cancel_reason=item_reason, updated_at=Now())
+
+        Order.objects.filter(pk__in=canceled_ids).update(
+            status='canceled',
+            canceled_at=now,
+            updated_at=Now()
+        )
+
+        changes = []
+        for order in orders:
+            old = rollup_state(order)
+            changes.append((old, old._replace(status='canceled') if old else None))
+        record_order_changes(changes)
+
+        OrderStatusHistory.objects.bulk_create([
+            OrderStatusHistory(
+                order=order,
+                old_status=order.status,
+                new_status='canceled',
+                changed_by=user,
+                change_reason=reason,
+                notes='\n'.join(filter(None, [
+                    notes, f'Toplam {order.total_quantity} adet ürün stokları geri alındı'
+                ]))
+            )
+            for order in orders
+        ])
+
+        # En iyi teklifleri commit sonrası yenile (toplu update sinyal tetiklemez)
+        stock_changed_on_commit(product_ids)
+
+    return CancelResult(orders, skipped_ids, sum(quantities.values()))
+
+
+def transition_orders(changes, user=None, reason='Toplu durum güncelleme', notes=''):
+    """
+    Siparişleri hedef durumlarına toplu olarak geçirir
+
+    changes: {order_id: yeni durum} (yetki kontrolü çağırana aittir)
+    - Siparişler id sırasıyla kilitlenir, geçişler VALID_TRANSITIONS ile bellekte denetlenir.
+    - Hedef durum başına tek UPDATE; durum geçmişi bulk_create ile yazılır.
+    - 'canceled' hedefi cancel_orders() ile işlenir (stoklar geri eklenir).
+    Dönüş: {order_id: {'outcome': 'updated' | 'not_found' | 'invalid_transition', ...}}
+    """
+    if not changes:
+        return {}
+
+    outcomes = {}
+    with transaction.atomic():
+        orders = {
+            order.pk: order
+            for order in Order.objects.select_for_update().filter(pk__in=changes.keys()).order_by('pk').only(
+                'id', 'order_number', 'status', 'retailer_id', 'wholesaler_id',
+                'order_date', 'total_amount', 'total_quantity'
+            )
+        }
+
+        targets = defaultdict(list)
+        for order_id, new_status in sorted(changes.items()):
+            order = orders.get(order_id)
+            if order is None:
+                outcomes[order_id] = {'outcome': 'not_found', 'error': 'Sipariş bulunamadı.'}
+                continue
+            if new_status not in VALID_TRANSITIONS.get(order.status, []):
+                outcomes[order_id] = {
+                    'outcome': 'invalid_transition',
+                    'old_status': order.status,
+                    'error': f'{order.get_status_display()} durumundan {dict(Order.STATUS_CHOICES)[new_status]} durumuna geçiş yapılamaz.'
+                }
+                continue
+            targets[new_status].append(order)
+
+        cancel_targets = targets.pop('canceled', [])
+        if cancel_targets:
+            canceled = {
+                order.pk for order in cancel_orders(
+                    [order.pk for order in cancel_targets], user=user, reason=reason, notes=notes,
+                    statuses=TRANSITION_CANCELABLE_STATUSES
+                ).canceled
+            }
+            for order in cancel_targets:
+                if order.pk in canceled:
+                    outcomes[order.pk] = {
+                        'outcome': 'updated',
+                        'old_status': order.status,
+                        'new_status': 'canceled',
+                    }
+                else:
+                    outcomes[order.pk] = {
+                        'outcome': 'invalid_transition',
+                        'old_status': order.status,
+                        'error': f'{order.get_status_display()} durumundaki sipariş iptal edilemez.'
+                    }
+
+        now = timezone.now()
+        changes_for_rollup = []
+        history = []
+        for new_status, group in targets.items():
+            updates = {'status': new_status, 'updated_at': Now()}
+            if new_status in STATUS_TIMESTAMPS:
+                updates[STATUS_TIMESTAMPS[new_status]] = now
+            if new_status == 'delivered':
+                updates['payment_status'] = 'paid'  # Teslim edilen sipariş ödenmiş sayılır
+            Order.objects.filter(pk__in=[order.pk for order in group]).update(**updates)
+
+            for order in group:
+                old = rollup_state(order)
+                changes_for_rollup.append((old, old._replace(status=new_status) if old else None))
+                history.append(OrderStatusHistory(
+                    order=order,
+                    old_status=order.status,
+                    new_status=new_status,
+                    changed_by=user,
+                    change_reason=reason,
+                    notes=notes
+                ))
+                outcomes[order.pk] = {
+                    'outcome': 'updated',
+                    'old_status': order.status,
+                    'new_status': new_status,
+                }
+
+        record_order_changes(changes_for_rollup)
+        OrderStatusHistory.objects.bulk_create(history)
+
+    return outcomes
@@ -0,0 +1,78 @@
+# backend/orders/signals.py
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from companies.models import Company
+from .models import Order, OrderItem
+from .rollups import record_order_change
+
+
+# Sipariş kalem sayaçlarını etkileyen OrderItem alanları
+COUNTER_FIELDS = {'order', 'quantity'}
+
+_archiving = ContextVar('orders_archiving', default=False)
+
+
+@contextmanager
+def archiving():
+    """
+    Arşive taşınan siparişlerin silinmesi sırasında rollup ve sayaç
+    güncellemelerini atlar (sipariş istatistiklerde kalmaya devam eder)
+    """
+    token = _archiving.set(True)
+    try:
+        yield
+    finally:
+        _archiving.reset(token)
+
+
+@receiver(post_delete, sender=Order)
+def order_deleted(sender, instance, **kwargs):
+    """Silinen siparişi rollup tablosundan düş"""
+    if _archiving.get():
+        return
+    record_order_change(getattr(instance, '_rollup_state', None), None)
+
+
+@receiver(post_save, sender=OrderItem)
+def order_item_saved(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    """
+    Kalem eklenince/miktarı değişince siparişin sayaçlarını güncelle (admin vb.)
+    bulk_create sinyal tetiklemez; sipariş oluşturma sayaçları doğrudan yazar.
+    """
+    if raw:
+        return
+    if update_fields is not None and not COUNTER_FIELDS.intersection(update_fields):
+        return
+    Order.sync_item_counters(Order.objects.filter(pk=instance.order_id))
+
+
+@receiver(post_delete, sender=OrderItem)
+def order_item_deleted(sender, instance, **kwargs):
+    """Silinen kalemin siparişinin sayaçlarını güncelle"""
+    if _archiving.get():
+        return
+    Order.sync_item_counters(Order.objects.filter(pk=instance.order_id))
+
+
+@receiver(pre_save, sender=Company)
+def company_renaming(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Şirket adı değişiyor mu (siparişlerin arama metninde tutulur)"""
+    instance._name_changed = False
+    if raw or instance._state.adding or (update_fields is not None and 'name' not in update_fields):
+        return
+    old_name = Company.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+    instance._name_changed = old_name is not None and old_name != instance.name
+
+
+@receiver(post_save, sender=Company)
+def company_renamed(sender, instance, **kwargs):
+    """Ad değiştiyse şirketin siparişlerinin arama metnini arka planda yenile"""
+    if getattr(instance, '_name_changed', False):
+        from .tasks import refresh_order_search_text
+
+        transaction.on_commit(lambda: refresh_order_search_text.delay(instance.pk))
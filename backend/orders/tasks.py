@@ -1,411 +1,407 @@
 # backend/orders/tasks.py
 from celery import shared_task
-from django.core.mail import send_mail
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 import logging
 
+from .notifications import CHANNELS, build_order_details, dispatch, dispatch_digest, needs_retry
+from .outbox import claim, complete, release
+
 logger = logging.getLogger(__name__)
 
 
-@shared_task(bind=True, max_retries=3)
-def send_order_to_wholesaler(self, order_id):
+def _orders_for_notification():
+    from .models import Order
+
+    return Order.objects.select_related(
+        'retailer', 'wholesaler', 'retailer_user'
+    ).prefetch_related('items__product', 'items__warehouse')
+
+
+def _digest_orders(order_ids):
+    """Özete girecek siparişler; toplama penceresinde iptal edilenler gönderilmez"""
+    return list(
+        _orders_for_notification().filter(id__in=order_ids).exclude(status='canceled').order_by('id')
+    )
+
+
+def _load_order(order_id):
+    return _orders_for_notification().filter(id=order_id).first()
+
+
+def _confirm_if_delivered(order, results):
+    """API bildirimi başarılıysa bekleyen siparişi onayla"""
+    from .models import OrderStatusHistory
+
+    api_result = results.get('api')
+    if not api_result or not api_result['success'] or order.status != 'pending':
+        return
+
+    order.status = 'confirmed'
+    order.confirmed_at = timezone.now()
+    order.save(update_fields=['status', 'confirmed_at'])
+
+    # Durum geçmişi kaydet
+    OrderStatusHistory.objects.create(
+        order=order,
+        old_status='pending',
+        new_status='confirmed',
+        change_reason='Toptancıya başarıyla iletildi',
+        notes=', '.join(f"{channel}: {result['success']}" for channel, result in results.items())
+    )
+
+
+def _schedule_retries(task, args, results, attempt=0):
+    """Başarısız kanalları ayrı ayrı yeniden dener (başarılılar tekrar gönderilmez)"""
+    for channel, result in results.items():
+        if not needs_retry(result):
+            continue
+        countdown = result.get('retry_after') or 60 * (2 ** attempt)
+        task.apply_async(
+            args=[*args, channel],
+            kwargs={'attempt': attempt + 1},
+            countdown=countdown
+        )
+
+
+def _record_notification_failure(orders, channel, error):
+    """Max retry'a ulaşan kanalı sipariş notlarına ve durum geçmişine işle"""
+    from .models import Order, OrderStatusHistory
+
+    Order.objects.filter(id__in=[order.id for order in orders]).update(
+        internal_notes=f"Toptancı bildirimi başarısız ({channel}): {error}"
+    )
+    OrderStatusHistory.objects.bulk_create([
+        OrderStatusHistory(
+            order=order,
+            old_status=order.status,
+            new_status=order.status,
+            change_reason='Toptancı bildirimi başarısız',
+            notes=f"{channel}: {error}"
+        )
+        for order in orders
+    ])
+
+
+def _digest_window_key(wholesaler_id):
+    return f'notify:digest:window:{wholesaler_id}'
+
+
+def _queue_for_digest(order):
     """
-    Toptancıya sipariş bildirimi gönderen Celery görevi
+    Siparişi toptancının özet kuyruğuna ekler
+    Pencerenin ilk siparişi özet görevini pencere süresi kadar ertelenmiş
+    planlar; kuyruk notification_digest_max_orders'a ulaşırsa hemen gönderilir.
     """
+    from .models import OrderDigestEntry
+
+    wholesaler = order.wholesaler
+    OrderDigestEntry.objects.get_or_create(order=order, defaults={'wholesaler': wholesaler})
+
+    pending = OrderDigestEntry.objects.filter(wholesaler=wholesaler).count()
+    if pending >= max(1, wholesaler.notification_digest_max_orders):
+        send_wholesaler_digest.delay(wholesaler.id)
+        return
+
+    window = wholesaler.notification_digest_window
     try:
-        from .models import Order, OrderStatusHistory
-        
-        # Siparişi al
-        try:
-            order = Order.objects.select_related(
-                'retailer', 'wholesaler', 'retailer_user'
-            ).prefetch_related('items__product').get(id=order_id)
-        except Order.DoesNotExist:
-            logger.error(f"Order {order_id} not found")
-            return {
-                'success': False,
-                'error': f'Sipariş ID {order_id} bulunamadı'
-            }
-        
-        # Sipariş detaylarını hazırla
-        order_details = {
-            'order_number': order.order_number,
-            'retailer_name': order.retailer.name,
-            'retailer_email': order.retailer.email,
-            'retailer_phone': order.retailer.phone,
-            'retailer_user': f"{order.retailer_user.first_name} {order.retailer_user.last_name}",
-            'total_amount': str(order.total_amount),
-            'currency': order.currency,
-            'order_date': order.order_date.strftime('%d.%m.%Y %H:%M'),
-            'payment_terms_days': order.payment_terms_days,
-            'delivery_address': order.delivery_address,
-            'delivery_contact': order.delivery_contact,
-            'delivery_phone': order.delivery_phone,
-            'notes': order.notes,
-            'items': []
+        opened = cache.add(_digest_window_key(wholesaler.id), order.id, timeout=window)
+    except Exception as e:
+        # Cache yoksa her sipariş kendi özetini planlar; boş kuyruk görevi iş yapmaz
+        logger.warning(f"Digest window cache failed: {e}")
+        opened = True
+    if opened:
+        send_wholesaler_digest.apply_async(args=[wholesaler.id], countdown=window)
+
+
+def _notify_wholesaler(order_id):
+    """Siparişi toptancıya bildirir veya özet kuyruğuna ekler"""
+    order = _load_order(order_id)
+    if order is None:
+        logger.error(f"Order {order_id} not found")
+        return {
+            'success': False,
+            'error': f'Sipariş ID {order_id} bulunamadı'
         }
-        
-        # Sipariş kalemlerini ekle
-        for item in order.items.all():
-            order_details['items'].append({
-                'product_name': item.product_name,
-                'product_sku': item.product_sku,
-                'product_brand': item.product_brand,
-                'quantity': item.quantity,
-                'unit_price': str(item.unit_price),
-                'total_price': str(item.total_price),
-                'warehouse_name': item.warehouse.name
-            })
-        
-        # 1. Email bildirimi gönder
-        email_result = send_order_email_notification(order, order_details)
-        
-        # 2. API bildirimi gönder (toptancının kendi sistemine)
-        api_result = send_order_api_notification(order, order_details)
-        
-        # 3. SMS bildirimi gönder (opsiyonel)
-        sms_result = send_order_sms_notification(order, order_details)
-        
-        # Sonuçları logla
-        logger.info(f"Order {order.order_number} notification sent:")
-        logger.info(f"  Email: {email_result['success']}")
-        logger.info(f"  API: {api_result['success']}")
-        logger.info(f"  SMS: {sms_result['success']}")
-        
-        # Sipariş durumu güncelle (API başarılıysa)
-        if api_result['success']:
-            order.status = 'confirmed'
-            order.confirmed_at = timezone.now()
-            order.save(update_fields=['status', 'confirmed_at'])
-            
-            # Durum geçmişi kaydet
-            OrderStatusHistory.objects.create(
-                order=order,
-                old_status='pending',
-                new_status='confirmed',
-                change_reason='Toptancıya başarıyla iletildi',
-                notes=f'Email: {email_result["success"]}, API: {api_result["success"]}, SMS: {sms_result["success"]}'
-            )
-        
+
+    if order.wholesaler.notification_digest_window:
+        _queue_for_digest(order)
         return {
             'success': True,
             'order_number': order.order_number,
-            'notifications': {
-                'email': email_result,
-                'api': api_result,
-                'sms': sms_result
-            }
-        }
-        
-    except Exception as exc:
-        logger.error(f"Order notification task failed: {str(exc)}")
-        
-        # Retry mekanizması
-        if self.request.retries < self.max_retries:
-            logger.info(f"Retrying order notification (attempt {self.request.retries + 1})")
-            raise self.retry(countdown=60 * (2 ** self.request.retries))
-        
-        # Max retry'a ulaştıysa sipariş durumunu güncelle
-        try:
-            order = Order.objects.get(id=order_id)
-            order.internal_notes = f"Toptancı bildirimi başarısız: {str(exc)}"
-            order.save(update_fields=['internal_notes'])
-            
-            OrderStatusHistory.objects.create(
-                order=order,
-                old_status='pending',
-                new_status='pending',
-                change_reason='Toptancı bildirimi başarısız',
-                notes=str(exc)
-            )
-        except:
-            pass
-        
-        return {
-            'success': False,
-            'error': str(exc),
-            'retries': self.request.retries
+            'digest': True
         }
 
+    results = dispatch(order, build_order_details(order))
+
+    # Sonuçları logla
+    logger.info(f"Order {order.order_number} notification sent:")
+    for channel, result in results.items():
+        logger.info(f"  {channel}: {result['success']}")
+
+    _confirm_if_delivered(order, results)
+    _schedule_retries(retry_order_notification, [order.id], results)
+
+    return {
+        'success': True,
+        'order_number': order.order_number,
+        'notifications': results
+    }
+
 
-def send_order_email_notification(order, order_details):
+@shared_task
+def send_order_to_wholesaler(order_id, event_id=None):
     """
-    Email bildirimi gönder
+    Toptancıya sipariş bildirimi gönderen Celery görevi
+    Email, API ve SMS kanalları eşzamanlı gönderilir; başarısız kanallar
+    retry_order_notification ile tek tek yeniden denenir. Toptancının özet
+    penceresi açıksa sipariş kuyruğa alınır (send_wholesaler_digest).
+    event_id: giden kutusu olayı (tamamlanmış veya işlenmekte olan olayın
+    tekrar teslimi atlanır; olay ancak bildirim gönderildikten sonra tamamlanır)
     """
+    if not claim(event_id):
+        logger.info(f"Outbox event {event_id} already processed or in progress, skipping")
+        return {'success': True, 'duplicate': True}
+
     try:
-        # Email şablonunu hazırla
-        subject = f"Yeni Sipariş: {order.order_number} - {order.retailer.name}"
-        
-        # HTML email içeriği
-        html_message = f"""
-        <html>
-        <body>
-            <h2>Yeni Sipariş Bildirimi</h2>
-            
-            <h3>Sipariş Bilgileri</h3>
-            <ul>
-                <li><strong>Sipariş No:</strong> {order_details['order_number']}</li>
-                <li><strong>Tarih:</strong> {order_details['order_date']}</li>
-                <li><strong>Toplam:</strong> {order_details['total_amount']} {order_details['currency']}</li>
-                <li><strong>Ödeme Vadesi:</strong> {order_details['payment_terms_days']} gün</li>
-            </ul>
-            
-            <h3>Perakendeci Bilgileri</h3>
-            <ul>
-                <li><strong>Şirket:</strong> {order_details['retailer_name']}</li>
-                <li><strong>Email:</strong> {order_details['retailer_email']}</li>
-                <li><strong>Telefon:</strong> {order_details['retailer_phone']}</li>
-                <li><strong>Sipariş Veren:</strong> {order_details['retailer_user']}</li>
-            </ul>
-            
-            <h3>Teslimat Bilgileri</h3>
-            <ul>
-                <li><strong>Adres:</strong> {order_details['delivery_address']}</li>
-                <li><strong>İletişim:</strong> {order_details['delivery_contact']}</li>
-                <li><strong>Telefon:</strong> {order_details['delivery_phone']}</li>
-            </ul>
-            
-            <h3>Sipariş Kalemleri</h3>
-            <table border="1" style="border-collapse: collapse; width: 100%;">
-                <tr>
-                    <th>Ürün</th>
-                    <th>SKU</th>
-                    <th>Marka</th>
-                    <th>Miktar</th>
-                    <th>Birim Fiyat</th>
-                    <th>Toplam</th>
-                    <th>Depo</th>
-                </tr>
-        """
-        
-        for item in order_details['items']:
-            html_message += f"""
-                <tr>
-                    <td>{item['product_name']}</td>
-                    <td>{item['product_sku']}</td>
-                    <td>{item['product_brand']}</td>
-                    <td>{item['quantity']}</td>
-                    <td>{item['unit_price']} TRY</td>
-                    <td>{item['total_price']} TRY</td>
-                    <td>{item['warehouse_name']}</td>
-                </tr>
-            """
-        
-        html_message += f"""
-            </table>
-            
-            <h3>Notlar</h3>
-            <p>{order_details['notes'] or 'Not yok'}</p>
-            
-            <hr>
-            <p><small>Bu email Tyrex B2B Pazaryeri sistemi tarafından otomatik olarak gönderilmiştir.</small></p>
-        </body>
-        </html>
-        """
-        
-        # Email gönder
-        send_mail(
-            subject=subject,
-            message=f"Yeni sipariş: {order.order_number}",  # Plain text fallback
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[order.wholesaler.email],
-            html_message=html_message,
-            fail_silently=False
-        )
-        
-        return {
-            'success': True,
-            'method': 'email',
-            'recipient': order.wholesaler.email
-        }
-        
-    except Exception as e:
-        logger.error(f"Email notification failed: {str(e)}")
-        return {
-            'success': False,
-            'method': 'email',
-            'error': str(e)
-        }
+        result = _notify_wholesaler(order_id)
+    except Exception:
+        release(event_id)
+        raise
+    complete(event_id)
+    return result
 
 
-def send_order_api_notification(order, order_details):
+@shared_task
+def retry_order_notification(order_id, channel, attempt=1):
     """
-    Toptancının API'sine sipariş bildirimi gönder
+    Tek bir bildirim kanalını yeniden dener
+    NOTIFICATION_MAX_RETRIES denemeden sonra sipariş notlarına hata yazılır.
     """
-    try:
-        import requests
-        import json
-        
-        # Toptancının API endpoint'ini al (şimdilik mock)
-        # Gerçek uygulamada bu bilgi Company modelinde tutulabilir
-        api_endpoint = f"https://api.{order.wholesaler.name.lower().replace(' ', '')}.com/orders/incoming"
-        
-        # API payload'ı hazırla
-        payload = {
-            'source': 'tyrex_b2b',
-            'source_order_id': order.id,
-            'order_number': order_details['order_number'],
-            'retailer': {
-                'name': order_details['retailer_name'],
-                'email': order_details['retailer_email'],
-                'phone': order_details['retailer_phone'],
-                'contact_person': order_details['retailer_user']
-            },
-            'order_info': {
-                'total_amount': order_details['total_amount'],
-                'currency': order_details['currency'],
-                'payment_terms_days': order_details['payment_terms_days'],
-                'order_date': order_details['order_date'],
-                'notes': order_details['notes']
-            },
-            'delivery': {
-                'address': order_details['delivery_address'],
-                'contact': order_details['delivery_contact'],
-                'phone': order_details['delivery_phone']
-            },
-            'items': order_details['items']
-        }
-        
-        # API çağrısı yap
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {get_wholesaler_api_token(order.wholesaler)}',
-            'User-Agent': 'Tyrex-B2B/1.0'
-        }
-        
-        # Şimdilik mock response (gerçek API çağrısı devre dışı)
-        mock_api_call = True
-        
-        if mock_api_call:
-            # Simüle edilmiş başarılı response
-            response_data = {
-                'success': True,
-                'wholesaler_order_id': f"WHL-{order.id}-{timezone.now().strftime('%Y%m%d%H%M%S')}",
-                'estimated_processing_time': '2-3 iş günü',
-                'contact_person': 'Satış Departmanı',
-                'message': 'Sipariş başarıyla alındı ve işleme alınacak'
-            }
-            
-            return {
-                'success': True,
-                'method': 'api',
-                'endpoint': api_endpoint,
-                'response': response_data
-            }
+    order = _load_order(order_id)
+    if order is None:
+        logger.error(f"Order {order_id} not found")
+        return {'success': False, 'error': f'Sipariş ID {order_id} bulunamadı'}
+
+    results = dispatch(order, build_order_details(order), channels=[channel])
+    result = results[channel]
+    logger.info(f"Order {order.order_number} {channel} notification retry {attempt}: {result['success']}")
+
+    _confirm_if_delivered(order, results)
+
+    if needs_retry(result):
+        if attempt < getattr(settings, 'NOTIFICATION_MAX_RETRIES', 3):
+            _schedule_retries(retry_order_notification, [order.id], results, attempt)
         else:
-            # Gerçek API çağrısı
-            response = requests.post(
-                api_endpoint,
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                return {
-                    'success': True,
-                    'method': 'api',
-                    'endpoint': api_endpoint,
-                    'response': response.json()
-                }
-            else:
-                raise Exception(f"API Error {response.status_code}: {response.text}")
-        
-    except Exception as e:
-        logger.error(f"API notification failed: {str(e)}")
-        return {
-            'success': False,
-            'method': 'api',
-            'error': str(e)
-        }
+            _record_notification_failure([order], channel, result['error'])
+
+    return {
+        'success': result['success'],
+        'order_number': order.order_number,
+        'channel': channel,
+        'attempt': attempt,
+        'notification': result
+    }
 
 
-def send_order_sms_notification(order, order_details):
+def _send_digest(wholesaler, orders, channels):
+    results = dispatch_digest(
+        wholesaler, orders, [build_order_details(order) for order in orders], channels=channels
+    )
+    # Durum geçmişi sipariş bazında tutulur
+    for order in orders:
+        _confirm_if_delivered(order, results)
+    return results
+
+
+@shared_task
+def send_wholesaler_digest(wholesaler_id):
     """
-    SMS bildirimi gönder
+    Toptancının kuyruktaki siparişlerini kanal başına tek bildirimle gönderir
+    Kuyruk satırları kısa bir transaction'da silinerek alınır; eşzamanlı
+    görevler aynı siparişi iki kez göndermez.
     """
+    from companies.models import Company
+    from .models import OrderDigestEntry
+
+    wholesaler = Company.objects.filter(id=wholesaler_id).first()
+    if wholesaler is None:
+        return {'success': False, 'error': f'Şirket ID {wholesaler_id} bulunamadı'}
+
+    # Bundan sonraki sipariş yeni bir pencere açar
     try:
-        # SMS servis sağlayıcısına göre implementasyon
-        # Şimdilik mock implementation
-        
-        if not order.wholesaler.phone:
-            return {
-                'success': False,
-                'method': 'sms',
-                'error': 'Toptancı telefon numarası bulunamadı'
-            }
-        
-        message = f"""
-TYREX B2B - Yeni Sipariş
-Sipariş No: {order_details['order_number']}
-Perakendeci: {order_details['retailer_name']}
-Toplam: {order_details['total_amount']} {order_details['currency']}
-Detaylar için email'inizi kontrol edin.
-        """.strip()
-        
-        # Mock SMS gönderimi
-        logger.info(f"SMS would be sent to {order.wholesaler.phone}: {message}")
-        
-        return {
-            'success': True,
-            'method': 'sms',
-            'recipient': order.wholesaler.phone,
-            'message_length': len(message)
-        }
-        
+        cache.delete(_digest_window_key(wholesaler_id))
     except Exception as e:
-        logger.error(f"SMS notification failed: {str(e)}")
-        return {
-            'success': False,
-            'method': 'sms',
-            'error': str(e)
-        }
+        logger.warning(f"Digest window cache reset failed: {e}")
+
+    batch_size = max(1, wholesaler.notification_digest_max_orders)
+    with transaction.atomic():
+        entries = list(
+            OrderDigestEntry.objects.select_for_update(skip_locked=True).filter(
+                wholesaler_id=wholesaler_id
+            ).order_by('created_at', 'pk').values_list('pk', 'order_id')[:batch_size]
+        )
+        OrderDigestEntry.objects.filter(pk__in=[pk for pk, _ in entries]).delete()
+
+    if not entries:
+        return {'success': True, 'order_count': 0}
+
+    if len(entries) == batch_size and OrderDigestEntry.objects.filter(wholesaler_id=wholesaler_id).exists():
+        send_wholesaler_digest.delay(wholesaler_id)
+
+    orders = _digest_orders([order_id for _, order_id in entries])
+    if not orders:
+        return {'success': True, 'order_count': 0}
 
+    results = _send_digest(wholesaler, orders, channels=CHANNELS)
 
-def get_wholesaler_api_token(wholesaler):
+    logger.info(f"Digest for wholesaler {wholesaler_id} sent ({len(orders)} orders):")
+    for channel, result in results.items():
+        logger.info(f"  {channel}: {result['success']}")
+
+    _schedule_retries(retry_digest_notification, [wholesaler_id, [order.id for order in orders]], results)
+
+    return {
+        'success': True,
+        'order_count': len(orders),
+        'order_numbers': [order.order_number for order in orders],
+        'notifications': results
+    }
+
+
+@shared_task
+def retry_digest_notification(wholesaler_id, order_ids, channel, attempt=1):
     """
-    Toptancı için API token'ı al
-    Gerçek uygulamada bu bilgi güvenli bir şekilde saklanmalı
+    Özet bildiriminin tek bir kanalını aynı siparişlerle yeniden dener
     """
-    # Mock token
-    return f"tyrex_token_{wholesaler.id}_mock"
+    from companies.models import Company
+
+    wholesaler = Company.objects.filter(id=wholesaler_id).first()
+    orders = _digest_orders(order_ids)
+    if wholesaler is None or not orders:
+        return {'success': False, 'error': 'Özet bildirimi için sipariş bulunamadı'}
+
+    results = _send_digest(wholesaler, orders, channels=[channel])
+    result = results[channel]
+    logger.info(f"Digest for wholesaler {wholesaler_id} {channel} retry {attempt}: {result['success']}")
+
+    if needs_retry(result):
+        if attempt < getattr(settings, 'NOTIFICATION_MAX_RETRIES', 3):
+            _schedule_retries(retry_digest_notification, [wholesaler_id, order_ids], results, attempt)
+        else:
+            _record_notification_failure(orders, channel, result['error'])
+
+    return {
+        'success': result['success'],
+        'order_count': len(orders),
+        'channel': channel,
+        'attempt': attempt,
+        'notification': result
+    }
 
 
 @shared_task
 def update_order_status_batch():
     """
-    Toplu sipariş durumu güncelleme görevi
-    Günlük çalıştırılabilir (Celery Beat ile)
+    Uzun süredir bekleyen siparişleri işaretler (Celery beat ile günlük)
+    Parçalı ve kaldığı yerden devam edebilir (orders.batch_jobs.StaleOrderFlagger).
     """
-    try:
-        from .models import Order
-        from datetime import timedelta
-        
-        # Uzun süredir bekleyen siparişleri bul
-        cutoff_date = timezone.now() - timedelta(days=7)
-        
-        pending_orders = Order.objects.filter(
-            status='pending',
-            order_date__lt=cutoff_date
-        )
-        
-        updated_count = 0
-        for order in pending_orders:
-            order.internal_notes = f"7 günden uzun süredir bekleyen sipariş. Otomatik kontrol gerekli."
-            order.save(update_fields=['internal_notes'])
-            updated_count += 1
-        
-        logger.info(f"Batch status update completed: {updated_count} orders flagged")
-        
-        return {
-            'success': True,
-            'updated_orders': updated_count
-        }
-        
-    except Exception as e:
-        logger.error(f"Batch status update failed: {str(e)}")
-        return {
-            'success': False,
-            'error': str(e)
-        }
\ No newline at end of file
+    from core.batch import run_summary
+    from .batch_jobs import StaleOrderFlagger
+
+    run = StaleOrderFlagger().run()
+    logger.info(f"Batch status update completed: {run.affected} orders flagged")
+
+    return {
+        'success': True,
+        'updated_orders': run.affected,
+        **run_summary(run)
+    }
+
+
+@shared_task
+def archive_old_orders():
+    """
+    Eski kapanmış siparişleri arşive taşır (Celery beat ile günlük)
+    Önce gelecek ayların arşiv bölümleri oluşturulur.
+    """
+    from core.batch import run_summary
+    from .archive import ensure_archive_partitions, partition_window
+    from .batch_jobs import OrderArchiver
+
+    created = ensure_archive_partitions(*partition_window())
+    run = OrderArchiver().run()
+    logger.info(f"Order archive run: {run.affected} orders archived, {len(created)} partitions created")
+
+    return {
+        'success': True,
+        'archived_orders': run.affected,
+        'partitions_created': created,
+        **run_summary(run)
+    }
+
+
+@shared_task
+def relay_order_outbox():
+    """
+    Giden kutusundaki commit edilmiş sipariş olaylarını yayınlar (Celery beat ile periyodik)
+    """
+    from .outbox import relay_outbox
+
+    published = relay_outbox()
+    if published:
+        logger.info(f"Relayed {published} order outbox events")
+    return {
+        'success': True,
+        'published': published,
+    }
+
+
+@shared_task
+def prune_order_outbox():
+    """
+    Yayınlanmış eski giden kutusu olaylarını siler (Celery beat ile günlük)
+    """
+    from .outbox import prune_outbox
+
+    deleted = prune_outbox()
+    if deleted:
+        logger.info(f"Pruned {deleted} published order outbox events")
+    return {
+        'success': True,
+        'deleted': deleted,
+    }
+
+
+@shared_task
+def refresh_order_search_text(company_id, chunk_size=1000):
+    """
+    Şirket adı değişince şirketin siparişlerinin arama metnini yeniler
+    (perakendeci ve toptancı adları Order.search_text içinde tutulur)
+    """
+    from django.db.models import Q
+    from .models import Order
+
+    fields = ['id', *Order.SEARCH_FIELDS, *Order.SEARCH_RELATED]
+    orders = Order.objects.filter(
+        Q(retailer_id=company_id) | Q(wholesaler_id=company_id)
+    ).only(*fields).select_related(*Order.SEARCH_RELATED).order_by('id')
+
+    updated = 0
+    batch = []
+    for order in orders.iterator(chunk_size=chunk_size):
+        order.search_text = order.build_search_text()
+        batch.append(order)
+        if len(batch) >= chunk_size:
+            updated += Order.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        updated += Order.objects.bulk_update(batch, ['search_text'])
+
+    logger.info(f"Refreshed search text of {updated} orders for company {company_id}")
+    return {
+        'success': True,
+        'updated': updated,
+    }
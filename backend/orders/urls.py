@@ -1,7 +1,7 @@
 # backend/orders/urls.py
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import OrderViewSet, calculate_cart, order_statistics
+from .views import OrderViewSet, bulk_update_order_status, calculate_cart, order_statistics
 
 app_name = 'orders'
 
@@ -13,6 +13,7 @@ urlpatterns = [
     # Ek endpoint'ler (router'dan önce tanımla)
     path('calculate-cart/', calculate_cart, name='calculate_cart'),
     path('statistics/', order_statistics, name='order_statistics'),
+    path('bulk-status/', bulk_update_order_status, name='bulk_update_order_status'),
     
     # Router URL'leri
     path('', include(router.urls)),
@@ -1,22 +1,53 @@
 # backend/orders/views.py
-from rest_framework import viewsets, status, permissions
+from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q, Sum, Count, Avg
+from django.db.models import Sum, Count, Avg, prefetch_related_objects
 from django.db import transaction
+from django.http import Http404
 from django.utils import timezone
+from django.utils.dateparse import parse_date
+from core.conditional import conditional_view, probe_queryset
+from core.idempotency import idempotent
+from core.pagination import CursorOptInPagination
+from core.search import search_queryset
+from core.streaming import export_response, get_export_format
+from inventory.services import InsufficientStockError
 from subscriptions.permissions import IsSubscribed
-from .models import Order, OrderItem, OrderStatusHistory
+from .models import Order, OrderStatusHistory
+from .archive import get_archived_order
+from .export import EXPORT_FIELDS, export_queryset, iter_export_rows
+from .services import TRANSITION_CANCELABLE_STATUSES, cancel_orders, transition_orders
+from .rollups import company_stats, monthly_trend, status_counts, top_counterparties, totals
 from .serializers import (
     OrderCreateSerializer,
     OrderSerializer,
     OrderListSerializer,
     OrderStatusUpdateSerializer,
+    OrderBulkCancelSerializer,
+    OrderBulkStatusSerializer,
     CartCalculationSerializer
 )
 
 
+def order_summary_validators(view, request, *args, **kwargs):
+    """
+    Sipariş özeti ETag'i: filtrelenmiş siparişlerin MAX(updated_at) + COUNT
+
+    Özet son 30 günlük pencere içerdiği için zamanla değişir; ETag saat
+    dilimini de içerir ve Last-Modified kullanılmaz.
+    """
+    latest, count = probe_queryset(view.get_queryset())
+    company_id = getattr(request.user, 'company_id', None)
+    hour = timezone.now().strftime('%Y%m%d%H')
+    return (company_id, request.get_full_path(), latest, count, hour), None
+
+
+# Özet uç noktasında rollup tablosuyla karşılanabilen sorgu parametreleri
+ROLLUP_SUMMARY_FILTERS = {'status', 'wholesaler', 'date_from', 'date_to'}
+
+
 class OrderViewSet(viewsets.ModelViewSet):
     """
     Sipariş yönetimi ViewSet
@@ -26,8 +57,11 @@ class OrderViewSet(viewsets.ModelViewSet):
     GET /api/v1/orders/{id}/ - Sipariş detayı
     PUT/PATCH /api/v1/orders/{id}/ - Sipariş güncelle
     DELETE /api/v1/orders/{id}/ - Sipariş iptal et
+
+    Liste ?cursor= ile keyset sayfalamasına geçer (?no_count=true ile COUNT atlanır).
     """
     permission_classes = [IsAuthenticated, IsSubscribed]
+    pagination_class = CursorOptInPagination
     
     def get_queryset(self):
         """Kullanıcının sadece kendi şirketinin siparişlerini görmesini sağlar"""
@@ -66,18 +100,18 @@ class OrderViewSet(viewsets.ModelViewSet):
                 queryset = queryset.filter(order_date__lte=date_to)
             
             if search:
-                queryset = queryset.filter(
-                    Q(order_number__icontains=search) |
-                    Q(retailer__name__icontains=search) |
-                    Q(wholesaler__name__icontains=search) |
-                    Q(notes__icontains=search)
-                )
+                # Sipariş no, perakendeci/toptancı adı ve notlar (normalize edilmiş search_text, core.search)
+                queryset = search_queryset(queryset, search)
             
-            return queryset.select_related(
+            queryset = queryset.select_related(
                 'retailer', 'wholesaler', 'retailer_user'
-            ).prefetch_related(
-                'items__product', 'items__warehouse'
-            ).order_by('-created_at')
+            )
+            # Liste kalem detayı göstermez; adetler denormalize sayaçlardan okunur
+            if self.action not in ('list', 'export'):
+                queryset = queryset.prefetch_related(
+                    'items__product', 'items__warehouse'
+                )
+            return queryset.order_by('-created_at')
         
         return Order.objects.none()
     
@@ -91,8 +125,12 @@ class OrderViewSet(viewsets.ModelViewSet):
             return OrderStatusUpdateSerializer
         return OrderSerializer
     
+    @idempotent
     def create(self, request, *args, **kwargs):
-        """Yeni sipariş oluşturma"""
+        """
+        Yeni sipariş oluşturma
+        Idempotency-Key başlığıyla tekrarlanan istekler aynı siparişi döndürür.
+        """
         if not hasattr(request.user, 'company') or not request.user.company:
             return Response(
                 {'error': 'Sipariş vermek için bir şirkete bağlı olmalısınız.'},
@@ -112,6 +150,11 @@ class OrderViewSet(viewsets.ModelViewSet):
         try:
             order = serializer.save()
             
+            # Yanıttaki kalem detayları için ilişkileri toplu yükle
+            prefetch_related_objects(
+                [order], 'items__product__category', 'items__warehouse__company'
+            )
+            
             # Response için detaylı serializer kullan
             response_serializer = OrderSerializer(
                 order,
@@ -123,12 +166,34 @@ class OrderViewSet(viewsets.ModelViewSet):
                 'order': response_serializer.data
             }, status=status.HTTP_201_CREATED)
             
+        except InsufficientStockError as e:
+            # Doğrulamadan sonra eşzamanlı bir sipariş stoğu tüketti
+            return Response({
+                'error': 'Yetersiz stok. Sepetinizi güncelleyip tekrar deneyin.',
+                'code': 'insufficient_stock',
+                'shortages': e.as_dict()
+            }, status=status.HTTP_409_CONFLICT)
+            
         except Exception as e:
             return Response({
                 'error': 'Sipariş oluşturulurken hata oluştu.',
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Sipariş detayı
+        Canlı tabloda olmayan sipariş arşivdeyse arşivlenmiş hali döner.
+        """
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            company = getattr(request.user, 'company', None)
+            archive = get_archived_order(company, kwargs.get('pk')) if company else None
+            if archive is None:
+                raise
+            return Response({**archive.data, 'is_archived': True})
+    
     def destroy(self, request, *args, **kwargs):
         """Sipariş iptal etme (soft delete)"""
         instance = self.get_object()
@@ -139,36 +204,51 @@ class OrderViewSet(viewsets.ModelViewSet):
                 'error': f'{instance.get_status_display()} durumundaki sipariş iptal edilemez.'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Sipariş durumunu güncelle
-        with transaction.atomic():
-            instance.status = 'canceled'
-            instance.canceled_at = timezone.now()
-            instance.save(update_fields=['status', 'canceled_at'])
-            
-            # Stokları geri ekle
-            for item in instance.items.all():
-                item.stock_item.quantity += item.quantity
-                item.stock_item.save(update_fields=['quantity'])
-                
-                item.is_canceled = True
-                item.canceled_at = timezone.now()
-                item.cancel_reason = 'Sipariş iptal edildi'
-                item.save(update_fields=['is_canceled', 'canceled_at', 'cancel_reason'])
-            
-            # Durum geçmişi kaydet
-            OrderStatusHistory.objects.create(
-                order=instance,
-                old_status=instance.status,
-                new_status='canceled',
-                changed_by=request.user,
-                change_reason='Kullanıcı tarafından iptal edildi',
-                notes=f'Toplam {instance.get_total_items()} adet ürün stokları geri alındı'
-            )
+        # Sipariş durumunu güncelle ve stokları geri ekle
+        result = cancel_orders([instance.pk], user=request.user)
+        if not result.canceled:
+            # Kontrol ile kilit arasında durum değişti
+            return Response({
+                'error': 'Sipariş durumu değiştiği için iptal edilemedi.'
+            }, status=status.HTTP_409_CONFLICT)
         
         return Response({
             'message': f'Sipariş #{instance.order_number} başarıyla iptal edildi.'
         })
     
+    @action(detail=False, methods=['post'])
+    @idempotent
+    def bulk_cancel(self, request):
+        """
+        Toplu sipariş iptali
+        POST /api/v1/orders/orders/bulk_cancel/
+        {"order_ids": [1, 2, 3], "reason": "..."}
+        Sadece erişilebilen ve iptal edilebilir durumdaki siparişler iptal edilir.
+        """
+        serializer = OrderBulkCancelSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order_ids = serializer.validated_data['order_ids']
+        
+        # Yetki: kullanıcının görebildiği siparişler
+        visible_ids = set(
+            self.get_queryset().filter(pk__in=order_ids).values_list('pk', flat=True)
+        )
+        result = cancel_orders(
+            visible_ids,
+            user=request.user,
+            reason=serializer.validated_data.get('reason') or 'Kullanıcı tarafından toplu iptal'
+        )
+        
+        return Response({
+            'message': f'{len(result.canceled)} sipariş iptal edildi.',
+            'canceled': [
+                {'id': order.id, 'order_number': order.order_number}
+                for order in result.canceled
+            ],
+            'skipped_ids': sorted(set(order_ids) - {order.id for order in result.canceled}),
+            'restocked_quantity': result.restocked
+        })
+    
     @action(detail=True, methods=['post'])
     def update_status(self, request, pk=None):
         """
@@ -187,6 +267,23 @@ class OrderViewSet(viewsets.ModelViewSet):
         new_status = serializer.validated_data['status']
         notes = serializer.validated_data.get('notes', '')
         
+        if new_status == 'canceled':
+            # İptal tüm API yollarında aynı servisle yapılır (stoklar geri eklenir)
+            result = cancel_orders(
+                [order.pk], user=request.user, reason='Manuel durum güncelleme', notes=notes,
+                statuses=TRANSITION_CANCELABLE_STATUSES
+            )
+            if not result.canceled:
+                # Doğrulama ile kilit arasında durum değişti
+                return Response({
+                    'error': 'Sipariş durumu değiştiği için iptal edilemedi.'
+                }, status=status.HTTP_409_CONFLICT)
+            order = self.get_object()
+            return Response({
+                'message': f'Sipariş durumu {order.get_status_display()} olarak güncellendi.',
+                'order': OrderSerializer(order, context={'request': request}).data
+            })
+        
         with transaction.atomic():
             order.status = new_status
             
@@ -198,8 +295,6 @@ class OrderViewSet(viewsets.ModelViewSet):
             elif new_status == 'delivered':
                 order.delivered_at = timezone.now()
                 order.payment_status = 'paid'  # Teslim edilen sipariş ödenmiş sayılır
-            elif new_status == 'canceled':
-                order.canceled_at = timezone.now()
             
             order.save()
             
@@ -218,6 +313,24 @@ class OrderViewSet(viewsets.ModelViewSet):
             'order': OrderSerializer(order, context={'request': request}).data
         })
     
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Muhasebe için sipariş dışa aktarımı (akış, kalem başına bir satır)
+        GET /api/v1/orders/export/?export_format=csv|ndjson|xlsx&date_from=2025-01-01
+
+        Liste filtrelerini kabul eder (status, payment_status, wholesaler,
+        date_from, date_to, search).
+        """
+        export_format = get_export_format(request, default='csv')
+        started_at = timezone.now()
+        return export_response(
+            iter_export_rows(export_queryset(self.get_queryset())),
+            export_format,
+            filename=f"tyrex-siparisler-{started_at:%Y%m%d%H%M%S}",
+            fieldnames=EXPORT_FIELDS,
+        )
+    
     @action(detail=True, methods=['get'])
     def status_history(self, request, pk=None):
         """
@@ -253,22 +366,110 @@ class OrderViewSet(viewsets.ModelViewSet):
             'history': history_data
         })
     
+    def _summary_rollup_stats(self):
+        """
+        Özet için OrderDailyStats satırları
+        Filtreler rollup ile karşılanamıyorsa (ödeme durumu, arama vb.) None döner.
+        """
+        company = getattr(self.request.user, 'company', None)
+        if company is None:
+            return None
+        
+        params = {key: value for key, value in self.request.query_params.items() if value}
+        if set(params) - ROLLUP_SUMMARY_FILTERS:
+            return None
+        
+        if company.company_type in ['retailer', 'both']:
+            role = 'retailer'
+        elif company.company_type == 'wholesaler':
+            role = 'wholesaler'
+        else:
+            return None
+        
+        stats = company_stats(company, role)
+        if params.get('status'):
+            stats = stats.filter(status=params['status'])
+        if params.get('wholesaler') and role == 'retailer':
+            if not params['wholesaler'].isdigit():
+                return None
+            stats = stats.filter(counterparty_id=params['wholesaler'])
+        # order_date__gte/__lte ile aynı anlam: gün başlangıcına göre karşılaştırma
+        for param, lookup in (('date_from', 'date__gte'), ('date_to', 'date__lt')):
+            if params.get(param):
+                value = parse_date(params[param])
+                if value is None:
+                    return None
+                stats = stats.filter(**{lookup: value})
+        return stats
+    
+    def _summary_from_orders(self, queryset):
+        """
+        Rollup ile karşılanamayan filtreler için sipariş tablosundan özet
+        Sadece canlı siparişleri kapsar; arşive taşınmış siparişler dahil değildir.
+        """
+        total_orders = queryset.count()
+        total_amount = queryset.aggregate(total=Sum('total_amount'))['total'] or 0
+        
+        # Duruma göre dağılım (tek GROUP BY)
+        status_summary = {}
+        counts = dict(
+            queryset.order_by().values_list('status').annotate(count=Count('id'))
+        )
+        for status_code, status_name in Order.STATUS_CHOICES:
+            count = counts.get(status_code, 0)
+            if count > 0:
+                status_summary[status_code] = {
+                    'name': status_name,
+                    'count': count,
+                    'percentage': round((count / total_orders * 100), 1) if total_orders > 0 else 0
+                }
+        
+        # Son 30 günlük trend
+        from datetime import timedelta
+        thirty_days_ago = timezone.now() - timedelta(days=30)
+        recent = queryset.filter(order_date__gte=thirty_days_ago).aggregate(
+            count=Count('id'),
+            total=Sum('total_amount'),
+            avg=Avg('total_amount')
+        )
+        
+        return {
+            'total_orders': total_orders,
+            'total_amount': str(total_amount),
+            'currency': 'TRY',
+            'status_distribution': status_summary,
+            'recent_30_days': {
+                'count': recent['count'],
+                'amount': str(recent['total'] or 0),
+                'average_order_value': str(recent['avg'] or 0)
+            },
+            'includes_archived': False,
+            'note': 'Ödeme durumu/arama filtreleriyle özet sadece canlı siparişleri kapsar; arşivlenmiş siparişler dahil değildir.'
+        }
+    
     @action(detail=False, methods=['get'])
+    @conditional_view(order_summary_validators)
     def summary(self, request):
         """
         Sipariş özeti
         GET /api/v1/orders/summary/
+        
+        Sipariş tablosu yerine OrderDailyStats rollup satırlarını okur (arşivlenmiş
+        siparişler dahil). Rollup ile karşılanamayan filtrelerde (payment_status,
+        search) sipariş tablosu taranır ve özet sadece canlı siparişleri kapsar;
+        yanıttaki includes_archived alanı hangisinin kullanıldığını belirtir.
         """
-        queryset = self.get_queryset()
+        stats = self._summary_rollup_stats()
+        if stats is None:
+            return Response(self._summary_from_orders(self.get_queryset()))
         
-        # Genel istatistikler
-        total_orders = queryset.count()
-        total_amount = queryset.aggregate(total=Sum('total_amount'))['total'] or 0
+        total_orders, total_amount, _ = totals(stats)
         
         # Duruma göre dağılım
         status_summary = {}
+        counts = status_counts(stats)
         for status_code, status_name in Order.STATUS_CHOICES:
-            count = queryset.filter(status=status_code).count()
+            count = counts.get(status_code, 0)
             if count > 0:
                 status_summary[status_code] = {
                     'name': status_name,
@@ -276,10 +477,11 @@ class OrderViewSet(viewsets.ModelViewSet):
                     'percentage': round((count / total_orders * 100), 1) if total_orders > 0 else 0
                 }
         
-        # Son 30 günlük trend
+        # Son 30 günlük trend (gün bazında)
         from datetime import timedelta
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        recent_orders = queryset.filter(order_date__gte=thirty_days_ago)
+        recent_count, recent_amount, recent_average = totals(
+            stats.filter(date__gte=timezone.localdate() - timedelta(days=30))
+        )
         
         summary = {
             'total_orders': total_orders,
@@ -287,12 +489,11 @@ class OrderViewSet(viewsets.ModelViewSet):
             'currency': 'TRY',
             'status_distribution': status_summary,
             'recent_30_days': {
-                'count': recent_orders.count(),
-                'amount': str(recent_orders.aggregate(total=Sum('total_amount'))['total'] or 0),
-                'average_order_value': str(
-                    recent_orders.aggregate(avg=Avg('total_amount'))['avg'] or 0
-                )
-            }
+                'count': recent_count,
+                'amount': str(recent_amount),
+                'average_order_value': str(recent_average)
+            },
+            'includes_archived': True
         }
         
         return Response(summary)
@@ -304,6 +505,8 @@ def calculate_cart(request):
     """
     Sepet hesaplama - Sipariş vermeden önce fiyat kontrolü
     POST /api/v1/orders/calculate-cart/
+    
+    {"hold": true} ile seçilen stoklar STOCK_RESERVATION_TTL süresince rezerve edilir.
     """
     if not hasattr(request.user, 'company') or not request.user.company:
         return Response(
@@ -325,6 +528,14 @@ def calculate_cart(request):
             'cart': cart_data
         })
         
+    except InsufficientStockError as e:
+        # Rezervasyon sırasında stok başka bir sepete/siparişe gitti
+        return Response({
+            'error': 'Yetersiz stok. Sepetinizi güncelleyip tekrar deneyin.',
+            'code': 'insufficient_stock',
+            'shortages': e.as_dict()
+        }, status=status.HTTP_409_CONFLICT)
+        
     except Exception as e:
         return Response({
             'error': 'Sepet hesaplanırken hata oluştu.',
@@ -338,6 +549,8 @@ def order_statistics(request):
     """
     Sipariş istatistikleri
     GET /api/v1/orders/statistics/
+    
+    OrderDailyStats rollup tablosundan hesaplanır (sipariş taraması yok).
     """
     if not hasattr(request.user, 'company') or not request.user.company:
         return Response(
@@ -349,88 +562,110 @@ def order_statistics(request):
     
     # Perakendeci istatistikleri
     if company.company_type in ['retailer', 'both']:
-        orders = Order.objects.filter(retailer=company)
-        
+        role = 'retailer'
+    # Toptancı istatistikleri
+    elif company.company_type == 'wholesaler':
+        role = 'wholesaler'
+    else:
+        return Response(
+            {'error': 'Geçersiz şirket türü.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Tüm değerler OrderDailyStats rollup satırlarından okunur
+    rollup = company_stats(company, role)
+    total_orders, total_amount, average_order_value = totals(rollup)
+    
+    # Duruma göre sipariş sayıları
+    orders_by_status = {}
+    counts = status_counts(rollup)
+    for status_code, status_name in Order.STATUS_CHOICES:
+        count = counts.get(status_code, 0)
+        if count > 0:
+            orders_by_status[status_code] = {
+                'name': status_name,
+                'count': count
+            }
+    
+    # En çok sipariş verilen toptancılar / sipariş veren perakendeciler
+    top_counterparties_data = [
+        {
+            'name': row['counterparty__name'],
+            'order_count': row['order_count'],
+            'total_amount': str(row['amount'])
+        }
+        for row in top_counterparties(rollup)
+    ]
+    
+    if role == 'retailer':
         stats = {
             'role': 'retailer',
-            'total_orders': orders.count(),
-            'total_spent': str(orders.aggregate(total=Sum('total_amount'))['total'] or 0),
-            'average_order_value': str(orders.aggregate(avg=Avg('total_amount'))['avg'] or 0),
-            'orders_by_status': {},
-            'top_wholesalers': [],
-            'monthly_trend': []
+            'total_orders': total_orders,
+            'total_spent': str(total_amount),
+            'average_order_value': str(average_order_value),
+            'orders_by_status': orders_by_status,
+            'top_wholesalers': top_counterparties_data,
+            'monthly_trend': monthly_trend(rollup)
         }
-        
-        # Duruma göre sipariş sayıları
-        for status_code, status_name in Order.STATUS_CHOICES:
-            count = orders.filter(status=status_code).count()
-            if count > 0:
-                stats['orders_by_status'][status_code] = {
-                    'name': status_name,
-                    'count': count
-                }
-        
-        # En çok sipariş verilen toptancılar
-        top_wholesalers = orders.values(
-            'wholesaler__name'
-        ).annotate(
-            order_count=Count('id'),
-            total_amount=Sum('total_amount')
-        ).order_by('-order_count')[:5]
-        
-        stats['top_wholesalers'] = [
-            {
-                'name': w['wholesaler__name'],
-                'order_count': w['order_count'],
-                'total_amount': str(w['total_amount'])
-            }
-            for w in top_wholesalers
-        ]
-    
-    # Toptancı istatistikleri
-    elif company.company_type == 'wholesaler':
-        orders = Order.objects.filter(wholesaler=company)
-        
+    else:
         stats = {
             'role': 'wholesaler',
-            'total_orders': orders.count(),
-            'total_revenue': str(orders.aggregate(total=Sum('total_amount'))['total'] or 0),
-            'average_order_value': str(orders.aggregate(avg=Avg('total_amount'))['avg'] or 0),
-            'orders_by_status': {},
-            'top_retailers': [],
-            'monthly_trend': []
+            'total_orders': total_orders,
+            'total_revenue': str(total_amount),
+            'average_order_value': str(average_order_value),
+            'orders_by_status': orders_by_status,
+            'top_retailers': top_counterparties_data,
+            'monthly_trend': monthly_trend(rollup)
         }
-        
-        # Duruma göre sipariş sayıları
-        for status_code, status_name in Order.STATUS_CHOICES:
-            count = orders.filter(status=status_code).count()
-            if count > 0:
-                stats['orders_by_status'][status_code] = {
-                    'name': status_name,
-                    'count': count
-                }
-        
-        # En çok sipariş veren perakendeciler
-        top_retailers = orders.values(
-            'retailer__name'
-        ).annotate(
-            order_count=Count('id'),
-            total_amount=Sum('total_amount')
-        ).order_by('-order_count')[:5]
-        
-        stats['top_retailers'] = [
-            {
-                'name': r['retailer__name'],
-                'order_count': r['order_count'],
-                'total_amount': str(r['total_amount'])
-            }
-            for r in top_retailers
-        ]
     
-    else:
+    return Response(stats)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsSubscribed])
+@idempotent
+def bulk_update_order_status(request):
+    """
+    Toplu sipariş durumu güncelleme
+    POST /api/v1/orders/bulk-status/
+    
+    {"order_ids": [1, 2], "status": "confirmed", "notes": "..."}
+    veya {"updates": [{"order_id": 1, "status": "shipped"}, ...]}
+    Geçişler sipariş bazında kontrol edilir; yanıt sipariş başına sonuç içerir.
+    """
+    company = getattr(request.user, 'company', None)
+    if not company:
         return Response(
-            {'error': 'Geçersiz şirket türü.'},
+            {'error': 'Sipariş güncellemek için bir şirkete bağlı olmalısınız.'},
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    return Response(stats)
\ No newline at end of file
+    serializer = OrderBulkStatusSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    changes = serializer.validated_data['changes']
+    
+    # Yetki: perakendeci verdiği, toptancı aldığı siparişleri güncelleyebilir
+    if company.company_type in ['retailer', 'both']:
+        visible = Order.objects.filter(retailer=company)
+    else:
+        visible = Order.objects.filter(wholesaler=company)
+    visible_ids = set(visible.filter(pk__in=changes.keys()).values_list('pk', flat=True))
+    
+    outcomes = transition_orders(
+        {order_id: new_status for order_id, new_status in changes.items() if order_id in visible_ids},
+        user=request.user,
+        reason='Toplu durum güncelleme',
+        notes=serializer.validated_data.get('notes', '')
+    )
+    
+    results = []
+    for order_id, new_status in changes.items():
+        outcome = outcomes.get(order_id, {'outcome': 'not_found', 'error': 'Sipariş bulunamadı.'})
+        results.append({'order_id': order_id, 'requested_status': new_status, **outcome})
+    
+    updated = sum(1 for result in results if result['outcome'] == 'updated')
+    return Response({
+        'message': f'{updated} siparişin durumu güncellendi.',
+        'updated': updated,
+        'failed': len(results) - updated,
+        'results': results
+    })
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from products.models import Product
+from products.specs import SPEC_VALUE_FIELDS, spec_values
+
+
+class Command(BaseCommand):
+    help = 'Ürünlerin tipli özellik kolonlarını (*_value) metin alanlarından yeniden doldurur'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Tek seferde güncellenecek ürün sayısı',
+        )
+        parser.add_argument(
+            '--only-missing',
+            action='store_true',
+            help='Sadece hiç doldurulmamış ürünleri işle',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        value_fields = list(SPEC_VALUE_FIELDS.values())
+
+        queryset = Product.objects.only('id', *SPEC_VALUE_FIELDS, *value_fields).order_by('id')
+        if options['only_missing']:
+            queryset = queryset.filter(**{f'{field}__isnull': True for field in value_fields})
+
+        self.stdout.write('🔄 Ürün özellik değerleri hesaplanıyor...')
+
+        updated = 0
+        batch = []
+        for product in queryset.iterator(chunk_size=chunk_size):
+            for field, value in spec_values(product).items():
+                setattr(product, field, value)
+            batch.append(product)
+            if len(batch) >= chunk_size:
+                Product.objects.bulk_update(batch, value_fields)
+                updated += len(batch)
+                batch = []
+        if batch:
+            Product.objects.bulk_update(batch, value_fields)
+            updated += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ {updated} ürün güncellendi.'))
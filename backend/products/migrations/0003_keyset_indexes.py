@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_product_battery_ampere_product_battery_voltage_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['-created_at', '-id'], name='products_pr_created_e6f9fc_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:05
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Ad, marka, SKU ve modelin normalize edilmiş hali', verbose_name='Arama Metni'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True, verbose_name='Arama Vektörü'),
+        ),
+    ]
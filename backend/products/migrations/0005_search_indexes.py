@@ -0,0 +1,50 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from core.db import postgres_only_sql
+from core.search import build_search_text
+
+
+def backfill_search_text(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+
+    batch = []
+    for product in Product.objects.only('id', 'name', 'brand', 'sku', 'model').iterator(chunk_size=1000):
+        product.search_text = build_search_text(product.name, product.brand, product.sku, product.model)
+        batch.append(product)
+        if len(batch) >= 1000:
+            Product.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        Product.objects.bulk_update(batch, ['search_text'])
+
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "UPDATE products_product SET search_vector = to_tsvector('simple', search_text)"
+        )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY transaction içinde çalışamaz
+    atomic = False
+
+    dependencies = [
+        ('products', '0004_search'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        postgres_only_sql(
+            [
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS products_product_search_vector_gin "
+                "ON products_product USING gin (search_vector)",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS products_product_search_text_trgm "
+                "ON products_product USING gin (search_text gin_trgm_ops)",
+            ],
+            [
+                "DROP INDEX CONCURRENTLY IF EXISTS products_product_search_vector_gin",
+                "DROP INDEX CONCURRENTLY IF EXISTS products_product_search_text_trgm",
+            ],
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='battery_ampere_value',
+            field=models.DecimalField(blank=True, decimal_places=1, editable=False, max_digits=6, null=True, verbose_name='Akü Amperesi (Ah)'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rim_size_value',
+            field=models.DecimalField(blank=True, decimal_places=1, editable=False, max_digits=6, null=True, verbose_name='Jant Boyutu (inç)'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='tire_aspect_ratio_value',
+            field=models.DecimalField(blank=True, decimal_places=1, editable=False, max_digits=6, null=True, verbose_name='Lastik Yan Oranı (sayı)'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='tire_diameter_value',
+            field=models.DecimalField(blank=True, decimal_places=1, editable=False, max_digits=6, null=True, verbose_name='Lastik Çapı (inç)'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='tire_width_value',
+            field=models.DecimalField(blank=True, decimal_places=1, editable=False, max_digits=6, null=True, verbose_name='Lastik Genişliği (mm)'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['tire_width_value', 'tire_aspect_ratio_value', 'tire_diameter_value'], name='products_pr_tire_wi_6b519d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['tire_diameter_value'], name='products_pr_tire_di_18fdb3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['battery_ampere_value'], name='products_pr_battery_c53129_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['rim_size_value'], name='products_pr_rim_siz_0715e0_idx'),
+        ),
+    ]
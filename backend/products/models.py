@@ -1,6 +1,10 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from core.search import build_search_text, refresh_search_vectors
+from .specs import SPEC_VALUE_FIELDS, spec_values
+
 class Category(models.Model):
     """
     Ürün kategorileri - Hiyerarşik yapı destekler
@@ -211,6 +215,28 @@ class Product(models.Model):
         help_text=_('Örn: 5x112, 4x100')
     )
     
+    # Tipli özellik değerleri (products.specs) - save() ile metin alanlarından doldurulur
+    tire_width_value = models.DecimalField(
+        _('Lastik Genişliği (mm)'), max_digits=6, decimal_places=1,
+        blank=True, null=True, editable=False
+    )
+    tire_aspect_ratio_value = models.DecimalField(
+        _('Lastik Yan Oranı (sayı)'), max_digits=6, decimal_places=1,
+        blank=True, null=True, editable=False
+    )
+    tire_diameter_value = models.DecimalField(
+        _('Lastik Çapı (inç)'), max_digits=6, decimal_places=1,
+        blank=True, null=True, editable=False
+    )
+    battery_ampere_value = models.DecimalField(
+        _('Akü Amperesi (Ah)'), max_digits=6, decimal_places=1,
+        blank=True, null=True, editable=False
+    )
+    rim_size_value = models.DecimalField(
+        _('Jant Boyutu (inç)'), max_digits=6, decimal_places=1,
+        blank=True, null=True, editable=False
+    )
+    
     # Durum bilgileri
     is_active = models.BooleanField(_('Aktif'), default=True)
     is_digital = models.BooleanField(_('Dijital Ürün'), default=False)
@@ -246,18 +272,68 @@ class Product(models.Model):
         null=True
     )
     
+    # Arama (core.search) - save() ile güncellenir
+    search_text = models.TextField(
+        _('Arama Metni'),
+        blank=True,
+        default='',
+        editable=False,
+        help_text=_('Ad, marka, SKU ve modelin normalize edilmiş hali')
+    )
+    search_vector = SearchVectorField(_('Arama Vektörü'), blank=True, null=True, editable=False)
+    
     # Meta bilgiler
     created_at = models.DateTimeField(_('Oluşturulma Tarihi'), auto_now_add=True)
     updated_at = models.DateTimeField(_('Güncellenme Tarihi'), auto_now=True)
     
+    SEARCH_FIELDS = ('name', 'brand', 'sku', 'model')
+    
     class Meta:
         verbose_name = _('Ürün')
         verbose_name_plural = _('Ürünler')
         ordering = ['-created_at']
+        indexes = [
+            # Pazaryeri keyset sayfalaması (-created_at, -id)
+            models.Index(fields=['-created_at', '-id']),
+            # Özellik aramaları (ebat eşleşmesi ve çap aralığı)
+            models.Index(fields=['tire_width_value', 'tire_aspect_ratio_value', 'tire_diameter_value']),
+            models.Index(fields=['tire_diameter_value']),
+            models.Index(fields=['battery_ampere_value']),
+            models.Index(fields=['rim_size_value']),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.sku})"
     
+    def save(self, *args, **kwargs):
+        """
+        Türetilmiş alanları günceller: tipli özellik değerleri, arama metni
+        ve (PostgreSQL'de) arama vektörü
+        """
+        update_fields = kwargs.get('update_fields')
+        search_changed = update_fields is None or bool(set(update_fields) & set(self.SEARCH_FIELDS))
+        specs_changed = update_fields is None or bool(set(update_fields) & set(SPEC_VALUE_FIELDS))
+        
+        if specs_changed:
+            values = spec_values(self)
+            for field, value in values.items():
+                setattr(self, field, value)
+            if update_fields is not None:
+                update_fields = kwargs['update_fields'] = {*update_fields, *values}
+        
+        if search_changed:
+            self.search_text = self.build_search_text()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'search_text'}
+        
+        super().save(*args, **kwargs)
+        
+        if search_changed:
+            refresh_search_vectors(type(self)._base_manager.filter(pk=self.pk))
+    
+    def build_search_text(self):
+        return build_search_text(self.name, self.brand, self.sku, self.model)
+    
     def get_main_image(self):
         """Ana ürün resmini döndürür (gelecekte image modeli eklendiğinde)"""
         # TODO: ProductImage modeli eklendiğinde implement edilecek
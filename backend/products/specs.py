@@ -0,0 +1,169 @@
+# backend/products/specs.py
+"""
+Ürün teknik özelliklerinin (lastik/akü/jant) sayısal hale getirilmesi
+
+Product üzerindeki serbest metin alanları ("60Ah", '17"', "R17") kaydedilirken
+tipli *_value kolonlarına çözümlenir. Filtreler bu kolonlar üzerinde çalışır;
+böylece eşitlik ve aralık sorguları bileşik indekslerle karşılanır.
+
+Arama ifadesi ayrıştırıcısı şu biçimleri kabul eder:
+- "225/45R17", "225/45 ZR17", "225 45 17", "225/45/17"  → ebat eşleşmesi
+- "çap 16-18", "diameter 16–18", "genişlik 205..225"       → aralık
+- "amper 60-74", "jant 17"                                  → tek değer/aralık
+"""
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Q
+
+from core.search import normalize_search_text
+
+
+# Kaynak metin alanı → tipli kolon
+SPEC_VALUE_FIELDS = {
+    'tire_width': 'tire_width_value',
+    'tire_aspect_ratio': 'tire_aspect_ratio_value',
+    'tire_diameter': 'tire_diameter_value',
+    'battery_ampere': 'battery_ampere_value',
+    'rim_size': 'rim_size_value',
+}
+
+# Arama ifadesindeki anahtar kelimeler (normalize edilmiş) → kaynak alan
+SPEC_KEYWORDS = {
+    'width': 'tire_width',
+    'genislik': 'tire_width',
+    'taban': 'tire_width',
+    'aspect': 'tire_aspect_ratio',
+    'oran': 'tire_aspect_ratio',
+    'yanak': 'tire_aspect_ratio',
+    'diameter': 'tire_diameter',
+    'cap': 'tire_diameter',
+    'ampere': 'battery_ampere',
+    'amper': 'battery_ampere',
+    'ah': 'battery_ampere',
+    'rim': 'rim_size',
+    'jant': 'rim_size',
+}
+
+_NUMBER_RE = re.compile(r'\d+(?:[.,]\d+)?')
+_TIRE_SIZE_RE = re.compile(
+    r'(?P<width>\d{3})\s*[/\s]\s*(?P<aspect>\d{2})[\s/]*(?:z?r)?\s*(?P<diameter>\d{2}(?:[.,]\d)?)'
+)
+_RANGE_RE = re.compile(
+    r'(?P<keyword>[a-z]+)\s*:?\s*(?P<low>\d+(?:[.,]\d+)?)\s*(?:(?:-|–|—|\.\.)\s*(?P<high>\d+(?:[.,]\d+)?))?'
+)
+
+
+def parse_number(value):
+    """
+    Serbest metinden ilk sayıyı Decimal olarak çıkarır
+    "60Ah" → 60, '17"' → 17, "R22,5" → 22.5, boş/geçersiz → None
+    """
+    if value in (None, ''):
+        return None
+    match = _NUMBER_RE.search(str(value))
+    if not match:
+        return None
+    try:
+        return Decimal(match.group().replace(',', '.'))
+    except InvalidOperation:
+        return None
+
+
+def spec_values(product):
+    """Ürünün metin alanlarından tipli özellik değerlerini hesaplar"""
+    return {
+        value_field: parse_number(getattr(product, source_field))
+        for source_field, value_field in SPEC_VALUE_FIELDS.items()
+    }
+
+
+def parse_tire_size(text):
+    """
+    "225/45R17" gibi bir lastik ebatını çözümler
+    Dönüş: {'tire_width': 225, 'tire_aspect_ratio': 45, 'tire_diameter': 17} veya None
+    """
+    match = _TIRE_SIZE_RE.search(normalize_search_text(text))
+    if not match:
+        return None
+    return {
+        'tire_width': Decimal(match.group('width')),
+        'tire_aspect_ratio': Decimal(match.group('aspect')),
+        'tire_diameter': Decimal(match.group('diameter').replace(',', '.')),
+    }
+
+
+def parse_spec_query(text):
+    """
+    Arama ifadesini özellik aralıklarına çevirir
+    Dönüş: {'tire_diameter': (16, 18), 'tire_width': (225, 225), ...}
+    """
+    text = normalize_search_text(text)
+    ranges = {}
+
+    tire_size = parse_tire_size(text)
+    if tire_size:
+        for field, value in tire_size.items():
+            ranges[field] = (value, value)
+        text = _TIRE_SIZE_RE.sub(' ', text)
+
+    for match in _RANGE_RE.finditer(text):
+        field = SPEC_KEYWORDS.get(match.group('keyword'))
+        if field is None:
+            continue
+        low = parse_number(match.group('low'))
+        high = parse_number(match.group('high')) if match.group('high') else low
+        ranges[field] = (min(low, high), max(low, high))
+
+    return ranges
+
+
+def spec_range_q(field, low=None, high=None, prefix=''):
+    """Kaynak alan adına göre tipli kolon üzerinde aralık koşulu üretir"""
+    value_field = f"{prefix}{SPEC_VALUE_FIELDS[field]}"
+    condition = Q()
+    if low is not None and low == high:
+        return Q(**{value_field: low})
+    if low is not None:
+        condition &= Q(**{f'{value_field}__gte': low})
+    if high is not None:
+        condition &= Q(**{f'{value_field}__lte': high})
+    return condition
+
+
+def spec_exact_q(field, value, prefix=''):
+    """
+    Tek bir özellik değeri için koşul
+    Sayıya çevrilebiliyorsa tipli kolon, değilse metin alanı kullanılır.
+    """
+    number = parse_number(value) if field in SPEC_VALUE_FIELDS else None
+    if number is None:
+        return Q(**{f'{prefix}{field}': value})
+    return spec_range_q(field, number, number, prefix=prefix)
+
+
+def apply_spec_filters(queryset, params, prefix=''):
+    """
+    Sorgu parametrelerindeki özellik filtrelerini uygular
+
+    - <alan>=17            → tam eşleşme (tipli kolon)
+    - <alan>_min / _max    → aralık (ör. tire_diameter_min=16&tire_diameter_max=18)
+    - spec="225/45R17"     → ayrıştırıcı ile eşleşme/aralık
+    prefix: ilişkili modelden filtrelerken (ör. 'product__')
+    """
+    for field in SPEC_VALUE_FIELDS:
+        value = params.get(field)
+        if value not in (None, ''):
+            queryset = queryset.filter(spec_exact_q(field, value, prefix=prefix))
+
+        low = parse_number(params.get(f'{field}_min'))
+        high = parse_number(params.get(f'{field}_max'))
+        if low is not None or high is not None:
+            queryset = queryset.filter(spec_range_q(field, low, high, prefix=prefix))
+
+    spec = params.get('spec')
+    if spec:
+        for field, (low, high) in parse_spec_query(spec).items():
+            queryset = queryset.filter(spec_range_q(field, low, high, prefix=prefix))
+
+    return queryset
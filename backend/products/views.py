@@ -1,7 +1,11 @@
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Q
+
+from core.conditional import conditional_view, probe_queryset
+from core.search import search_queryset
+from .specs import apply_spec_filters
 from .models import Product, Category, Attribute
 from .serializers import (
     ProductSerializer, 
@@ -25,16 +29,7 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         brand = self.request.query_params.get('brand')
         search = self.request.query_params.get('search')
         
-        # Lastik için özel filtreler
-        tire_width = self.request.query_params.get('tire_width')
-        tire_aspect_ratio = self.request.query_params.get('tire_aspect_ratio') 
-        tire_diameter = self.request.query_params.get('tire_diameter')
-        
-        # Akü için özel filtreler
-        battery_ampere = self.request.query_params.get('battery_ampere')
-        
-        # Jant için özel filtreler
-        rim_size = self.request.query_params.get('rim_size')
+        # Jant bijon deseni metin olarak eşleşir; diğer özellikler tipli kolonlardan
         rim_bolt_pattern = self.request.query_params.get('rim_bolt_pattern')
 
         if category_id:
@@ -43,27 +38,18 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         if brand:
             queryset = queryset.filter(brand__icontains=brand)
             
-        if tire_width:
-            queryset = queryset.filter(tire_width=tire_width)
-        if tire_aspect_ratio:
-            queryset = queryset.filter(tire_aspect_ratio=tire_aspect_ratio)
-        if tire_diameter:
-            queryset = queryset.filter(tire_diameter=tire_diameter)
-            
-        if battery_ampere:
-            queryset = queryset.filter(battery_ampere=battery_ampere)
-            
-        if rim_size:
-            queryset = queryset.filter(rim_size=rim_size)
+        # Lastik/akü/jant özellikleri: tam değer, _min/_max aralıkları ve ?spec=225/45R17
+        queryset = apply_spec_filters(queryset, self.request.query_params)
+        
         if rim_bolt_pattern:
             queryset = queryset.filter(rim_bolt_pattern=rim_bolt_pattern)
 
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) |
-                Q(sku__icontains=search) |
-                Q(brand__icontains=search) |
-                Q(category__name__icontains=search)
+            queryset = search_queryset(
+                queryset, search,
+                extra_filter=Q(category_id__in=Category.objects.filter(
+                    name__icontains=search
+                ).values('id'))
             )
             
         return queryset.order_by('name')
@@ -73,6 +59,37 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
             return ProductListSerializer
         return ProductSerializer
     
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Alaka düzeyine göre sıralı ürün araması
+        GET /api/v1/products/products/search/?q=michelin 205
+        
+        Diğer liste filtreleri (category, brand, ...) de uygulanır.
+        """
+        term = request.query_params.get('q', '').strip()
+        if not term:
+            return Response(
+                {'error': 'Arama ifadesi (q) gerekli.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = search_queryset(
+            self.get_queryset(), term, rank=True, vector_field='search_vector'
+        ).order_by('-search_rank', 'name', 'id')
+        
+        page = self.paginate_queryset(queryset)
+        products = page if page is not None else list(queryset)
+        serializer = ProductListSerializer(products, many=True, context=self.get_serializer_context())
+        
+        results = serializer.data
+        for row, product in zip(results, products):
+            row['search_rank'] = round(float(product.search_rank), 4)
+        
+        if page is not None:
+            return self.get_paginated_response(results)
+        return Response(results)
+    
     @action(detail=False, methods=['get'])
     def brands(self, request):
         """Marka listesi"""
@@ -105,14 +122,19 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
             tire_diameter__isnull=False
         )
         
+        # Sadece üç kolonu çek; tüm ürün satırlarını ve prefetch'i yükleme
+        combinations = queryset.prefetch_related(None).values_list(
+            'tire_width', 'tire_aspect_ratio', 'tire_diameter'
+        ).distinct().order_by('tire_width', 'tire_aspect_ratio', 'tire_diameter')
+        
         sizes = []
-        for product in queryset.distinct('tire_width', 'tire_aspect_ratio', 'tire_diameter'):
-            if product.tire_width and product.tire_aspect_ratio and product.tire_diameter:
+        for width, aspect_ratio, diameter in combinations:
+            if width and aspect_ratio and diameter:
                 sizes.append({
-                    'width': product.tire_width,
-                    'aspect_ratio': product.tire_aspect_ratio,
-                    'diameter': product.tire_diameter,
-                    'display': f"{product.tire_width}/{product.tire_aspect_ratio}/{product.tire_diameter}"
+                    'width': width,
+                    'aspect_ratio': aspect_ratio,
+                    'diameter': diameter,
+                    'display': f"{width}/{aspect_ratio}/{diameter}"
                 })
         
         return Response(sizes)
@@ -154,6 +176,12 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
             'bolt_patterns': list(rim_bolt_patterns)
         })
 
+def category_tree_validators(view, request, *args, **kwargs):
+    """Kategori ağacı tüm kullanıcılar için aynıdır; MAX(updated_at) + COUNT yeterli"""
+    latest, count = probe_queryset(Category.objects.all())
+    return (latest, count), latest
+
+
 class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Ürün kategorilerini listelemek için API endpoint'i.
@@ -172,6 +200,7 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset.order_by('sort_order', 'name')
     
     @action(detail=False, methods=['get'])
+    @conditional_view(category_tree_validators)
     def tree(self, request):
         """Kategori ağacını döndürür"""
         root_categories = Category.objects.filter(
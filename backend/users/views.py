@@ -3,7 +3,6 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.contrib.auth import get_user_model
-from django.db import models
 from companies.models import Company, RetailerWholesaler
 from .serializers import (
     RetailerRegistrationSerializer, 
@@ -338,25 +337,22 @@ def dashboard_stats(request):
         
         # Try to get order statistics
         try:
-            from orders.models import Order
-            from decimal import Decimal
+            from orders.rollups import company_stats, status_counts, totals
             
-            # Get all orders for this company
-            orders = Order.objects.filter(retailer=company)
+            # OrderDailyStats rollup satırları (arşivlenmiş siparişler dahil)
+            rollup = company_stats(company, 'retailer')
             
             # Total orders count
-            stats['total_orders'] = orders.count()
+            stats['total_orders'] = totals(rollup)[0]
             
             # Pending orders count
-            stats['pending_orders'] = orders.filter(
-                status__in=['pending', 'processing', 'confirmed']
-            ).count()
+            counts = status_counts(rollup)
+            stats['pending_orders'] = sum(
+                counts.get(status_code, 0) for status_code in ['pending', 'processing', 'confirmed']
+            )
             
             # Total spent (sum of all completed orders)
-            completed_orders = orders.filter(status='delivered')
-            total_spent = completed_orders.aggregate(
-                total=models.Sum('total_amount')
-            )['total'] or Decimal('0.00')
+            _, total_spent, _ = totals(rollup.filter(status='delivered'))
             stats['total_spent'] = str(total_spent)
             
         except ImportError: